@@ -0,0 +1,262 @@
+"""Local query API — data/events.json behind in-memory indexes, over HTTP.
+
+    python scrape.py serve --port 8000
+    GET /events?from=2026-03-01&to=2026-03-07&venue=Barbican&category=Talks&free=1
+    GET /events?area=east&day=sat,sun&limit=20&cursor=<next_cursor from the last page>
+    GET /facets
+    GET /calendar/all.ics (or venue-barbican.ics, category-talks.ics, ...)
+
+Events are held in date order, so a date range is a contiguous run of
+positions found by bisection. Venue, category, area, weekday and free
+are the digest's bitsets (bit i = i-th event), so a query is a few
+integer ANDs and a page of results is read off the lowest set bits.
+Repeated values (venue=A,B) mean any of them. Every response carries an
+ETag for the data version and query, and the store reloads by itself
+when the file changes. Calendar feeds are served with ETag and
+Last-Modified so calendar apps that poll them mostly get a 304.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from digest import EventIndex, Preferences, iter_bits
+from scrapers import geo
+from scrapers.base import Event
+
+logger = logging.getLogger("api")
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+# Seconds a client may reuse a calendar feed without checking back
+FEED_MAX_AGE = 60 * 60
+
+
+class QueryError(ValueError):
+    """A bad query parameter; reported to the client as a 400."""
+
+
+def from_record(r: dict) -> Event:
+    """Inverse of scrape.event_record."""
+    e = Event(
+        title=r["title"], venue=r["venue"], url=r["url"],
+        start_date=date.fromisoformat(r["start_date"]) if r.get("start_date") else None,
+        end_date=date.fromisoformat(r["end_date"]) if r.get("end_date") else None,
+        time=r.get("time", ""), description=r.get("description", ""),
+        category=r.get("category", ""), is_free=r.get("is_free", False), area=r.get("area", ""),
+    )
+    e.stale = r.get("stale", False)
+    return e
+
+
+class _Snapshot:
+    """One loaded version of the file, with its indexes. Never modified once built."""
+
+    def __init__(self, raw: bytes, category_of, region_of):
+        self.version = hashlib.blake2b(raw, digest_size=8).hexdigest()
+        self.records = json.loads(raw)
+        events = [from_record(r) for r in self.records]
+        # events.json is written in date order; undated events sort last, as in the pipeline
+        self.ordinals = [e.start_date.toordinal() if e.start_date else date.max.toordinal() for e in events]
+        self.index = EventIndex(events, category_of=category_of, source_of=lambda e: e.venue, region_of=region_of)
+
+
+class EventStore:
+    def __init__(self, path: Path, category_of, region_of=geo.region_of):
+        self.path = path
+        self.category_of = category_of
+        self.region_of = region_of
+        self._stat = None
+        self._snapshot: _Snapshot | None = None
+        self._lock = threading.Lock()
+
+    def current(self) -> _Snapshot:
+        """The loaded events, reloading first if the file has been rewritten."""
+        st = self.path.stat()
+        stat = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            if stat != self._stat:
+                self._snapshot = _Snapshot(self.path.read_bytes(), self.category_of, self.region_of)
+                self._stat = stat
+                logger.info(f"Loaded {len(self._snapshot.records)} events ({self._snapshot.version})")
+            return self._snapshot
+
+    def query(self, params: dict[str, list[str]]) -> tuple[str, dict]:
+        """(ETag, response body) for /events."""
+        snap = self.current()
+        limit = _int(params, "limit", DEFAULT_LIMIT)
+        if not 1 <= limit <= MAX_LIMIT:
+            raise QueryError(f"limit must be between 1 and {MAX_LIMIT}")
+
+        mask = snap.index.select(Preferences(
+            venues=_values(params, "venue"),
+            categories=_values(params, "category"),
+            areas=[a.lower() for a in _values(params, "area")],
+            days=[d.lower()[:3] for d in _values(params, "day")],
+            free_only=_values(params, "free")[-1:] in (["1"], ["true"]),
+        ))
+        lo, hi = 0, len(snap.ordinals)
+        if "from" in params:
+            lo = bisect_left(snap.ordinals, _date(params, "from").toordinal())
+        if "to" in params:
+            hi = bisect_right(snap.ordinals, _date(params, "to").toordinal())
+        mask &= ((1 << hi) - 1) & ~((1 << lo) - 1)
+
+        # A cursor is the position to resume from, tied to the version it came from
+        cursor = params.get("cursor", [""])[-1]
+        if cursor:
+            version, _, pos = cursor.partition("-")
+            if version != snap.version or not pos.isdigit():
+                raise QueryError("cursor is from an older version of the data; start again")
+            mask &= ~((1 << int(pos)) - 1)
+
+        positions = list(iter_bits(mask, limit + 1))
+        body = {
+            "version": snap.version,
+            "total": mask.bit_count(),
+            "events": [snap.records[i] for i in positions[:limit]],
+            "next_cursor": f"{snap.version}-{positions[limit]}" if len(positions) > limit else None,
+        }
+        return _etag(snap.version, params), body
+
+    def facets(self) -> tuple[str, dict]:
+        """(ETag, response body) for /facets: how many events have each value."""
+        snap = self.current()
+        idx = snap.index
+        body = {
+            "version": snap.version,
+            "total": len(snap.records),
+            "venues": {idx.labels[k]: v.bit_count() for k, v in sorted(idx.venues.items())},
+            "categories": {idx.labels[k]: v.bit_count() for k, v in sorted(idx.categories.items())},
+            "areas": {k: v.bit_count() for k, v in sorted(idx.areas.items())},
+            "days": {k: v.bit_count() for k, v in idx.days.items()},
+            "free": idx.free.bit_count(),
+        }
+        return _etag(snap.version, {}), body
+
+
+def _values(params: dict, key: str) -> list[str]:
+    return [v for raw in params.get(key, []) for v in raw.split(",") if v]
+
+
+def _int(params: dict, key: str, default: int) -> int:
+    raw = params.get(key, [""])[-1]
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        raise QueryError(f"{key} must be a whole number") from None
+
+
+def _date(params: dict, key: str) -> date:
+    try:
+        return date.fromisoformat(params[key][-1])
+    except ValueError:
+        raise QueryError(f"{key} must be a date like 2026-03-01") from None
+
+
+def _etag(version: str, params: dict) -> str:
+    query = json.dumps(sorted(params.items()))
+    return '"' + hashlib.blake2b(f"{version}|{query}".encode(), digest_size=8).hexdigest() + '"'
+
+
+def make_handler(store: EventStore, feeds=None):
+    routes = {"/events": store.query, "/facets": lambda params: store.facets()}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            if feeds is not None and parts.path.startswith("/calendar/"):
+                self._send_feed(parts.path.removeprefix("/calendar/"))
+                return
+            route = routes.get(parts.path.rstrip("/") or "/")
+            if route is None:
+                self._send(404, {"error": "not found; try /events or /facets"})
+                return
+            try:
+                etag, body = route(parse_qs(parts.query))
+            except QueryError as e:
+                self._send(400, {"error": str(e)})
+                return
+            except FileNotFoundError:
+                self._send(503, {"error": "no events yet; run scrape.py first"})
+                return
+
+            if etag in (t.strip() for t in self.headers.get("If-None-Match", "").split(",")):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self._send(200, body, etag)
+
+        def _send(self, status: int, body: dict, etag: str = ""):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            if etag:
+                self.send_header("ETag", etag)
+                # Clients may reuse a response, but should check the ETag first
+                self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _send_feed(self, filename: str):
+            found = feeds.lookup(filename)
+            if found is None:
+                self._send(404, {"error": "no such calendar feed"})
+                return
+            path, etag, modified = found
+            headers = {
+                "ETag": etag,
+                "Last-Modified": format_datetime(modified, usegmt=True),
+                "Cache-Control": f"max-age={FEED_MAX_AGE}",
+            }
+            if self._not_modified(etag, modified):
+                self.send_response(304)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.end_headers()
+                return
+            data = path.read_bytes()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/calendar; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _not_modified(self, etag: str, modified) -> bool:
+            if "If-None-Match" in self.headers:
+                return etag in (t.strip() for t in self.headers["If-None-Match"].split(","))
+            try:
+                since = parsedate_to_datetime(self.headers.get("If-Modified-Since", ""))
+            except (TypeError, ValueError):
+                return False
+            if since.tzinfo is None:
+                since = since.replace(tzinfo=timezone.utc)
+            return modified <= since
+
+        def log_message(self, fmt, *args):
+            logger.debug(fmt % args)
+
+    return Handler
+
+
+def serve(store: EventStore, host: str = "127.0.0.1", port: int = 8000, feeds=None) -> ThreadingHTTPServer:
+    """Create the server; call serve_forever() on it. feeds, a FeedWriter, adds /calendar/."""
+    server = ThreadingHTTPServer((host, port), make_handler(store, feeds))
+    server.daemon_threads = True
+    return server
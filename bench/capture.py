@@ -0,0 +1,69 @@
+"""Replace the synthetic fixtures with live captures of each venue's listing page.
+
+    python -m bench.capture              # every source
+    python -m bench.capture barbican ica
+
+Live captures change week to week and dates drift into the past, so
+re-baseline (python -m bench.run --save-baseline) after capturing.
+"""
+
+import sys
+import time
+
+from scrapers import (
+    BarbicanScraper,
+    DesignMuseumScraper,
+    EventbriteScraper,
+    LRBBookshopScraper,
+    PhotographersGalleryScraper,
+    RichMixScraper,
+    SomersetHouseScraper,
+    VAMScraper,
+    WellcomeScraper,
+)
+from scrapers.eventbrite import SEARCHES
+
+from .markup import FIXTURES
+
+# Fixture file -> (scraper, path under its base_url)
+PAGES = {
+    "barbican.html": (BarbicanScraper, "/whats-on/talks-events"),
+    "design_museum.html": (DesignMuseumScraper, "/whats-on/talks-courses-and-workshops"),
+    "rich_mix.html": (RichMixScraper, "/whats-on/this-week"),
+    "photographers_gallery.html": (PhotographersGalleryScraper, "/whats-on"),
+    "lrb_bookshop.html": (LRBBookshopScraper, "/events"),
+    "somerset_house.html": (SomersetHouseScraper, "/whats-on"),
+    "vam.html": (VAMScraper, "/whatson"),
+    "wellcome.json": (WellcomeScraper, "/events?format=%21exhibitions&timespan=future&pageSize=25"),
+    "eventbrite.html": (EventbriteScraper, f"/d/united-kingdom--london/{SEARCHES[0]}/?page=1"),
+}
+
+
+def capture_ica():
+    from playwright.sync_api import sync_playwright
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+        page.goto("https://www.ica.art/talks", wait_until="domcontentloaded", timeout=15000)
+        page.wait_for_timeout(5000)
+        (FIXTURES / "ica.html").write_text(page.content())
+        browser.close()
+
+
+def main(names: list[str]):
+    for name, (cls, path) in PAGES.items():
+        if names and not any(name.startswith(n) for n in names):
+            continue
+        scraper = cls()
+        resp = scraper.session.get(f"{scraper.base_url}{path}", timeout=15)
+        resp.raise_for_status()
+        (FIXTURES / name).write_text(resp.text)
+        print(f"{name}: {len(resp.content):,} bytes")
+        time.sleep(1)
+    if not names or any("ica".startswith(n) for n in names):
+        capture_ica()
+        print("ica.html: captured")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
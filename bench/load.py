@@ -0,0 +1,163 @@
+"""End-to-end load test of the scrape.py pipeline against the stand-in venue server.
+
+    python -m bench.load --events-per-page 10000 --pages 1 --latency 0.02 --error-rate 0.01
+    python -m bench.load --url http://otherhost:8765   # use a server that's already running
+
+Every scraper is pointed at the stand-in with its politeness delay off,
+then the streaming pipeline and render stage run into a temporary
+directory. Reports per-stage wall time, throughput, peak RSS of this
+process and client-side request latency percentiles.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import resource
+import tempfile
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+import requests
+
+import pipeline
+import scrape
+from scrapers import ICAScraper
+
+from .standin import StandinConfig, serve
+
+# Stand-in prefix for each scraper class
+PREFIXES = {
+    "RichMixScraper": "rich_mix",
+    "EventbriteScraper": "eventbrite",
+    "BarbicanScraper": "barbican",
+    "DesignMuseumScraper": "design_museum",
+    "WellcomeScraper": "wellcome",
+    "PhotographersGalleryScraper": "photographers_gallery",
+    "SomersetHouseScraper": "somerset_house",
+    "LRBBookshopScraper": "lrb_bookshop",
+    "VAMScraper": "vam",
+    "ICAScraper": "ica",
+}
+
+
+class HttpPage:
+    """Stands in for a Playwright page by fetching the URL over plain HTTP."""
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self.html = ""
+
+    def goto(self, url, **kwargs):
+        resp = self.scraper.session.get(url, timeout=kwargs.get("timeout", 15000) / 1000)
+        resp.raise_for_status()
+        self.html = resp.text
+
+    def wait_for_timeout(self, ms):
+        pass
+
+    def content(self):
+        return self.html
+
+
+def _serve_forever(config: StandinConfig, port: int):
+    serve(config, port=port).serve_forever()
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+def run(base: str, workdir: Path, parse_workers: int = 0) -> dict:
+    scrape.OUTPUT = workdir / "output"
+    scrape.DATA = workdir / "data"
+
+    scrapers = scrape.default_scrapers() + [ICAScraper()]
+    for s in scrapers:
+        s.base_url = f"{base}/{PREFIXES[type(s).__name__]}"
+        s.delay = 0
+
+    timings = {}
+    started = time.perf_counter()
+    scraped = 0
+
+    def counted(s, **kwargs):
+        def events():
+            nonlocal scraped
+            for e in s.iter_events(**kwargs):
+                scraped += 1
+                yield e
+        return pipeline.Source(s.name, events, s)
+
+    ica = scrapers[-1]
+    srcs = [counted(s) for s in scrapers[:-1]] + [counted(ica, page=HttpPage(ica))]
+    with scrape.parser_pool(parse_workers) if parse_workers else nullcontext() as pool:
+        for s in scrapers:
+            s.parser_pool = pool
+        # No deadline: the point is to see how long the whole load takes
+        events = scrape.run_pipeline(srcs, deadline=None)
+    timings["scrape+filter+save"] = time.perf_counter() - started
+
+    t = time.perf_counter()
+    scrape.build_html(events)
+    timings["render"] = time.perf_counter() - t
+    total = time.perf_counter() - started
+
+    latencies = [x for s in scrapers for x in s.stats.latencies]
+    return {
+        "events_scraped": scraped,
+        "events_kept": len(events),
+        "requests": sum(s.stats.requests for s in scrapers),
+        "bytes": sum(s.stats.bytes for s in scrapers),
+        "seconds": {k: round(v, 3) for k, v in {**timings, "total": total}.items()},
+        "events_per_second": round(scraped / total, 1) if total else 0.0,
+        "peak_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "latency_seconds": {
+            f"p{p}": round(_percentile(latencies, p), 4) for p in (50, 95, 99)
+        },
+        "errors": {s.name: s.stats.errors for s in scrapers if s.stats.errors},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="use an already running stand-in server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--events-per-page", type=int, default=1000)
+    parser.add_argument("--pages", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--parse-workers", type=int, default=0, help="parse in this many processes (0: in the scraper threads)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(message)s")
+
+    server = None
+    base = args.url
+    if not base:
+        # Serve from a separate process so its memory and CPU don't count against the pipeline
+        config = StandinConfig(args.events_per_page, args.pages, args.latency, args.jitter, args.error_rate)
+        server = multiprocessing.Process(target=_serve_forever, args=(config, args.port), daemon=True)
+        server.start()
+        base = f"http://127.0.0.1:{args.port}"
+        for _ in range(50):
+            try:
+                requests.get(f"{base}/barbican/ready", timeout=1)
+                break
+            except requests.ConnectionError:
+                time.sleep(0.1)
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            print(json.dumps(run(base.rstrip("/"), Path(tmp), args.parse_workers), indent=2))
+    finally:
+        if server:
+            server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""Synthetic venue markup — listing pages shaped like each source's real ones.
+
+Each renderer emits exactly the elements and attributes its scraper selects
+on, filled from deterministic fake events. Used to build the offline
+fixtures and by the stand-in venue server.
+"""
+
+import json
+import random
+from datetime import date, timedelta
+from html import escape
+from pathlib import Path
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+# Far enough ahead that fixtures never fall into the past
+EPOCH = date(2099, 1, 5)
+
+WORDS = [
+    "drawing", "print", "ceramics", "archive", "city", "futures", "photography",
+    "architecture", "poetry", "typography", "night", "weaving", "studio", "body",
+    "memory", "river", "neighbourhood", "publishing", "collage", "sound",
+]
+FORMATS = ["Talk", "Workshop", "Late", "Conversation", "Life drawing", "Book launch"]
+NOISE = ["Concert", "Kids club", "Family workshop", "Film screening"]
+
+
+def make_events(n: int, seed: int = 0, start: int = 0) -> list[dict]:
+    """Deterministic fake events; about one in eight is something the filters drop."""
+    rng = random.Random(seed * 1_000_003 + start)
+    events = []
+    for i in range(start, start + n):
+        noisy = rng.random() < 0.125
+        kind = rng.choice(NOISE if noisy else FORMATS)
+        title = f"{kind}: {rng.choice(WORDS).title()} and {rng.choice(WORDS)} #{i}"
+        events.append({
+            "id": str(100000 + i),
+            "slug": f"event-{i}",
+            "title": title,
+            "kind": kind,
+            "day": EPOCH + timedelta(days=i % 180),
+            "hour": rng.choice([10, 13, 18, 19]),
+            "minute": rng.choice([0, 30]),
+            "free": rng.random() < 0.3,
+            "description": " ".join(rng.choice(WORDS) for _ in range(rng.randint(12, 40))).capitalize() + ".",
+        })
+    return events
+
+
+def _page(body: str) -> str:
+    return f"<!DOCTYPE html><html><head><title>What's on</title></head><body><main>{body}</main></body></html>"
+
+
+def barbican(events) -> str:
+    cards = []
+    for e in events:
+        free = '<span class="search-listing__label--promoted">Free</span>' if e["free"] else ""
+        cards.append(
+            f'<article class="listing--event">'
+            f'<a class="search-listing__link" href="/whats-on/{e["day"].year}/event/{e["slug"]}"></a>'
+            f'<h2 class="listing-title">{escape(e["title"])}</h2>'
+            f'<span class="tag__plain">{e["kind"]}</span><span class="tag__plain">Talks &amp; events</span>'
+            f'<div class="search-listing__intro"><p>{e["day"].strftime("%a %-d %b %Y")}, {e["hour"]:02d}:{e["minute"]:02d}</p></div>'
+            f'<div class="search-listing__description">{escape(e["description"])}</div>{free}'
+            f'</article>'
+        )
+    return _page("".join(cards))
+
+
+def design_museum(events) -> str:
+    cards = []
+    for e in events:
+        price = " Free" if e["free"] else ""
+        cards.append(
+            f'<div class="page-item"><a href="/whats-on/talks-courses-and-workshops/{e["slug"]}">'
+            f'<h2>{escape(e["title"])}</h2></a>'
+            f'<time class="icon-date">{e["day"].strftime("%A %-d %B %Y")}, '
+            f'{e["hour"]:02d}:{e["minute"]:02d} – {e["hour"] + 2:02d}:00{price}</time>'
+            f'<div class="rich-text"><p>{escape(e["description"])}</p></div></div>'
+        )
+    return _page("".join(cards))
+
+
+def rich_mix(events) -> str:
+    cards = []
+    for e in events:
+        flag = '<span class="flag">Free</span>' if e["free"] else ""
+        category = "Music" if e["kind"] == "Concert" else ("Families" if "Kids" in e["kind"] else e["kind"])
+        cards.append(
+            f'<div class="tease"><h3><a href="https://richmix.org.uk/events/{e["slug"]}">{escape(e["title"])}</a></h3>'
+            f'<span class="category">{category}</span>'
+            f'<span class="date">{e["day"].strftime("%a %-d %b").upper()}</span>{flag}'
+            f'<p class="description">{escape(e["description"])}</p></div>'
+        )
+    return _page("".join(cards))
+
+
+def photographers_gallery(events) -> str:
+    types = {"Talk": "Talks & Events", "Workshop": "Workshops & Courses", "Book launch": "Bookshop Event"}
+    cards = []
+    for e in events:
+        hour = e["hour"] % 12 or 12
+        ampm = "pm" if e["hour"] >= 12 else "am"
+        cards.append(
+            f'<article class="o-event"><span class="o-teaser__post-type">{escape(types.get(e["kind"], "Exhibitions"))}</span>'
+            f'<a class="o-teaser__link" href="/whats-on/{e["slug"]}">{escape(e["title"])}</a>'
+            f'<p class="o-teaser__date">{hour}:{e["minute"]:02d}{ampm}, {e["day"].strftime("%a %-d %b %Y")}</p>'
+            f'<p class="o-teaser__body-text">{escape(e["description"])}</p></article>'
+        )
+    return _page("".join(cards))
+
+
+def lrb_bookshop(events) -> str:
+    cards = []
+    for e in events:
+        hour = e["hour"] % 12 or 12
+        href = f"https://www.eventbrite.co.uk/e/{e['slug']}-tickets-{e['id']}"
+        price = "Free" if e["free"] else "£5"
+        cards.append(
+            f'<a href="{href}"><h2 class="event-preview--title">{escape(e["title"])}</h2>'
+            f'<span class="event-preview--date">{e["day"].strftime("%A %-d %B")}, {hour} p.m.</span>'
+            f'<span class="event-preview--price">{price}</span>'
+            f'<p class="event-preview--description">{escape(e["description"])}</p></a>'
+            f'<a href="{href}">Book now</a>'
+        )
+    return _page("".join(cards))
+
+
+def somerset_house(events) -> str:
+    slugs = {"Talk": "talk", "Workshop": "workshop", "Late": "late-night", "Concert": "music"}
+    edges = [{"node": {
+        "title": e["title"],
+        "url": f"/whats-on/{e['slug']}",
+        "eventTypes": [{"slug": slugs.get(e["kind"], "event"), "title": e["kind"]}],
+        "dateStart": f"{e['day'].isoformat()}T{e['hour']:02d}:{e['minute']:02d}:00",
+        "listingText": e["description"],
+        "priceFree": e["free"],
+    }} for e in events]
+    props = json.dumps({"data": {"page": {"items": {"edges": edges}}}})
+    return _page(f'<script id="props" type="application/json">{props}</script>')
+
+
+def vam(events) -> str:
+    cards = []
+    for i, e in enumerate(events):
+        kind = "talk" if e["kind"] in ("Talk", "Conversation") else e["kind"].lower()
+        if i % 10 == 0:
+            cards.append(
+                f'<div class="b-events-featured"><a href="/event/{e["id"]}/{e["slug"]}">'
+                f'<h3 class="b-events-featured__title">{escape(e["title"])}</h3></a>'
+                f'<p class="b-events-featured__type">{escape(kind.title())}</p>'
+                f'<p class="b-events-featured__date">{e["day"].strftime("%A, %-d %B %Y")}</p>'
+                f'<p class="b-events-featured__venue">V&amp;A South Kensington</p>'
+                f'<p class="b-events-featured__description">{escape(e["description"])}</p></div>'
+            )
+        else:
+            cards.append(
+                f'<a href="/event/{e["id"]}/{e["slug"]}"><h2 class="b-event-teaser__title">{escape(e["title"])}</h2>'
+                f'<div class="b-event-teaser__type">{escape(kind.title())}</div>'
+                f'<p class="b-icon-list__item-text">{e["day"].strftime("%A, %-d %B %Y")}</p>'
+                f'<p class="b-icon-list__item-text">V&amp;A East Storehouse</p>'
+                f'<p class="b-event-teaser__description">{escape(e["description"])}</p></a>'
+            )
+    return _page("".join(cards))
+
+
+def wellcome(events) -> str:
+    results = [{
+        "title": e["title"],
+        "uid": e["slug"],
+        "format": {"label": e["kind"]},
+        "times": [{"startDateTime": f"{e['day'].isoformat()}T{e['hour']:02d}:{e['minute']:02d}:00.000Z"}],
+        "promo": {"caption": e["description"]},
+    } for e in events]
+    return json.dumps({"type": "ResultList", "results": results})
+
+
+AREAS = [
+    ("Shoreditch", "London", "E2 7DG", 51.5265, -0.0782),
+    ("Peckham", "London", "SE15 4ST", 51.4700, -0.0690),
+    ("Hackney Wick", "London", "E9 5EN", 51.5433, -0.0246),
+    ("Bow", "Bow", "EX17 6HA", 50.8011, -3.8211),  # the Devon one
+    ("Clerkenwell", "London", "EC1R 0AT", 51.5246, -0.1050),
+]
+
+
+def eventbrite(events) -> str:
+    results = []
+    for e in events:
+        area, city, postcode, lat, lon = AREAS[int(e["id"]) % len(AREAS)]
+        results.append({
+            "id": e["id"],
+            "name": e["title"],
+            "url": f"https://www.eventbrite.co.uk/e/{e['slug']}-tickets-{e['id']}",
+            "summary": e["description"],
+            "start_date": e["day"].isoformat(),
+            "start_time": f"{e['hour']:02d}:{e['minute']:02d}:00",
+            "is_online_event": int(e["id"]) % 17 == 0,
+            "primary_venue": {
+                "name": f"{e['kind']} Rooms",
+                "address": {
+                    "localized_area_display": area,
+                    "city": city,
+                    "postal_code": postcode,
+                    "latitude": str(lat),
+                    "longitude": str(lon),
+                },
+            },
+            "tags": [{"prefix": "EventbriteCategory", "display_name": "Community"}],
+        })
+    data = json.dumps({"search_data": {"events": {"results": results}}})
+    return _page("") + f"<script>\nwindow.__SERVER_DATA__ = {data};\n</script>"
+
+
+def ica(events) -> str:
+    cards = []
+    for e in events:
+        prefix = e["kind"].upper()
+        title = e["title"].split(": ", 1)[-1]
+        cards.append(
+            f'<div class="item talks"><a href="/talks/{e["slug"]}">'
+            f'<div class="title">{escape(prefix)}:<br>{escape(title)}</div>'
+            f'<div class="date">{e["day"].strftime("%a, %-d %B")}</div>'
+            f'<div class="description">{escape(e["description"])}</div></a></div>'
+        )
+    return _page("".join(cards))
+
+
+# Fixture file -> renderer, and how many events to put in it
+SOURCES = {
+    "barbican.html": (barbican, 80),
+    "design_museum.html": (design_museum, 60),
+    "rich_mix.html": (rich_mix, 60),
+    "photographers_gallery.html": (photographers_gallery, 60),
+    "lrb_bookshop.html": (lrb_bookshop, 40),
+    "somerset_house.html": (somerset_house, 60),
+    "vam.html": (vam, 80),
+    "wellcome.json": (wellcome, 25),
+    "eventbrite.html": (eventbrite, 40),
+    "ica.html": (ica, 40),
+}
+
+
+def write_fixtures():
+    FIXTURES.mkdir(exist_ok=True)
+    for i, (name, (render, n)) in enumerate(SOURCES.items()):
+        (FIXTURES / name).write_text(render(make_events(n, seed=i)))
+
+
+if __name__ == "__main__":
+    write_fixtures()
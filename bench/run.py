@@ -0,0 +1,237 @@
+"""Offline benchmarks for every scraper's parse path and the pipeline stages.
+
+    python -m bench.run                  # run, save to bench/results/, compare with baseline
+    python -m bench.run --save-baseline  # ...and make this run the new baseline
+    python -m bench.run barbican vam     # only some cases
+
+Scrapers are pointed at the files in bench/fixtures/ through a stand-in
+session, so nothing touches the network and politeness sleeps are skipped.
+Each case reports events/sec over repeated runs, and peak traced memory
+and allocated blocks for a single run.
+"""
+
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import scrape
+from scrapers import (
+    BarbicanScraper,
+    DesignMuseumScraper,
+    EventbriteScraper,
+    Event,
+    ICAScraper,
+    LRBBookshopScraper,
+    PhotographersGalleryScraper,
+    RichMixScraper,
+    SomersetHouseScraper,
+    VAMScraper,
+    WellcomeScraper,
+)
+
+from .markup import EPOCH, FIXTURES, make_events
+
+RESULTS = Path(__file__).parent / "results"
+BASELINE = RESULTS / "baseline.json"
+
+# Slower than baseline by more than this fraction counts as a regression
+TOLERANCE = 0.10
+
+
+class FixtureResponse:
+    def __init__(self, body: str):
+        self.text = body
+        self.content = body.encode()
+        self.encoding = "utf-8"
+        self.status_code = 200
+        self.elapsed = timedelta(0)
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class FixtureSession:
+    """Answers every GET with one fixture file, whatever the URL."""
+
+    def __init__(self, name: str):
+        self.body = (FIXTURES / name).read_text()
+        self.headers = {}
+
+    def get(self, url, **kwargs):
+        return FixtureResponse(self.body)
+
+
+class FixturePage:
+    """Just enough of a Playwright page for the ICA scraper."""
+
+    def __init__(self, name: str):
+        self.body = (FIXTURES / name).read_text()
+
+    def goto(self, url, **kwargs):
+        pass
+
+    def wait_for_timeout(self, ms):
+        pass
+
+    def content(self):
+        return self.body
+
+
+def _offline(scraper, fixture: str):
+    scraper.session = FixtureSession(fixture)
+    scraper.delay = 0
+    return scraper
+
+
+def _scrape_case(cls, fixture):
+    scraper = _offline(cls(), fixture)
+    return lambda: len(scraper.scrape())
+
+
+def _ica_case():
+    scraper, page = ICAScraper(), FixturePage("ica.html")
+    return lambda: len(scraper.scrape(page=page))
+
+
+def _parse_case(cls, fixture):
+    """Parsing a whole body at once, as the process pool does, rather than streaming it."""
+    scraper = cls()
+    body = (FIXTURES / fixture).read_text()
+    return lambda: len(list(scraper.parse(body)))
+
+
+def _synthetic_events(n: int) -> list[Event]:
+    return [
+        Event(
+            title=e["title"],
+            venue=["Barbican", "ICA", "V&A", "Some Loft"][i % 4],
+            url=f"https://example.org/{e['slug']}",
+            start_date=e["day"],
+            time=f"{e['hour']}:{e['minute']:02d}",
+            description=e["description"][:200],
+            category=e["kind"],
+            is_free=e["free"],
+            area="Shoreditch",
+        )
+        for i, e in enumerate(make_events(n, seed=99))
+    ]
+
+
+def _stage_cases(workdir: Path) -> dict:
+    scrape.OUTPUT = workdir / "output"
+    scrape.DATA = workdir / "data"
+    raw = _synthetic_events(5000)
+    # Duplicate a slice so dedup has work to do
+    raw += raw[:500]
+    kept = scrape.filter_events(raw)
+    return {
+        "filter_events": lambda: len(scrape.filter_events(raw)),
+        "build_html": lambda: (scrape.build_html(kept), len(kept))[1],
+        "save_events": lambda: (scrape.save_events(kept), len(kept))[1],
+    }
+
+
+def cases(workdir: Path) -> dict:
+    return {
+        "barbican": _scrape_case(BarbicanScraper, "barbican.html"),
+        "vam": _scrape_case(VAMScraper, "vam.html"),
+        "rich_mix": _scrape_case(RichMixScraper, "rich_mix.html"),
+        "rich_mix.parse": _parse_case(RichMixScraper, "rich_mix.html"),
+        "design_museum": _scrape_case(DesignMuseumScraper, "design_museum.html"),
+        "photographers_gallery": _scrape_case(PhotographersGalleryScraper, "photographers_gallery.html"),
+        "photographers_gallery.parse": _parse_case(PhotographersGalleryScraper, "photographers_gallery.html"),
+        "lrb_bookshop": _scrape_case(LRBBookshopScraper, "lrb_bookshop.html"),
+        "somerset_house": _scrape_case(SomersetHouseScraper, "somerset_house.html"),
+        "wellcome": _scrape_case(WellcomeScraper, "wellcome.json"),
+        "eventbrite": _scrape_case(EventbriteScraper, "eventbrite.html"),
+        "ica": _ica_case(),
+        **_stage_cases(workdir),
+    }
+
+
+def measure(fn, min_time: float = 0.5) -> dict:
+    """Time repeated calls until min_time has passed, then trace one call's memory."""
+    events = fn()  # warm up
+    runs = 0
+    started = time.perf_counter()
+    while True:
+        fn()
+        runs += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    fn()
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(s.count_diff for s in after.compare_to(before, "filename") if s.count_diff > 0)
+
+    per_run = elapsed / runs
+    return {
+        "events": events,
+        "seconds_per_run": round(per_run, 6),
+        "events_per_second": round(events / per_run, 1) if events else 0.0,
+        "peak_kib": round(peak / 1024, 1),
+        "allocated_blocks": blocks,
+    }
+
+
+def compare(results: dict, baseline: dict) -> list[str]:
+    lines = []
+    for name, r in results.items():
+        base = baseline.get(name)
+        if not base or not base["seconds_per_run"]:
+            continue
+        change = r["seconds_per_run"] / base["seconds_per_run"] - 1
+        flag = "  SLOWER" if change > TOLERANCE else ""
+        lines.append(f"{name:36} {change:+7.1%} time  {r['peak_kib'] - base['peak_kib']:+9.1f} KiB peak{flag}")
+    return lines
+
+
+def main(argv: list[str]):
+    names = [a for a in argv if not a.startswith("--")]
+    with tempfile.TemporaryDirectory() as tmp:
+        all_cases = cases(Path(tmp))
+        results = {}
+        for name, fn in all_cases.items():
+            if names and not any(name.startswith(n) for n in names):
+                continue
+            results[name] = r = measure(fn)
+            print(f"{name:36} {r['events']:6} events  {r['events_per_second']:>10,.0f} ev/s  "
+                  f"{r['peak_kib']:>9,.1f} KiB peak  {r['allocated_blocks']:>7} blocks")
+
+    RESULTS.mkdir(exist_ok=True)
+    run = {"run_at": datetime.now().isoformat(timespec="seconds"), "fixtures_epoch": EPOCH.isoformat(), "results": results}
+    (RESULTS / f"{datetime.now():%Y%m%d-%H%M%S}.json").write_text(json.dumps(run, indent=2))
+
+    if BASELINE.exists():
+        print("\nvs baseline:")
+        for line in compare(results, json.loads(BASELINE.read_text())["results"]):
+            print(line)
+    if "--save-baseline" in argv or not BASELINE.exists():
+        BASELINE.write_text(json.dumps(run, indent=2))
+        print(f"\nSaved baseline to {BASELINE}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,122 @@
+"""Stand-in venue server — serves synthetic listings for every source at any volume.
+
+    python -m bench.standin --port 8765 --events-per-page 5000 --pages 20 --latency 0.05 --error-rate 0.02
+
+Each source lives under its own prefix (/barbican/..., /eventbrite/..., …),
+so a scraper is pointed at it by setting base_url to http://host:port/<source>.
+Anything after the prefix picks a different, deterministic set of events,
+so Rich Mix's this-week/next-week and each Eventbrite search term differ;
+?page=N pages through them until --pages runs out.
+"""
+
+import argparse
+import random
+import time
+import zlib
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from . import markup
+
+RENDERERS = {
+    "barbican": markup.barbican,
+    "design_museum": markup.design_museum,
+    "rich_mix": markup.rich_mix,
+    "photographers_gallery": markup.photographers_gallery,
+    "lrb_bookshop": markup.lrb_bookshop,
+    "somerset_house": markup.somerset_house,
+    "vam": markup.vam,
+    "wellcome": markup.wellcome,
+    "eventbrite": markup.eventbrite,
+    "ica": markup.ica,
+}
+
+CHUNK = 64 * 1024
+
+
+class StandinConfig:
+    def __init__(self, events_per_page=200, pages=1, latency=0.0, jitter=0.0, error_rate=0.0, seed=0):
+        self.events_per_page = events_per_page
+        self.pages = pages
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.seed = seed
+
+
+@lru_cache(maxsize=64)
+def _render(source: str, rest: str, page: int, per_page: int, seed: int) -> bytes:
+    # Different paths under one source get different, non-overlapping id ranges
+    offset = zlib.crc32(rest.encode()) % 1000 * 1_000_000
+    events = markup.make_events(per_page, seed=seed, start=offset + (page - 1) * per_page)
+    return RENDERERS[source](events).encode()
+
+
+def make_handler(config: StandinConfig):
+    rng = random.Random(config.seed)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            source, _, rest = parts.path.lstrip("/").partition("/")
+            if source not in RENDERERS:
+                self.send_error(404)
+                return
+
+            if config.latency or config.jitter:
+                time.sleep(config.latency + rng.random() * config.jitter)
+            if rng.random() < config.error_rate:
+                self.send_response(429)
+                self.send_header("Retry-After", "1")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            page = int(parse_qs(parts.query).get("page", ["1"])[0])
+            per_page = config.events_per_page if 1 <= page <= config.pages else 0
+            body = _render(source, rest, page, per_page, config.seed)
+
+            self.send_response(200)
+            content_type = "application/json" if source == "wellcome" else "text/html; charset=utf-8"
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            for i in range(0, len(body), CHUNK):
+                self.wfile.write(body[i:i + CHUNK])
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def serve(config: StandinConfig, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Create the server; call serve_forever() on it (port 0 picks a free one)."""
+    server = ThreadingHTTPServer((host, port), make_handler(config))
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--events-per-page", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency, up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered 429")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = StandinConfig(args.events_per_page, args.pages, args.latency, args.jitter, args.error_rate, args.seed)
+    server = serve(config, args.host, args.port)
+    print(f"Serving stand-in venues on http://{args.host}:{server.server_port}/<source>/")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""City profiles — everything a run needs to know about where it is.
+
+A profile lists the city's sources in pipeline order (Eventbrite among
+them, searching the city's Eventbrite place), the Playwright scrapers,
+the order of source chips on the page, the Eventbrite search terms and
+the gazetteer that decides which venues are in town. `path` gives a city
+its own tree, sites/<path>/ with output/, data/ and metrics/ in it, beside
+London's rather than inside it, so cleaning up one city's stale files or
+publishing its page never touches another's. London's is empty so its
+files stay where they always were.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from scrapers import (
+    BarbicanScraper,
+    DesignMuseumScraper,
+    EventbriteScraper,
+    ICAScraper,
+    LRBBookshopScraper,
+    PhotographersGalleryScraper,
+    RichMixScraper,
+    SomersetHouseScraper,
+    VAMScraper,
+    WellcomeScraper,
+)
+from scrapers.eventbrite import SEARCHES
+from scrapers.geo import LONDON as LONDON_GAZETTEER, MANCHESTER as MANCHESTER_GAZETTEER, Gazetteer
+
+ROOT = Path(__file__).parent
+
+
+@dataclass(frozen=True)
+class City:
+    name: str
+    slug: str
+    gazetteer: Gazetteer
+    eventbrite_place: str  # the /d/<place>/ part of Eventbrite search URLs
+    sources: tuple[type, ...] = (EventbriteScraper,)  # requests-based scrapers, in pipeline order
+    browser_sources: tuple[type, ...] = ()  # Playwright scrapers
+    venue_order: tuple[str, ...] = ("Eventbrite",)  # source filter chips on the page
+    searches: tuple[str, ...] = field(default=tuple(SEARCHES))
+    path: str = ""
+    digest_email_fallback: bool = False  # mail DIGEST_EMAIL when there's no subscribers file
+
+    @property
+    def root(self) -> Path:
+        return ROOT / "sites" / self.path if self.path else ROOT
+
+    @property
+    def output(self) -> Path:
+        return self.root / "output"
+
+    @property
+    def data(self) -> Path:
+        return self.root / "data"
+
+    @property
+    def metrics(self) -> Path:
+        return self.root / "metrics"
+
+    @property
+    def core_venues(self) -> set[str]:
+        """Venues with a page filter chip of their own; everything else counts as Eventbrite."""
+        return set(self.venue_order) - {"Eventbrite"}
+
+
+LONDON = City(
+    name="London",
+    slug="london",
+    gazetteer=LONDON_GAZETTEER,
+    eventbrite_place="united-kingdom--london",
+    sources=(
+        RichMixScraper,
+        EventbriteScraper,
+        BarbicanScraper,
+        DesignMuseumScraper,
+        WellcomeScraper,
+        PhotographersGalleryScraper,
+        SomersetHouseScraper,
+        LRBBookshopScraper,
+        VAMScraper,
+    ),
+    browser_sources=(ICAScraper,),
+    venue_order=(
+        "Barbican", "Design Museum", "ICA", "Rich Mix",
+        "Wellcome Collection", "Photographers' Gallery", "Somerset House",
+        "London Review Bookshop", "V&A", "Eventbrite",
+    ),
+    digest_email_fallback=True,
+)
+
+# Eventbrite only until it has venue scrapers of its own
+MANCHESTER = City(
+    name="Manchester",
+    slug="manchester",
+    gazetteer=MANCHESTER_GAZETTEER,
+    eventbrite_place="united-kingdom--manchester",
+    path="manchester",
+)
+
+CITIES = {c.slug: c for c in (LONDON, MANCHESTER)}
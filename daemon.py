@@ -0,0 +1,151 @@
+"""Resident mode — refresh each source on its own interval and republish only on change.
+
+The daemon keeps one set of sources alive for its whole life, so HTTP
+sessions, the browser and caches stay warm between refreshes. Each tick
+runs the sources that are due through the pipeline, keeps every source's
+latest events in memory, and only re-filters, merges and publishes when
+some source's events actually changed (or the date rolled over, so past
+events drop off). A source that fails is retried sooner than its
+interval, and is served from its snapshot meanwhile. With a revisit
+policy, intervals follow each source's observed change rate instead of
+staying fixed.
+"""
+
+import logging
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Optional
+
+import pipeline
+from scrapers.base import SourceStats, to_record
+
+logger = logging.getLogger("daemon")
+
+# Seconds between refreshes of a source that failed, if that's sooner than its interval
+RETRY_INTERVAL = 15 * 60
+
+
+def _seconds_to_midnight() -> float:
+    now = datetime.now()
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return (midnight - now).total_seconds() + 1
+
+
+class Daemon:
+    """Schedules refreshes of a fixed list of sources.
+
+    make_keep(today) returns the keep predicate for a day; publish(events)
+    gets the merged, filtered, date-ordered events whenever they change.
+    settle, taps and deadline are passed through to pipeline.run. policy,
+    a RevisitPolicy, replaces the fixed intervals once it has history.
+    on_tick() is called before each refresh, so per-run state such as
+    metrics describes that refresh rather than everything since startup.
+    """
+
+    def __init__(self, sources: list[pipeline.Source], intervals: dict[str, float], default_interval: float,
+                 make_keep: Callable, publish: Callable, settle=None, taps: Callable = lambda: [],
+                 on_done=None, deadline: Optional[float] = None, policy=None, on_tick: Optional[Callable] = None,
+                 clock=time.monotonic):
+        self.sources = sources
+        self.intervals = {s.name: intervals.get(s.name, default_interval) for s in sources}
+        self.make_keep = make_keep
+        self.publish = publish
+        self.settle = settle
+        self.taps = taps
+        self.on_done = on_done
+        self.deadline = deadline
+        self.policy = policy
+        self.on_tick = on_tick
+        self.clock = clock
+        self.due = {s.name: 0.0 for s in sources}
+        # Latest events per source, in source order so dedup prefers the same copies as a batch run
+        self.current: dict[str, list] = {s.name: [] for s in sources}
+        self._fingerprints: dict[str, frozenset] = {}
+        self._visited: dict[str, float] = {}
+        self._failed: set[str] = set()
+        self._published_on: Optional[date] = None
+
+    def tick(self) -> bool:
+        """Refresh whatever is due and publish if anything changed. True if it published."""
+        today = date.today()
+        keep = self.make_keep(today)
+        now = self.clock()
+        due = [s for s in self.sources if self.due[s.name] <= now]
+        changed = []
+        if due:
+            if self.on_tick:
+                self.on_tick()
+            for s in due:
+                if s.scraper is not None:
+                    s.scraper.stats = SourceStats()
+            taps = self.taps()
+            pipeline.run(due, keep, taps=taps, on_done=self.on_done, deadline=self.deadline, settle=self._settle)
+            visited = self.clock()
+            for s in due:
+                fingerprint = frozenset((to_record(e), e.stale) for e in self.current[s.name])
+                previous = self._fingerprints.get(s.name)
+                if fingerprint != previous:
+                    self._fingerprints[s.name] = fingerprint
+                    changed.append(s.name)
+                if self.policy and s.name not in self._failed:
+                    self._observe(s, fingerprint, previous, today, visited)
+            if self.policy:
+                self.intervals.update(self.policy.intervals(list(self.intervals)))
+                self.policy.save()
+            for s in due:
+                interval = self.intervals[s.name]
+                if s.name in self._failed:
+                    interval = min(interval, RETRY_INTERVAL)
+                self.due[s.name] = visited + interval
+
+        if not changed and today == self._published_on:
+            return False
+        logger.info(f"Publishing: {', '.join(changed) or 'new day'}")
+        buffers = [[e for e in events if keep(e)] for events in self.current.values()]
+        self.publish(list(pipeline.merge(buffers)))
+        self._published_on = today
+        return True
+
+    def _observe(self, source: pipeline.Source, fingerprint: frozenset, previous: Optional[frozenset],
+                 today: date, visited: float):
+        """Tell the policy whether this visit found anything new since the last one."""
+        requests = source.scraper.stats.requests if source.scraper is not None else 1
+        last = self._visited.get(source.name)
+        self._visited[source.name] = visited
+        if previous is None or last is None:
+            self.policy.record(source.name, None, None, requests)
+            return
+        # Events that have simply happened since last time aren't a change in the listing
+        upcoming = {f for f in previous if f[0][3] is None or f[0][3] >= today}
+        self.policy.record(source.name, fingerprint != upcoming, visited - last, requests)
+
+    def _settle(self, source: pipeline.Source, events: list, timed_out: bool) -> list:
+        scraped = bool(events)
+        if self.settle:
+            events = self.settle(source, events, timed_out)
+        # Stale events are a snapshot standing in for a failed scrape
+        if timed_out or not scraped or any(e.stale for e in events):
+            self._failed.add(source.name)
+        else:
+            self._failed.discard(source.name)
+        self.current[source.name] = events
+        return events
+
+    def seconds_until_due(self) -> float:
+        return max(0.0, min(self.due.values()) - self.clock())
+
+    def run_forever(self, stop: threading.Event):
+        """Tick until stop is set, sleeping until the next source is due."""
+        while not stop.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                # One bad tick shouldn't take the service down; retry the sources after a pause
+                logger.error(f"Refresh failed: {e}")
+                for name in self.due:
+                    self.due[name] = max(self.due[name], self.clock() + RETRY_INTERVAL)
+            # Wake at midnight too, so yesterday's events come off the page
+            wait = min(self.seconds_until_due(), _seconds_to_midnight())
+            logger.info(f"Next refresh in {wait / 60:.0f} min")
+            stop.wait(wait)
@@ -0,0 +1,345 @@
+"""Digest delivery — subscriber list, persistent outbox and batched sending."""
+
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from digest import Preferences
+
+logger = logging.getLogger("delivery")
+
+# Resend's batch endpoint accepts at most 100 emails per call
+BATCH_SIZE = 100
+
+
+@dataclass
+class Subscriber:
+    email: str
+    name: str = ""
+    prefs: Preferences = field(default_factory=Preferences)
+
+
+def load_subscribers(path: Path, env_fallback: bool = True) -> list[Subscriber]:
+    """Read the subscriber list, falling back to DIGEST_EMAIL (comma-separated) if env_fallback."""
+    entries = []
+    if path.exists():
+        for item in json.loads(path.read_text()):
+            if isinstance(item, str):
+                item = {"email": item}
+            entries.append(item)
+    elif env_fallback:
+        for addr in os.environ.get("DIGEST_EMAIL", "").split(","):
+            if addr.strip():
+                entries.append({"email": addr.strip()})
+
+    subscribers = []
+    seen = set()
+    for item in entries:
+        email = item.get("email", "").strip()
+        if not email or email.lower() in seen:
+            continue
+        seen.add(email.lower())
+        subscribers.append(Subscriber(
+            email=email,
+            name=item.get("name", ""),
+            prefs=Preferences.from_dict(item.get("preferences", {})),
+        ))
+    return subscribers
+
+
+def idempotency_key(digest_id: str, email: str) -> str:
+    """Stable key for one digest to one recipient."""
+    return hashlib.sha256(f"{digest_id}:{email.lower()}".encode()).hexdigest()[:32]
+
+
+@dataclass
+class Message:
+    key: str
+    to: str
+    subject: str
+    body: str  # sha256 of the HTML in the outbox body store
+    batch: str  # fixed at enqueue time so a resumed batch keeps its members
+    status: str = "pending"  # pending / sent / failed
+    attempts: int = 0
+    error: str = ""
+    provider_id: str = ""
+
+
+class Outbox:
+    """Append-only journal of queued and delivered messages.
+
+    Every state change is one JSON line, fsynced before the next batch goes
+    out, so replaying the journal after a crash gives the exact set of
+    messages still to send. Bodies are stored once per distinct HTML.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.journal = root / "journal.jsonl"
+        self.bodies = root / "bodies"
+        self.bodies.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.messages: dict[str, Message] = {}
+        self._replay()
+
+    def _replay(self):
+        if not self.journal.exists():
+            return
+        for line in self.journal.read_text().splitlines():
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                # Torn final line from a crash mid-write
+                continue
+            op = rec.get("op")
+            if op == "enqueue":
+                self.messages.setdefault(rec["key"], Message(
+                    key=rec["key"],
+                    to=rec["to"],
+                    subject=rec["subject"],
+                    body=rec["body"],
+                    batch=rec["batch"],
+                    status=rec.get("status", "pending"),
+                    attempts=rec.get("attempts", 0),
+                    provider_id=rec.get("provider_id", ""),
+                ))
+            elif op in ("sent", "failed"):
+                for i, key in enumerate(rec["keys"]):
+                    msg = self.messages.get(key)
+                    if not msg:
+                        continue
+                    msg.status = op
+                    msg.attempts = rec.get("attempts", msg.attempts)
+                    msg.error = rec.get("error", "")
+                    ids = rec.get("ids") or []
+                    if i < len(ids):
+                        msg.provider_id = ids[i]
+
+    def _append(self, records: list[dict]):
+        with self._lock:
+            with self.journal.open("a") as f:
+                for rec in records:
+                    f.write(json.dumps(rec) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _store_body(self, html: str) -> str:
+        digest = hashlib.sha256(html.encode()).hexdigest()
+        path = self.bodies / f"{digest}.html"
+        if not path.exists():
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(html)
+            tmp.replace(path)
+        return digest
+
+    def enqueue(self, digest_id: str, items: list[tuple[str, str, str]]) -> int:
+        """Queue (email, subject, html) items for a digest. Returns how many were new."""
+        records = []
+        bodies = {}
+        # New messages start a batch of their own, never one that may already have gone out
+        existing = {m.batch for m in self.messages.values() if m.batch.startswith(f"{digest_id}/")}
+        count = len(existing) * BATCH_SIZE
+        for to, subject, html in items:
+            key = idempotency_key(digest_id, to)
+            if key in self.messages:
+                continue
+            if html not in bodies:
+                bodies[html] = self._store_body(html)
+            msg = Message(
+                key=key,
+                to=to,
+                subject=subject,
+                body=bodies[html],
+                batch=f"{digest_id}/{count // BATCH_SIZE}",
+            )
+            count += 1
+            self.messages[key] = msg
+            records.append({
+                "op": "enqueue", "key": key, "to": to, "subject": subject,
+                "body": msg.body, "batch": msg.batch,
+            })
+        if records:
+            self._append(records)
+        return len(records)
+
+    def pending_batches(self) -> dict[str, list[Message]]:
+        batches: dict[str, list[Message]] = {}
+        for msg in self.messages.values():
+            if msg.status == "pending":
+                batches.setdefault(msg.batch, []).append(msg)
+        return batches
+
+    def html(self, msg: Message) -> str:
+        return (self.bodies / f"{msg.body}.html").read_text()
+
+    def mark_sent(self, batch: str, msgs: list[Message], ids: list[str], attempts: int):
+        for msg, pid in zip(msgs, ids + [""] * len(msgs)):
+            msg.status, msg.provider_id, msg.attempts = "sent", pid, attempts
+        self._append([{
+            "op": "sent", "batch": batch, "keys": [m.key for m in msgs],
+            "ids": ids, "attempts": attempts,
+        }])
+
+    def mark_failed(self, batch: str, msgs: list[Message], error: str, attempts: int):
+        for msg in msgs:
+            msg.status, msg.error, msg.attempts = "failed", error, attempts
+        self._append([{
+            "op": "failed", "batch": batch, "keys": [m.key for m in msgs],
+            "error": error, "attempts": attempts,
+        }])
+
+    def retry_failed(self):
+        """Move dead-lettered messages back to pending for another run, with their attempts reset."""
+        for msg in self.messages.values():
+            if msg.status == "failed":
+                msg.status, msg.attempts = "pending", 0
+
+    def compact(self, keep_digests: int = 4):
+        """Rewrite the journal as one line per message and drop unused bodies.
+
+        Only the most recent digests are kept, which is enough to stop a
+        re-run of this week's send from mailing anyone twice.
+        """
+        with self._lock:
+            digests = sorted({m.batch.split("/")[0] for m in self.messages.values()})
+            keep = set(digests[-keep_digests:])
+            self.messages = {
+                k: m for k, m in self.messages.items() if m.batch.split("/")[0] in keep
+            }
+            tmp = self.journal.with_suffix(".tmp")
+            with tmp.open("w") as f:
+                for m in self.messages.values():
+                    f.write(json.dumps({
+                        "op": "enqueue", "key": m.key, "to": m.to, "subject": m.subject,
+                        "body": m.body, "batch": m.batch, "status": m.status,
+                        "attempts": m.attempts, "provider_id": m.provider_id,
+                    }) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            tmp.replace(self.journal)
+
+            live = {m.body for m in self.messages.values() if m.status != "sent"}
+            for path in self.bodies.glob("*.html"):
+                if path.stem not in live:
+                    path.unlink()
+
+
+class ResendTransport:
+    """Send batches through Resend's batch API."""
+
+    def __init__(self, api_key: str, from_email: str):
+        import resend
+        resend.api_key = api_key
+        self.resend = resend
+        self.from_email = from_email
+
+    def send_batch(self, payloads: list[dict], idempotency_key: str) -> list[str]:
+        resp = self.resend.Batch.send(
+            [{"from": self.from_email, **p} for p in payloads],
+            {"idempotency_key": idempotency_key},
+        )
+        return [item.get("id", "") for item in resp.get("data", [])]
+
+
+class LocalTransport:
+    """Stand-in transport that writes each message to disk.
+
+    Remembers idempotency keys like the real API, and can inject latency
+    and transient failures to exercise retry and resume.
+    """
+
+    def __init__(self, root: Path, latency: float = 0.0, failure_rate: float = 0.0):
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._lock = threading.Lock()
+        self._seen: dict[str, list[str]] = {}
+
+    def send_batch(self, payloads: list[dict], idempotency_key: str) -> list[str]:
+        if self.latency:
+            time.sleep(self.latency)
+        if random.random() < self.failure_rate:
+            raise ConnectionError("injected transport failure")
+        with self._lock:
+            if idempotency_key in self._seen:
+                return self._seen[idempotency_key]
+            ids = []
+            for p in payloads:
+                msg_id = hashlib.sha1(f"{idempotency_key}:{p['to'][0]}".encode()).hexdigest()[:16]
+                (self.root / f"{msg_id}.html").write_text(
+                    f"<!-- To: {p['to'][0]} | Subject: {p['subject']} -->\n{p['html']}"
+                )
+                ids.append(msg_id)
+            self._seen[idempotency_key] = ids
+            return ids
+
+
+def make_transport(root: Path):
+    """Pick a transport from the environment, or None if email isn't configured."""
+    if os.environ.get("EMAIL_TRANSPORT") == "local":
+        return LocalTransport(root / "sent")
+    api_key = os.environ.get("RESEND_API_KEY")
+    if not api_key:
+        return None
+    return ResendTransport(
+        api_key,
+        os.environ.get("FROM_EMAIL", "London Culture <onboarding@resend.dev>"),
+    )
+
+
+def batch_key(msgs: list[Message]) -> str:
+    """Idempotency key for a batch, from the messages in it, so a resumed batch
+    reuses its key and no other batch can share it."""
+    return hashlib.sha256("\n".join(sorted(m.key for m in msgs)).encode()).hexdigest()[:32]
+
+
+def _send_with_backoff(outbox: Outbox, transport, batch: str, msgs: list[Message],
+                       max_attempts: int, backoff: float) -> bool:
+    payloads = [
+        {"to": [m.to], "subject": m.subject, "html": outbox.html(m)}
+        for m in msgs
+    ]
+    key = batch_key(msgs)
+    attempts = msgs[0].attempts
+    while True:
+        attempts += 1
+        try:
+            ids = transport.send_batch(payloads, key)
+            outbox.mark_sent(batch, msgs, ids, attempts)
+            return True
+        except Exception as e:
+            if attempts >= max_attempts:
+                logger.error(f"Batch {batch} failed after {attempts} attempts: {e}")
+                outbox.mark_failed(batch, msgs, f"{type(e).__name__}: {e}", attempts)
+                return False
+            delay = backoff * 2 ** (attempts - 1)
+            delay = random.uniform(delay / 2, delay)
+            logger.warning(f"Batch {batch} attempt {attempts} failed ({e}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+
+def deliver(outbox: Outbox, transport, concurrency: int = 4,
+            max_attempts: int = 5, backoff: float = 1.0) -> tuple[int, int]:
+    """Send every pending batch with bounded concurrency. Returns (sent, failed) message counts."""
+    batches = outbox.pending_batches()
+    sent = failed = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {
+            pool.submit(_send_with_backoff, outbox, transport, batch, msgs, max_attempts, backoff): msgs
+            for batch, msgs in batches.items()
+        }
+        for fut in as_completed(futures):
+            if fut.result():
+                sent += len(futures[fut])
+            else:
+                failed += len(futures[fut])
+    outbox.compact()
+    return sent, failed
@@ -0,0 +1,118 @@
+"""Delta digests — remember what each recipient has already been sent.
+
+For every recipient we keep a map of event fingerprint -> (content
+fingerprint, expiry, reminded). Fingerprints are 64-bit identity and
+32-bit content hashes, so each remembered event costs a few dozen bytes,
+and entries drop out once the event is over.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import date, timedelta
+from pathlib import Path
+
+logger = logging.getLogger("delta")
+
+# Events already sent are re-highlighted as "soon" once, this many days before they start
+SOON_DAYS = 3
+
+# How long to remember undated events
+UNDATED_TTL = 28
+
+NEW, CHANGED, SOON = "new", "updated", "soon"
+
+# Bump when content() changes, so remembered hashes aren't all taken for updates
+CONTENT_VERSION = 2
+
+
+def _hash(text: str, size: int) -> str:
+    return hashlib.blake2b(text.encode(), digest_size=size).hexdigest()
+
+
+def identity(e) -> str:
+    """Fingerprint of what makes an event the same event across runs."""
+    url = e.url.split("?")[0].rstrip("/")
+    return _hash(f"{url}|{e.title.lower().strip()}", 8)
+
+
+def content(e) -> str:
+    """Fingerprint of the details a reader would want to hear changed.
+
+    Not the description: enrichment and copy edits change it from run to
+    run without anything changing for someone planning to go.
+    """
+    return _hash(f"{e.start_date}|{e.end_date}|{e.time}|{e.is_free}|{e.venue}", 4)
+
+
+def expiry(e, today: date) -> int:
+    last = e.end_date or e.start_date
+    if last:
+        return (last + timedelta(days=1)).toordinal()
+    return (today + timedelta(days=UNDATED_TTL)).toordinal()
+
+
+class SentLog:
+    """Per-recipient record of the events already mailed."""
+
+    def __init__(self, path: Path, today: date | None = None):
+        self.path = path
+        self.today = today or date.today()
+        self.recipients: dict[str, dict[str, list]] = {}
+        if path.exists():
+            cutoff = self.today.toordinal()
+            data = json.loads(path.read_text())
+            current = data.get("content") == CONTENT_VERSION
+            for email, entries in (data["recipients"] if "recipients" in data else data).items():
+                live = {fp: v for fp, v in entries.items() if v[1] >= cutoff}
+                if not current:
+                    for v in live.values():
+                        v[0] = ""  # hashed some other way: unknown, not changed
+                if live:
+                    self.recipients[email] = live
+
+    def fingerprint(self, events) -> list[tuple[str, str, int, bool]]:
+        """Precompute (identity, content, expiry, starts soon) for a week's events."""
+        soon = self.today + timedelta(days=SOON_DAYS)
+        return [
+            (identity(e), content(e), expiry(e, self.today),
+             bool(e.start_date and e.start_date <= soon))
+            for e in events
+        ]
+
+    def pick(self, email: str, candidates, fps, limit: int) -> list[tuple[int, str]]:
+        """Choose (event index, label) pairs worth sending from candidate indexes.
+
+        A recipient with no history gets everything unlabelled.
+        """
+        history = self.recipients.get(email.lower())
+        picks = []
+        for i in candidates:
+            if len(picks) >= limit:
+                break
+            ident, cont, _, is_soon = fps[i]
+            if not history:
+                picks.append((i, ""))
+                continue
+            seen = history.get(ident)
+            if seen is None:
+                picks.append((i, NEW))
+            elif seen[0] and seen[0] != cont:
+                picks.append((i, CHANGED))
+            elif is_soon and not seen[2]:
+                picks.append((i, SOON))
+        return picks
+
+    def record(self, email: str, picks, fps):
+        history = self.recipients.setdefault(email.lower(), {})
+        for i, label in picks:
+            ident, cont, exp, is_soon = fps[i]
+            # Anything sent inside the soon window doubles as its reminder
+            reminded = is_soon or (ident in history and history[ident][2])
+            history[ident] = [cont, exp, int(bool(reminded))]
+
+    def save(self):
+        self.path.parent.mkdir(exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"content": CONTENT_VERSION, "recipients": self.recipients}, separators=(",", ":")))
+        tmp.replace(self.path)
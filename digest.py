@@ -0,0 +1,177 @@
+"""Personalised digest rendering.
+
+Each event is rendered to an HTML fragment once. Preferences are answered
+with bitsets precomputed over the week's events (bit i = events[i]), so a
+subscriber's selection is a handful of integer ANDs, and subscribers who
+end up with the same selection share one rendered email.
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from scrapers.geo import region_of
+
+logger = logging.getLogger("digest")
+
+# Cap each email at 40 events
+MAX_EVENTS = 40
+
+# Below this many distinct selections a process pool costs more than it saves
+POOL_THRESHOLD = 64
+
+DAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+
+@dataclass
+class Preferences:
+    venues: list[str] = field(default_factory=list)  # page sources, e.g. "Barbican", "Eventbrite"
+    categories: list[str] = field(default_factory=list)  # display categories, e.g. "Talks"
+    areas: list[str] = field(default_factory=list)
+    days: list[str] = field(default_factory=list)  # "mon" … "sun"
+    free_only: bool = False
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Preferences":
+        return cls(
+            venues=list(data.get("venues", [])),
+            categories=list(data.get("categories", [])),
+            areas=list(data.get("areas", [])),
+            days=[d.strip().lower()[:3] for d in data.get("days", [])],
+            free_only=bool(data.get("free_only", False)),
+        )
+
+
+class EventIndex:
+    """One bitset per value of each preference dimension over a list of events.
+
+    Keys are matched case-insensitively: "barbican" finds "Barbican".
+    """
+
+    def __init__(self, events, category_of, source_of, region_of=region_of):
+        self.all = (1 << len(events)) - 1
+        self.venues: dict[str, int] = {}
+        self.categories: dict[str, int] = {}
+        self.areas: dict[str, int] = {}
+        self.days: dict[str, int] = {}
+        self.labels: dict[str, str] = {}  # venue or category key -> as the events spell it, for display
+        self.free = 0
+        for i, e in enumerate(events):
+            bit = 1 << i
+            for index, value in ((self.venues, source_of(e)), (self.categories, category_of(e))):
+                key = _key(value)
+                self.labels.setdefault(key, value)
+                _add(index, key, bit)
+            if e.area:
+                _add(self.areas, e.area.lower(), bit)
+                # Broad regions ("east", "central") work as areas too
+                region = region_of(e.area)
+                if region:
+                    _add(self.areas, region.lower(), bit)
+            if e.start_date:
+                _add(self.days, DAYS[e.start_date.weekday()], bit)
+            if e.is_free:
+                self.free |= bit
+
+    def select(self, prefs: Preferences) -> int:
+        """Bitset of the events matching every dimension the subscriber has set."""
+        mask = self.all
+        if prefs.venues:
+            mask &= _union(self.venues, [_key(v) for v in prefs.venues])
+        if prefs.categories:
+            mask &= _union(self.categories, [_key(c) for c in prefs.categories])
+        if prefs.areas:
+            mask &= _union(self.areas, [_key(a) for a in prefs.areas])
+        if prefs.days:
+            mask &= _union(self.days, prefs.days)
+        if prefs.free_only:
+            mask &= self.free
+        return mask
+
+
+def _key(value: str) -> str:
+    return value.strip().lower()
+
+
+def _add(index: dict[str, int], key: str, bit: int):
+    index[key] = index.get(key, 0) | bit
+
+
+def _union(index: dict[str, int], keys: list[str]) -> int:
+    mask = 0
+    for key in keys:
+        mask |= index.get(key, 0)
+    return mask
+
+
+def iter_bits(mask: int, limit: int | None = None):
+    """Yield set bit positions, lowest first."""
+    n = 0
+    while mask and (limit is None or n < limit):
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+        n += 1
+
+
+def select_events(index: EventIndex, subscribers, delta=None, fps=None) -> dict[str, tuple]:
+    """Pick the (event index, label) pairs for each subscriber; empty selections are left out.
+
+    With a delta SentLog only new, changed or soon-starting events are picked.
+    """
+    selections = {}
+    for sub in subscribers:
+        mask = index.select(sub.prefs)
+        if delta is not None:
+            picks = tuple(delta.pick(sub.email, iter_bits(mask), fps, MAX_EVENTS))
+        else:
+            picks = tuple((i, "") for i in iter_bits(mask, MAX_EVENTS))
+        if picks:
+            selections[sub.email] = picks
+        else:
+            logger.info(f"Nothing to send to {sub.email}")
+    return selections
+
+
+# Worker state for the process pool, set once per process by _init_worker
+_shared: dict = {}
+
+
+def _init_worker(head: str, tail: str, fragments: dict):
+    _shared.update(head=head, tail=tail, fragments=fragments)
+
+
+def _assemble(picks: tuple) -> str:
+    fragments = _shared["fragments"]
+    body = "".join(fragments[p] for p in picks)
+    return _shared["head"] + body + _shared["tail"]
+
+
+def render_digests(env, events, selections: dict[str, tuple], **context) -> dict[str, str]:
+    """Render one email per selection. Returns {email: html}."""
+    fragment_tpl = env.get_template("email_event.html")
+    needed = {p for picks in selections.values() for p in picks}
+    fragments = {(i, label): fragment_tpl.render(event=events[i], label=label) for i, label in needed}
+
+    # Render the shell once and split it around the body slot
+    marker = "\x00body\x00"
+    head, tail = env.get_template("email.html").render(body=marker, **context).split(marker)
+
+    by_picks: dict[tuple, list[str]] = {}
+    for email, picks in selections.items():
+        by_picks.setdefault(picks, []).append(email)
+
+    groups = list(by_picks)
+    if len(groups) >= POOL_THRESHOLD:
+        with ProcessPoolExecutor(initializer=_init_worker, initargs=(head, tail, fragments)) as pool:
+            rendered = list(pool.map(_assemble, groups, chunksize=32))
+    else:
+        _init_worker(head, tail, fragments)
+        rendered = [_assemble(g) for g in groups]
+
+    logger.info(f"Rendered {len(groups)} distinct digests for {len(selections)} subscribers")
+    return {
+        email: html
+        for picks, html in zip(groups, rendered)
+        for email in by_picks[picks]
+    }
@@ -0,0 +1,289 @@
+"""Detail-page enrichment — fill in descriptions, times and prices listings leave out.
+
+Events missing a description or time have their own page fetched by a
+small thread pool while the rest of the run carries on. Each page is
+read for a schema.org Event in JSON-LD first, then for the venue's own
+markup, then for the generic meta description. Results are cached by URL
+for a week, so a normal run only fetches events it hasn't seen before.
+Enrichment only fills gaps; it never overwrites what the listing said.
+"""
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from contextlib import nullcontext
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger("enrich")
+
+WORKERS = 4
+
+# Don't let one run fetch more than this many detail pages
+MAX_FETCHES = 150
+
+# How long a fetched page's details are trusted
+TTL_DAYS = 7
+
+# Pause between requests to the same host, like BaseScraper.delay
+HOST_DELAY = 1.0
+
+# Per-venue selectors for when a page has no usable JSON-LD
+VENUE_SELECTORS = {
+    "Barbican": {"description": "div.typography p", "time": "div.event-detail__performance-time"},
+    "Rich Mix": {"description": "div.event-intro p, div.content p", "time": "span.time"},
+    "Somerset House": {"description": "div.rich-text p", "time": "p.event-times"},
+    "ICA": {"description": "div.description p", "time": "div.time"},
+}
+
+
+def _format_time(value: str) -> str:
+    """'2026-03-05T19:00:00+00:00' -> '7:00pm'; date-only values have no time."""
+    if "T" not in value:
+        return ""
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).strftime("%-I:%M%p").lower()
+    except ValueError:
+        return ""
+
+
+def _ld_events(data):
+    """Every schema.org *Event object in a JSON-LD blob, however it's nested."""
+    if isinstance(data, list):
+        for item in data:
+            yield from _ld_events(item)
+    elif isinstance(data, dict):
+        kind = data.get("@type", "")
+        kinds = kind if isinstance(kind, list) else [kind]
+        if any(isinstance(k, str) and k.endswith("Event") for k in kinds):
+            yield data
+        if "@graph" in data:
+            yield from _ld_events(data["@graph"])
+
+
+def _is_free(ld: dict):
+    if ld.get("isAccessibleForFree") in (True, "true", "True"):
+        return True
+    offers = ld.get("offers")
+    offers = offers if isinstance(offers, list) else [offers] if offers else []
+    prices = []
+    for offer in offers:
+        try:
+            prices.append(float(offer.get("price")))
+        except (AttributeError, TypeError, ValueError):
+            continue
+    return (max(prices) == 0) if prices else None
+
+
+def extract(html: str, venue: str) -> dict:
+    """Description, time and is_free from a detail page, whichever it offers."""
+    soup = BeautifulSoup(html, "html.parser")
+    found = {}
+
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(script.string or "")
+        except json.JSONDecodeError:
+            continue
+        for ld in _ld_events(data):
+            if ld.get("description") and "description" not in found:
+                found["description"] = BeautifulSoup(ld["description"], "html.parser").get_text(" ", strip=True)
+            if ld.get("startDate") and "time" not in found:
+                time_str = _format_time(str(ld["startDate"]))
+                if time_str:
+                    found["time"] = time_str
+            free = _is_free(ld)
+            if free is not None and "is_free" not in found:
+                found["is_free"] = free
+
+    selectors = VENUE_SELECTORS.get(venue, {})
+    for key in ("description", "time"):
+        if key not in found and key in selectors:
+            el = soup.select_one(selectors[key])
+            if el and el.get_text(strip=True):
+                found[key] = el.get_text(" ", strip=True)
+
+    if "description" not in found:
+        meta = soup.find("meta", attrs={"name": "description"}) or soup.find("meta", property="og:description")
+        if meta and meta.get("content"):
+            found["description"] = meta["content"].strip()
+
+    if "description" in found:
+        found["description"] = found["description"][:200]
+    return found
+
+
+class EnrichCache:
+    """URL -> extracted details, with the day they were fetched.
+
+    Cities running side by side share one cache file: pass them the same
+    lock (a Manager's, across processes) and each save merges in what the
+    others saved since it was loaded.
+    """
+
+    def __init__(self, path: Path, today: date | None = None, ttl_days: int = TTL_DAYS, lock=None):
+        self.path = path
+        self.lock = lock
+        self.cutoff = ((today or date.today()) - timedelta(days=ttl_days)).isoformat()
+        self.entries: dict[str, dict] = {}
+        if path.exists():
+            try:
+                self.entries = json.loads(path.read_text())
+            except (json.JSONDecodeError, OSError) as e:
+                logger.warning(f"Ignoring unreadable enrichment cache {path}: {e}")
+
+    def get(self, url: str) -> dict | None:
+        entry = self.entries.get(url)
+        return entry if entry and entry.get("fetched", "") >= self.cutoff else None
+
+    def put(self, url: str, details: dict, today: date | None = None):
+        self.entries[url] = {**details, "fetched": (today or date.today()).isoformat()}
+
+    def save(self):
+        with self.lock or nullcontext():
+            if self.lock is not None and self.path.exists():
+                try:
+                    for url, entry in json.loads(self.path.read_text()).items():
+                        if entry.get("fetched", "") > self.entries.get(url, {}).get("fetched", ""):
+                            self.entries[url] = entry
+                except (json.JSONDecodeError, OSError) as e:
+                    logger.warning(f"Not merging unreadable enrichment cache {self.path}: {e}")
+            # Expired entries would be refetched anyway, so don't keep them
+            fresh = {u: e for u, e in self.entries.items() if e.get("fetched", "") >= self.cutoff}
+            self.path.parent.mkdir(exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(fresh, indent=2, sort_keys=True))
+            tmp.replace(self.path)
+
+
+def needs_enrichment(e) -> bool:
+    return bool(e.url) and (not e.description or not e.time)
+
+
+def apply(e, details: dict):
+    """Fill whatever the event is missing from details."""
+    if not e.description and details.get("description"):
+        e.description = details["description"]
+    if not e.time and details.get("time"):
+        e.time = details["time"]
+    if details.get("is_free") and not e.is_free:
+        e.is_free = True
+
+
+class Enricher:
+    """A pipeline tap: events go in as they're scraped, detail pages are fetched in the background.
+
+    close() waits for the outstanding fetches and saves the cache, so
+    everything added has been filled in by the time it returns, unless
+    the deadline (set by pipeline.run) passes first: then fetches not yet
+    made are dropped and their events go out as they are.
+    """
+
+    def __init__(self, cache: EnrichCache, workers: int = WORKERS, max_fetches: int = MAX_FETCHES,
+                 host_delay: float = HOST_DELAY, session_factory=requests.Session, limiter=None):
+        self.cache = cache
+        self.limiter = limiter  # a HostLimiter shared with the scrapers, if several cities run at once
+        self.max_fetches = max_fetches
+        self.host_delay = host_delay
+        self.session_factory = session_factory
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="enrich")
+        self.futures = []
+        self.pending: dict[str, list] = {}  # url -> events waiting on it
+        self.deadline: Optional[float] = None  # time.monotonic() by which to stop fetching
+        self.fetched = self.cached = self.failed = self.dropped = 0
+        self._closed = False
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._host_locks: dict[str, threading.Lock] = {}
+        self._host_last: dict[str, float] = {}
+
+    def add(self, e):
+        if not needs_enrichment(e):
+            return
+        # Under the lock, so a fetch can't finish between the checks and miss this event
+        with self._lock:
+            details = self.cache.get(e.url)
+            if details is not None:
+                self.cached += 1
+                apply(e, details)
+                return
+            if e.url in self.pending:
+                self.pending[e.url].append(e)
+                return
+            if len(self.pending) >= self.max_fetches:
+                return
+            self.pending[e.url] = [e]
+        self.futures.append(self.pool.submit(self._fetch, e.url, e.venue))
+
+    def _session(self) -> requests.Session:
+        if not hasattr(self._local, "session"):
+            self._local.session = self.session_factory()
+            self._local.session.headers.update({
+                "User-Agent": "LondonCulture/1.0 (personal event aggregator)"
+            })
+        return self._local.session
+
+    def _host_lock(self, host: str) -> threading.Lock:
+        with self._lock:
+            return self._host_locks.setdefault(host, threading.Lock())
+
+    def _fetch(self, url: str, venue: str):
+        # One request at a time per host, at least host_delay apart
+        host = urlsplit(url).netloc
+        with self._host_lock(host):
+            if self.limiter is not None:
+                wait = self.limiter.reserve(host, self.host_delay)
+            else:
+                wait = self._host_last.get(host, 0.0) + self.host_delay - time.monotonic()
+            if self._out_of_time(max(wait, 0.0)):
+                with self._lock:
+                    self.dropped += 1
+                return
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                timeout = 15 if self.deadline is None else max(0.1, min(15, self.deadline - time.monotonic()))
+                resp = self._session().get(url, timeout=timeout)
+                resp.raise_for_status()
+                html = resp.text
+            except Exception as e:
+                logger.debug(f"Detail page {url} failed: {e}")
+                with self._lock:
+                    self.failed += 1
+                return
+            finally:
+                self._host_last[host] = time.monotonic()
+
+        details = extract(html, venue)
+        with self._lock:
+            # Once closed, the events may already be on their way to the sinks and the cache saved
+            if self._closed:
+                return
+            self.fetched += 1
+            self.cache.put(url, details)
+            for e in self.pending.get(url, []):
+                apply(e, details)
+
+    def _out_of_time(self, wait: float = 0.0) -> bool:
+        return self.deadline is not None and time.monotonic() + wait >= self.deadline
+
+    def close(self):
+        try:
+            for f in self.futures:
+                f.result(timeout=None if self.deadline is None else max(0.0, self.deadline - time.monotonic()))
+        except FutureTimeout:
+            pass
+        with self._lock:
+            self._closed = True
+            unfinished = sum(1 for f in self.futures if not f.done())
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.cache.save()
+        logger.info(f"Enriched: {self.fetched} fetched, {self.cached} from cache, {self.failed} failed"
+                    + (f", {self.dropped + unfinished} left at the deadline" if self.dropped + unfinished else ""))
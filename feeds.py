@@ -0,0 +1,261 @@
+"""Calendar feeds — iCalendar files of the listings, rewritten only when their events change.
+
+build_html writes output/calendar/all.ics plus one feed per page source
+(each core venue, and Eventbrite) and one per page category. Each event's
+UID comes from its identity (URL and title, as in delta digests) and its
+date, so calendar apps update an event in place rather than duplicating
+it. data/feeds.json keeps each feed's content hash and when it last
+changed: a feed whose events are unchanged isn't rewritten, and if it has
+to be written again (on a fresh checkout) it comes out byte for byte the
+same, so its ETag on the host stays the same and pollers get a 304.
+
+Events are serialized line by line straight to the file rather than
+built up as one string per feed.
+"""
+
+import hashlib
+import json
+import logging
+import re
+from datetime import datetime, time, timedelta, timezone
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from delta import identity
+from scrapers.base import to_record
+
+logger = logging.getLogger("feeds")
+
+# Bump when the output format changes, so every feed is rewritten once
+FORMAT = 1
+
+# How often calendar apps are asked to re-fetch a feed
+REFRESH = "PT12H"
+
+PRODID = "-//london-culture//events//EN"
+TZID = "Europe/London"
+
+# Folded lines are at most this many octets, not counting the CRLF
+LINE_OCTETS = 75
+
+_VTIMEZONE = [
+    "BEGIN:VTIMEZONE", f"TZID:{TZID}",
+    "BEGIN:DAYLIGHT", "TZOFFSETFROM:+0000", "TZOFFSETTO:+0100", "TZNAME:BST",
+    "DTSTART:19700329T010000", "RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=-1SU", "END:DAYLIGHT",
+    "BEGIN:STANDARD", "TZOFFSETFROM:+0100", "TZOFFSETTO:+0000", "TZNAME:GMT",
+    "DTSTART:19701025T020000", "RRULE:FREQ=YEARLY;BYMONTH=10;BYDAY=-1SU", "END:STANDARD",
+    "END:VTIMEZONE",
+]
+
+_TIME = re.compile(r"(\d{1,2})(?:[:.](\d{2}))?\s*(am|pm)?")
+
+
+def slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def parse_times(text: str) -> tuple[Optional[time], Optional[time]]:
+    """Start and end times from strings like "7pm", "6.30–9pm" or "19:00 – 22:00"."""
+    found = _TIME.findall(text.lower())[:2]
+    # A bare number is more likely a date or a price than a time
+    if not any(minutes or meridiem for _, minutes, meridiem in found):
+        return None, None
+    # "7–9pm": a time without its own am/pm takes the next one's
+    meridiem = next((m for _, _, m in reversed(found) if m), "")
+    times = []
+    for hour, minutes, own in found:
+        h, m = int(hour), int(minutes or 0)
+        if own or meridiem:
+            h = h % 12 + (12 if (own or meridiem) == "pm" else 0)
+        if h > 23 or m > 59:
+            break
+        times.append(time(h, m))
+    if not times:
+        return None, None
+    if len(times) < 2:
+        return times[0], None
+    start, end = times
+    if start > end and not found[0][2] and start.hour >= 12:
+        start = start.replace(hour=start.hour - 12)  # "11–2pm"
+    return start, end if end > start else None
+
+
+def uid(e) -> str:
+    day = e.start_date.strftime("%Y%m%d") if e.start_date else "undated"
+    return f"{identity(e)}-{day}@london-culture"
+
+
+def _escape(text: str) -> str:
+    return (text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def _fold(line: str) -> bytes:
+    """Encode a content line, split into CRLF-terminated pieces of at most 75 octets."""
+    data = line.encode()
+    if len(data) <= LINE_OCTETS:
+        return data + b"\r\n"
+    pieces, start, limit = [], 0, LINE_OCTETS
+    while len(data) - start > limit:
+        end = start + limit
+        # Don't split a multi-byte character: back up to the start of one
+        while data[end] & 0xC0 == 0x80:
+            end -= 1
+        pieces.append(data[start:end])
+        # Continuation lines start with a space, which counts towards the limit
+        start, limit = end, LINE_OCTETS - 1
+    pieces.append(data[start:])
+    return b"\r\n ".join(pieces) + b"\r\n"
+
+
+def _vevent(e) -> Iterator[str]:
+    """The lines of an event after its UID and DTSTAMP."""
+    start, end = parse_times(e.time)
+    last = e.end_date or e.start_date
+    if start and last == e.start_date:
+        day = e.start_date.strftime("%Y%m%d")
+        yield f"DTSTART;TZID={TZID}:{day}T{start:%H%M%S}"
+        if end:
+            yield f"DTEND;TZID={TZID}:{day}T{end:%H%M%S}"
+    else:
+        # Runs over several days, or no time given: all-day, DTEND exclusive
+        yield f"DTSTART;VALUE=DATE:{e.start_date:%Y%m%d}"
+        yield f"DTEND;VALUE=DATE:{last + timedelta(days=1):%Y%m%d}"
+    yield f"SUMMARY:{_escape(e.title)}"
+    yield f"LOCATION:{_escape(', '.join(p for p in (e.venue, e.area) if p))}"
+    if e.url:
+        yield f"URL:{e.url}"
+    details = [e.time, "Free" if e.is_free else "", e.description, e.url]
+    yield f"DESCRIPTION:{_escape(chr(10).join(d for d in details if d))}"
+    if e.filter_cat:
+        yield f"CATEGORIES:{_escape(e.filter_cat)}"
+    yield "TRANSP:TRANSPARENT"
+    yield "END:VEVENT"
+
+
+def serialize(name: str, events: Iterable, stamp: str, bodies: Optional[dict] = None) -> Iterator[bytes]:
+    """The feed as folded, CRLF-terminated UTF-8 lines. Undated events are left out.
+
+    bodies caches each event's serialized lines, for events in several feeds.
+    """
+    head = [
+        "BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN", "METHOD:PUBLISH",
+        f"NAME:{_escape(name)}", f"X-WR-CALNAME:{_escape(name)}", f"X-WR-TIMEZONE:{TZID}",
+        f"REFRESH-INTERVAL;VALUE=DURATION:{REFRESH}", f"X-PUBLISHED-TTL:{REFRESH}",
+    ]
+    for line in head + _VTIMEZONE:
+        yield _fold(line)
+    bodies = {} if bodies is None else bodies
+    dtstamp = _fold(f"DTSTAMP:{stamp}")
+    for e in events:
+        if not e.start_date:
+            continue
+        body = bodies.get(id(e))
+        if body is None:
+            body = bodies[id(e)] = b"".join(_fold(line) for line in _vevent(e))
+        yield b"BEGIN:VEVENT\r\n"
+        yield _fold(f"UID:{uid(e)}")
+        yield dtstamp
+        yield body
+    yield _fold("END:VCALENDAR")
+
+
+def _digest(name: str, events: list, records: Optional[dict] = None) -> str:
+    """Hash of a feed's events. records caches each event's share, like serialize()'s bodies."""
+    records = {} if records is None else records
+    h = hashlib.blake2b(f"{FORMAT}|{name}".encode(), digest_size=8)
+    for e in events:
+        if e.start_date:
+            record = records.get(id(e))
+            if record is None:
+                record = records[id(e)] = repr((to_record(e), e.filter_cat)).encode()
+            h.update(record)
+    return h.hexdigest()
+
+
+def _stamp(when: datetime) -> str:
+    return when.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+class FeedWriter:
+    """Writes feeds into a directory, remembering what each one held in a manifest."""
+
+    def __init__(self, directory: Path, manifest: Path):
+        self.directory = directory
+        self.manifest = manifest
+        self.feeds: dict[str, dict] = {}  # file name -> {"name", "hash", "modified", "events"}
+        self._stat = None
+        self._load()
+
+    def _load(self):
+        """(Re)read the manifest if it has changed since last time."""
+        try:
+            st = self.manifest.stat()
+        except FileNotFoundError:
+            return
+        if (st.st_mtime_ns, st.st_size) == self._stat:
+            return
+        try:
+            self.feeds = json.loads(self.manifest.read_text())
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Ignoring unreadable feed manifest {self.manifest}: {e}")
+        self._stat = (st.st_mtime_ns, st.st_size)
+
+    def write_all(self, events: list) -> list[tuple[str, str]]:
+        """All events, then one feed per source and per category. Returns (name, file) pairs."""
+        groups = {"all.ics": ("All events", events)}
+        for attr, prefix in (("source", "venue"), ("filter_cat", "category")):
+            members: dict[str, list] = {}
+            for e in events:
+                members.setdefault(getattr(e, attr), []).append(e)
+            for key, group in sorted(members.items()):
+                if key:
+                    groups[f"{prefix}-{slug(key)}.ics"] = (key, group)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        now = datetime.now(timezone.utc)
+        written = 0
+        bodies: dict[int, bytes] = {}
+        records: dict[int, bytes] = {}
+        for filename, (name, group) in groups.items():
+            written += self.write(filename, name, group, now, bodies, records)
+        for old in self.directory.glob("*.ics"):
+            if old.name not in groups:
+                old.unlink()
+        self.feeds = {k: v for k, v in self.feeds.items() if k in groups}
+        self.manifest.parent.mkdir(exist_ok=True)
+        self.manifest.write_text(json.dumps(self.feeds, indent=2, sort_keys=True))
+        logger.info(f"Calendar feeds: {written} of {len(groups)} rewritten")
+        return [(name, filename) for filename, (name, _) in groups.items()]
+
+    def write(self, filename: str, name: str, events: list, now: datetime,
+              bodies: Optional[dict] = None, records: Optional[dict] = None) -> bool:
+        """Write one feed if its events changed or the file is missing. True if it wrote."""
+        path = self.directory / filename
+        digest = _digest(name, events, records)
+        entry = self.feeds.get(filename)
+        if entry and entry["hash"] == digest:
+            if path.exists():
+                return False
+            stamp = entry["modified"]  # same events, same stamp: the same bytes as before
+        else:
+            stamp = _stamp(now)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.writelines(serialize(name, events, stamp, bodies))
+        tmp.replace(path)
+        self.feeds[filename] = {
+            "name": name, "hash": digest, "modified": stamp,
+            "events": sum(1 for e in events if e.start_date),
+        }
+        return True
+
+    def lookup(self, filename: str) -> Optional[tuple[Path, str, datetime]]:
+        """(path, ETag, last modified) for a feed that exists, for serving it over HTTP."""
+        self._load()  # another process may have rewritten the feeds
+        entry = self.feeds.get(filename)
+        path = self.directory / filename
+        if entry is None or not path.exists():
+            return None
+        modified = datetime.strptime(entry["modified"], "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+        return path, f'"{entry["hash"]}"', modified
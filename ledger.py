@@ -0,0 +1,112 @@
+"""Run ledger — append-only per-source history, and regression checks against it.
+
+Scrapers swallow their own errors, so a venue returning nothing looks just
+like a quiet week. Each run appends one JSON line to the ledger, and
+the checker compares the current run with the rolling window before it
+using median/MAD so one odd week in the history doesn't mask the next.
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from statistics import median
+
+# How many previous runs to compare against, and how many we need before judging
+WINDOW = 8
+MIN_HISTORY = 3
+
+# Exceptions that mean the site was unreachable rather than that its markup changed
+NETWORK_ERRORS = {
+    "ConnectionError", "ConnectTimeout", "ReadTimeout", "Timeout", "HTTPError",
+    "SSLError", "TooManyRedirects", "ChunkedEncodingError", "TimeoutError",
+    "DeadlineExceeded",
+}
+
+
+@dataclass
+class Regression:
+    source: str
+    kind: str  # missing / yield / latency / parse
+    detail: str
+
+    def __str__(self):
+        return f"{self.source}: {self.detail}"
+
+
+def read_ledger(path: Path) -> list[dict]:
+    if not path.exists():
+        return []
+    runs = []
+    for line in path.read_text().splitlines():
+        try:
+            runs.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return runs
+
+
+def append_run(path: Path, run: dict):
+    path.parent.mkdir(exist_ok=True)
+    with path.open("a") as f:
+        f.write(json.dumps(run, separators=(",", ":")) + "\n")
+
+
+def ledger_entry(metrics: dict) -> dict:
+    """The slice of a run's metrics worth keeping in the ledger."""
+    return {
+        "run_at": metrics["run_at"],
+        "sources": {
+            name: {
+                "events": s["events"],
+                "duration_seconds": s["duration_seconds"],
+                "requests": s["requests"],
+                "errors": s["errors"],
+                "timed_out": s.get("timed_out", False),
+            }
+            for name, s in metrics["sources"].items()
+        },
+    }
+
+
+def _mad(values: list[float], mid: float) -> float:
+    return median(abs(v - mid) for v in values)
+
+
+def _parse_failures(errors: dict) -> int:
+    return sum(n for cls, n in errors.items() if cls not in NETWORK_ERRORS)
+
+
+def check_regressions(history: list[dict], current: dict) -> list[Regression]:
+    """Compare the current ledger entry with the recent runs before it."""
+    recent = history[-WINDOW:]
+    found = []
+    for name in sorted({n for run in recent for n in run["sources"]} | set(current["sources"])):
+        past = [run["sources"][name] for run in recent if name in run["sources"]]
+        if len(past) < MIN_HISTORY:
+            continue
+        now = current["sources"].get(name)
+        if now is None:
+            found.append(Regression(name, "missing", "did not run"))
+            continue
+
+        counts = [p["events"] for p in past]
+        mid = median(counts)
+        if mid >= 3 and now["events"] < mid / 2 and now["events"] < mid - 3 * _mad(counts, mid):
+            found.append(Regression(
+                name, "yield", f"{now['events']} events, usually about {mid:g}"
+            ))
+
+        durations = [p["duration_seconds"] for p in past]
+        mid = median(durations)
+        limit = max(3 * mid, mid + 4 * _mad(durations, mid), 5.0)
+        if now["duration_seconds"] > limit:
+            found.append(Regression(
+                name, "latency", f"took {now['duration_seconds']:.1f}s, usually about {mid:.1f}s"
+            ))
+
+        failures = _parse_failures(now["errors"])
+        failure_rate = sum(1 for p in past if _parse_failures(p["errors"])) / len(past)
+        if failures and failure_rate < 0.5:
+            classes = ", ".join(sorted(c for c in now["errors"] if c not in NETWORK_ERRORS))
+            found.append(Regression(name, "parse", f"parse failures ({classes})"))
+    return found
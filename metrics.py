@@ -0,0 +1,148 @@
+"""Run metrics — per-source and per-stage timings, written as JSON and Prometheus text."""
+
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+PREFIX = "london_culture"
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+class Metrics:
+    """Collects what one run of the pipeline spent its time on."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Start over, for a process that runs the pipeline more than once (the daemon)."""
+        self.started = time.time()
+        self.sources: dict[str, dict] = {}
+        self.stages: dict[str, float] = {}
+        self.browser: dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started
+
+    @contextmanager
+    def timer(self, store: dict, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            store[name] = store.get(name, 0.0) + time.perf_counter() - started
+
+    def record_source(self, scraper, events: int, duration: float, timed_out: bool = False):
+        """Fold a finished (or abandoned) scraper's counters into the run."""
+        st = scraper.stats
+        self.sources[scraper.name] = {
+            "requests": st.requests,
+            "bytes": st.bytes,
+            "http_seconds": round(st.http_seconds, 4),
+            "http_p50_seconds": round(_percentile(st.latencies, 50), 4),
+            "http_p95_seconds": round(_percentile(st.latencies, 95), 4),
+            "wait_seconds": round(st.wait_seconds, 4),
+            # Whatever wasn't fetching (bodies included) or politeness sleeps is parsing
+            "parse_seconds": round(max(0.0, duration - st.http_seconds - st.wait_seconds), 4),
+            "duration_seconds": round(duration, 4),
+            "events": events,
+            "errors": dict(st.errors),
+            "hedged": st.hedged,
+            "timed_out": timed_out,
+        }
+
+    def absorb(self, other: dict):
+        """Fold in another process's to_dict(), such as one shard of a sharded run.
+
+        A source split across shards adds up its counts; its duration and
+        latency percentiles are the worst shard's, since shards run side by side.
+        """
+        for name, theirs in other.get("sources", {}).items():
+            ours = self.sources.get(name)
+            if ours is None:
+                self.sources[name] = {**theirs, "errors": dict(theirs["errors"])}
+                continue
+            for key in ("requests", "bytes", "http_seconds", "wait_seconds", "parse_seconds", "events", "hedged"):
+                ours[key] += theirs[key]
+            for key in ("http_p50_seconds", "http_p95_seconds", "duration_seconds"):
+                ours[key] = max(ours[key], theirs[key])
+            for cls, n in theirs["errors"].items():
+                ours["errors"][cls] = ours["errors"].get(cls, 0) + n
+            ours["timed_out"] = ours["timed_out"] or theirs.get("timed_out", False)
+        for name, secs in other.get("stages", {}).items():
+            self.stages[name] = max(self.stages.get(name, 0.0), secs)
+        for name, secs in other.get("browser", {}).items():
+            self.browser[name] = max(self.browser.get(name, 0.0), secs)
+
+    def to_dict(self) -> dict:
+        return {
+            "run_at": datetime.fromtimestamp(self.started, timezone.utc).isoformat(timespec="seconds"),
+            "duration_seconds": round(time.time() - self.started, 4),
+            "sources": self.sources,
+            "stages": {k: round(v, 6) for k, v in self.stages.items()},
+            "browser": {k: round(v, 4) for k, v in self.browser.items()},
+        }
+
+    def to_prometheus(self) -> str:
+        data = self.to_dict()
+        lines = []
+
+        def gauge(name, help_text, samples):
+            lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}_{name} gauge")
+            for labels, value in samples:
+                label_str = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                lines.append(f"{PREFIX}_{name}{{{label_str}}} {value}" if label_str else f"{PREFIX}_{name} {value}")
+
+        gauge("run_timestamp_seconds", "Unix time the run started.", [({}, int(self.started))])
+        gauge("run_duration_seconds", "Wall-clock time of the whole run.", [({}, data["duration_seconds"])])
+        for key, help_text in [
+            ("requests", "HTTP requests or page loads made by the source."),
+            ("bytes", "Response bytes received by the source."),
+            ("http_seconds", "Time spent fetching responses, bodies included."),
+            ("http_p95_seconds", "95th percentile request latency."),
+            ("parse_seconds", "Time spent parsing and building events."),
+            ("duration_seconds", "Total time spent on the source."),
+            ("events", "Events yielded by the source."),
+            ("hedged", "Requests re-sent because the first attempt was slow."),
+        ]:
+            gauge(f"source_{key}", help_text, [
+                ({"source": name}, stats[key]) for name, stats in data["sources"].items()
+            ])
+        gauge("source_timed_out", "1 if the source was cut off at its time budget.", [
+            ({"source": name}, int(stats["timed_out"])) for name, stats in data["sources"].items()
+        ])
+        gauge("source_errors", "Exceptions caught while scraping, by class.", [
+            ({"source": name, "error": cls}, n)
+            for name, stats in data["sources"].items()
+            for cls, n in stats["errors"].items()
+        ])
+        gauge("stage_seconds", "Time spent in each pipeline stage.", [
+            ({"stage": name}, secs) for name, secs in data["stages"].items()
+        ])
+        gauge("browser_seconds", "Browser launch and page times.", [
+            ({"step": name}, secs) for name, secs in data["browser"].items()
+        ])
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory: Path):
+        directory.mkdir(exist_ok=True)
+        (directory / "metrics.json").write_text(json.dumps(self.to_dict(), indent=2))
+        (directory / "metrics.prom").write_text(self.to_prometheus())
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,263 @@
+"""Streaming pipeline — sources feed sinks while they are still being scraped.
+
+Every source runs in its own thread and yields events as it parses them.
+The keep predicate runs right there, so rejected events never leave the
+thread. Kept events go through one bounded queue to the main thread,
+which hands them to the tap sinks straight away (in arrival order) and
+keeps a per-source buffer. Once every source has finished and the taps
+have caught up, each buffer is sorted on its own and they are k-way
+merged by date, deduplicated and passed to the ordered sinks.
+
+Sources don't yield in date order, so nothing can be merged before they
+finish: every kept event is held in memory until the end of the scrape.
+Only the filtering runs in bounded state.
+
+The run can have a deadline and each source a time budget. A source
+still going when either runs out is abandoned: it is told to stop, the
+events it had already delivered are kept, and the run carries on without
+waiting for its thread. A settle hook sees each source's final events
+before the merge and may replace them, e.g. with a fallback for a
+source that failed.
+"""
+
+import heapq
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from queue import Empty, Full, Queue
+from typing import Callable, Iterator, Optional
+
+logger = logging.getLogger("pipeline")
+
+# Sentinel put on the queue by a source thread when it is done
+_DONE = object()
+
+
+@dataclass
+class Source:
+    name: str
+    events: Callable[[], Iterator]  # called once, in the source's thread
+    scraper: object = None  # for per-source metrics and deadlines, if there is one
+    budget: Optional[float] = None  # seconds the source may run for
+
+
+def sort_key(e):
+    return (e.start_date or date.max, e.time or "")
+
+
+class _Progress:
+    """One source's state, shared between its thread and the main loop."""
+
+    def __init__(self):
+        self.yielded = 0
+        self.cancelled = threading.Event()
+        self._finished = False
+        self._lock = threading.Lock()
+
+    def finish(self) -> bool:
+        """True for whichever of the thread and the main loop gets here first."""
+        with self._lock:
+            first, self._finished = not self._finished, True
+            return first
+
+
+def _put(out: Queue, item, progress: _Progress):
+    # Give up on a full queue once cancelled, so an abandoned thread can't block forever
+    while not progress.cancelled.is_set():
+        try:
+            out.put(item, timeout=0.5)
+            return
+        except Full:
+            continue
+
+
+def _produce(index: int, source: Source, keep, out: Queue, on_done, progress: _Progress, started: float):
+    events = None
+    try:
+        events = source.events()
+        for e in events:
+            if progress.cancelled.is_set():
+                break
+            progress.yielded += 1
+            if keep(e):
+                _put(out, (index, e), progress)
+    except Exception as e:
+        logger.error(f"{source.name} failed: {e}")
+    finally:
+        # Let the source's own cleanup (saving state, closing pages) run
+        if hasattr(events, "close"):
+            events.close()
+        if on_done and progress.finish():
+            on_done(source, progress.yielded, time.monotonic() - started, False)
+        _put(out, (index, _DONE), progress)
+
+
+def run(sources: list[Source], keep, sinks=(), taps=(), on_done=None, queue_size: int = 1024,
+        deadline: Optional[float] = None, settle=None) -> int:
+    """Scrape all sources concurrently into sinks. Returns the number of events emitted.
+
+    taps see every kept event as soon as it arrives, before dedup and in no
+    particular order, and are closed once scraping ends; sinks see the
+    merged, deduplicated, date-ordered stream.
+    deadline caps the whole scrape in seconds, on top of each source's budget.
+    on_done(source, events_yielded, seconds, timed_out) is called once per
+    source, from its thread, or from the main thread if it was abandoned.
+    settle(source, events, timed_out) returns the events to merge for a
+    source, once the taps are done with them.
+    """
+    queue: Queue = Queue(maxsize=queue_size)
+    started = time.monotonic()
+    progress = [_Progress() for _ in sources]
+    expires = []
+    for s in sources:
+        limits = [started + t for t in (deadline, s.budget) if t is not None]
+        expires.append(min(limits) if limits else None)
+        # Scrapers cut their own requests short rather than run past this
+        if s.scraper is not None and limits:
+            s.scraper.deadline = min(limits)
+    # Taps with background work (enrichment) give it up at the run's deadline too
+    for tap in taps:
+        if deadline is not None and hasattr(tap, "deadline"):
+            tap.deadline = started + deadline
+
+    threads = [
+        threading.Thread(target=_produce, args=(i, s, keep, queue, on_done, progress[i], started),
+                         name=s.name, daemon=True)
+        for i, s in enumerate(sources)
+    ]
+    for t in threads:
+        t.start()
+
+    buffers: list[list] = [[] for _ in sources]
+    timed_out = [False] * len(sources)
+    live = set(range(len(sources)))
+    while live:
+        now = time.monotonic()
+        expired = [i for i in live if expires[i] is not None and expires[i] <= now]
+        for i in expired:
+            live.discard(i)
+            timed_out[i] = True
+            _abandon(sources[i], progress[i], len(buffers[i]), now - started, on_done)
+        if expired:
+            continue
+        pending = [expires[i] for i in live if expires[i] is not None]
+        try:
+            index, e = queue.get(timeout=max(0.0, min(pending) - now) if pending else None)
+        except Empty:
+            continue
+        # Anything an abandoned source sends after it was given up on is dropped
+        if index not in live:
+            continue
+        if e is _DONE:
+            live.discard(index)
+            continue
+        buffers[index].append(e)
+        for tap in taps:
+            tap.add(e)
+
+    # Taps may still be filling in events (enrichment), so let them finish
+    # before anything is sorted or written
+    for tap in taps:
+        tap.close()
+    if settle:
+        buffers = [settle(s, b, t) for s, b, t in zip(sources, buffers, timed_out)]
+
+    count = 0
+    for e in merge(buffers):
+        count += 1
+        for sink in sinks:
+            sink.add(e)
+    for sink in sinks:
+        sink.close()
+    return count
+
+
+def merge(buffers: list[list]) -> Iterator:
+    """K-way merge the sources' events by (date, time), dropping repeats of (title, date).
+
+    Where two sources have the same event, the earlier source's copy wins
+    (within a source, the one it yielded first), whatever their times, as
+    in filter_events. Each date's events are held until the date is
+    complete, to find its winners.
+    """
+    runs = []
+    for s, buffer in enumerate(buffers):
+        # (key, source, position) is unique, so the tuples sort without comparing events
+        runs.append(sorted((sort_key(e), s, i, e) for i, e in enumerate(buffer)))
+    day = []
+    for t in heapq.merge(*runs):
+        if day and t[3].start_date != day[0][3].start_date:
+            yield from _first_of_day(day)
+            day = []
+        day.append(t)
+    yield from _first_of_day(day)
+
+
+def _first_of_day(day: list) -> Iterator:
+    """One date's (key, source, position, event) in order, keeping the first-yielded copy of each title."""
+    winner = {}
+    for _, s, i, e in day:
+        key = e.title.lower().strip()
+        winner[key] = min(winner.get(key, (s, i)), (s, i))
+    for _, s, i, e in day:
+        if winner[e.title.lower().strip()] == (s, i):
+            yield e
+
+
+def _abandon(source: Source, progress: _Progress, kept: int, seconds: float, on_done):
+    progress.cancelled.set()
+    logger.warning(f"{source.name} ran out of time after {seconds:.1f}s, keeping {kept} events")
+    if on_done and progress.finish():
+        on_done(source, progress.yielded, seconds, True)
+
+
+class ListSink:
+    """Collects events for consumers that need the whole list, like the page template."""
+
+    def __init__(self):
+        self.events = []
+
+    def add(self, e):
+        self.events.append(e)
+
+    def close(self):
+        pass
+
+
+class JsonLinesSink:
+    """Writes one JSON object per line as events arrive."""
+
+    def __init__(self, path: Path, to_record):
+        path.parent.mkdir(exist_ok=True)
+        self.to_record = to_record
+        self._tmp = path.with_suffix(path.suffix + ".tmp")
+        self._path = path
+        self._f = self._tmp.open("w")
+
+    def add(self, e):
+        self._f.write(json.dumps(self.to_record(e)) + "\n")
+
+    def close(self):
+        self._f.close()
+        self._tmp.replace(self._path)
+
+
+class JsonArraySink(JsonLinesSink):
+    """Writes a JSON array incrementally, formatted like json.dumps(records, indent=2)."""
+
+    def __init__(self, path: Path, to_record):
+        super().__init__(path, to_record)
+        self._first = True
+
+    def add(self, e):
+        body = json.dumps(self.to_record(e), indent=2).replace("\n", "\n  ")
+        self._f.write(("[\n  " if self._first else ",\n  ") + body)
+        self._first = False
+
+    def close(self):
+        self._f.write("[]" if self._first else "\n]")
+        super().close()
@@ -0,0 +1,120 @@
+"""Revisit policy — spend the daemon's request budget where listings actually change.
+
+Each visit to a source records whether its events differed from the last
+visit and how long it had been. Treating changes as a Poisson process,
+the change rate is estimated from the share of visits that saw a change
+(with the usual small-sample correction, so a source that changed on
+every visit doesn't come out infinite). Visit frequencies are then set
+in proportion to sqrt(rate / cost), which maximises average freshness for
+a fixed number of requests per day without chasing the fastest source,
+and clamped to per-source bounds. No source is visited more than a
+couple of times per expected change, so budget a stable venue can't use
+is left unspent rather than spent re-reading it. Counts decay, so a venue that starts
+changing more often is noticed within a few weeks.
+"""
+
+import json
+import logging
+import math
+from pathlib import Path
+
+logger = logging.getLogger("revisit")
+
+# Requests per day the daemon may spend across all sources (about what
+# hourly Eventbrite searches plus daily venue visits used to cost)
+DAILY_REQUESTS = 200
+
+# Most visits worth making per expected change
+VISITS_PER_CHANGE = 2
+
+# Weight kept by past observations at each new visit
+DECAY = 0.95
+
+# Default bounds on the gap between visits, in seconds
+MIN_INTERVAL = 30 * 60
+MAX_INTERVAL = 7 * 24 * 60 * 60
+
+DAY = 24 * 60 * 60
+
+
+class RevisitPolicy:
+    """Per-source change statistics and the intervals they imply.
+
+    prior maps a source to the interval to assume before there's any
+    history (as if it changed about that often); bounds maps a source to
+    its (min, max) interval.
+    """
+
+    def __init__(self, path: Path, daily_requests: float = DAILY_REQUESTS,
+                 prior: dict[str, float] | None = None, default_prior: float = DAY,
+                 bounds: dict[str, tuple[float, float]] | None = None):
+        self.path = path
+        self.daily_requests = daily_requests
+        self.prior = prior or {}
+        self.default_prior = default_prior
+        self.bounds = bounds or {}
+        self.sources: dict[str, dict] = {}  # name -> {"visits", "changes", "seconds", "cost"}
+        if path.exists():
+            try:
+                self.sources = json.loads(path.read_text())
+            except (json.JSONDecodeError, OSError) as e:
+                logger.warning(f"Ignoring unreadable revisit stats {path}: {e}")
+
+    def record(self, name: str, changed: bool | None, elapsed: float | None, requests: int):
+        """One visit: whether the events changed since the previous one, and how long ago that was.
+
+        changed and elapsed are None for a first visit, which only tells us
+        what a visit costs.
+        """
+        s = self.sources.setdefault(name, {"visits": 0.0, "changes": 0.0, "seconds": 0.0, "cost": float(requests)})
+        s["cost"] = DECAY * s["cost"] + (1 - DECAY) * requests
+        if changed is None or elapsed is None:
+            return
+        s["visits"] = DECAY * s["visits"] + 1
+        s["changes"] = DECAY * s["changes"] + (1 if changed else 0)
+        s["seconds"] = DECAY * s["seconds"] + elapsed
+
+    def rate(self, name: str) -> float:
+        """Estimated changes per second."""
+        # One pseudo-visit, half of it a change, timed so the estimate starts at 1 / prior
+        s = self.sources.get(name, {})
+        prior = self.prior.get(name, self.default_prior)
+        visits = s.get("visits", 0.0) + 1
+        changes = s.get("changes", 0.0) + 0.5
+        seconds = s.get("seconds", 0.0) + prior * math.log(1.5)
+        # Cho & Garcia-Molina's estimator for changes seen only at visit times
+        return -math.log((visits - changes + 0.5) / (visits + 0.5)) / (seconds / visits)
+
+    def intervals(self, names: list[str]) -> dict[str, float]:
+        """Seconds between visits for each source, spending daily_requests between them."""
+        weight = {n: math.sqrt(self.rate(n) / self._cost(n)) for n in names}
+        budget = self.daily_requests / DAY  # requests per second
+        free = set(names)
+        freq: dict[str, float] = {}
+        # Scale the unclamped sources to fit the budget; any that fall outside
+        # their bounds are pinned there and the rest rescaled
+        while free:
+            spare = budget - sum(self._cost(n) * freq[n] for n in freq)
+            scale = max(spare, 0.0) / sum(self._cost(n) * weight[n] for n in free)
+            pinned = {}
+            for n in free:
+                lo, hi = self.bounds.get(n, (MIN_INTERVAL, MAX_INTERVAL))
+                f = scale * weight[n]
+                most = min(1 / lo, VISITS_PER_CHANGE * self.rate(n))
+                if f > most:
+                    pinned[n] = max(most, 1 / hi)
+                elif f < 1 / hi:
+                    pinned[n] = 1 / hi
+            if not pinned:
+                freq.update({n: scale * weight[n] for n in free})
+                break
+            freq.update(pinned)
+            free -= pinned.keys()
+        return {n: 1 / freq[n] for n in names}
+
+    def _cost(self, name: str) -> float:
+        return max(self.sources.get(name, {}).get("cost", 1.0), 1.0)
+
+    def save(self):
+        self.path.parent.mkdir(exist_ok=True)
+        self.path.write_text(json.dumps(self.sources, indent=2, sort_keys=True))
@@ -1,32 +1,101 @@
 #!/usr/bin/env python3
-"""London Culture — weekly digest of creative social events worth going to."""
+"""London Culture — weekly digest of creative social events worth going to.
+
+Runs London unless told otherwise: `--city manchester` picks another
+profile from cities.py, and `--cities london,manchester` (or `all`)
+runs several at once, one process each.
+"""
 
 import json
 import logging
+import multiprocessing
 import os
+import signal
 import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
 from datetime import date, datetime
 from pathlib import Path
+from queue import Queue
+from types import SimpleNamespace
 
+import numpy as np
 from jinja2 import Environment, FileSystemLoader
 
+import api
+import cities
+import search
+from daemon import Daemon
+from delivery import Outbox, deliver, idempotency_key, load_subscribers, make_transport
+from delta import SentLog
+from revisit import RevisitPolicy
+from enrich import EnrichCache, Enricher
+from digest import EventIndex, render_digests, select_events
+from feeds import FeedWriter
+from ledger import append_run, check_regressions, ledger_entry, read_ledger
+from metrics import Metrics
+from snapshots import SnapshotStore
+import pipeline
+
 from scrapers import (
-    RichMixScraper,
     EventbriteScraper,
-    BarbicanScraper,
-    DesignMuseumScraper,
-    ICAScraper,
-    WellcomeScraper,
-    PhotographersGalleryScraper,
-    SomersetHouseScraper,
-    LRBBookshopScraper,
-    VAMScraper,
+    EventBatch,
+    EventFilter,
 )
+from scrapers.base import SourceStats
+from scrapers.eventbrite import REQUEST_BUDGET
+from scrapers.limiter import HostLimiter
+from scrapers.planner import QueryPlanner
 
 ROOT = Path(__file__).parent
 OUTPUT = ROOT / "output"
 DATA = ROOT / "data"
 TEMPLATES = ROOT / "templates"
+METRICS = ROOT / "metrics"
+LEDGER = DATA / "runs.jsonl"
+
+# The city this process is running; use_city() switches it and the paths above
+CITY = cities.LONDON
+# Other cities in the same multi-city run, for links between their pages
+SIBLINGS: list = []
+
+# Caches every city shares, and the combined index of a multi-city run
+ENRICH_CACHE = ROOT / "data" / "enrich_cache.json"
+CITY_INDEX = ROOT / "output" / "cities.json"
+
+# Cities run at once by --cities; each is mostly waiting on the network
+CITY_WORKERS = 8
+
+# Set in each process of a multi-city run so its cities pace shared hosts together
+shared_limiter = None
+shared_cache_lock = None
+
+# Timings for the current run, written out at the end of main()
+metrics = Metrics()
+
+# Parse processes --parse-pool starts at most. A run parses a dozen or so pages,
+# and each worker spawns and re-imports bs4 and the scrapers first
+PARSE_WORKERS = 2
+
+# Seconds the whole scrape may take, and each source unless listed
+RUN_DEADLINE = 180
+SOURCE_BUDGET = 60
+SOURCE_BUDGETS = {
+    "Eventbrite": 90,  # a request budget's worth of searches, each after a politeness pause
+    "browser": 60,
+}
+
+# Seconds between refreshes of each source in daemon mode, unless listed
+REFRESH_INTERVAL = 24 * 60 * 60
+REFRESH_INTERVALS = {
+    "Eventbrite": 60 * 60,
+}
+# Intervals then follow each source's observed change rate, within these bounds
+REFRESH_BOUNDS = {
+    "Eventbrite": (30 * 60, 24 * 60 * 60),
+}
 
 # Categories to exclude globally
 EXCLUDE_CATEGORIES = {
@@ -35,92 +104,193 @@ EXCLUDE_CATEGORIES = {
     "performing & visual arts",
 }
 
+# Title keywords for music/cinema, and for kids/family/schools events
+MUSIC_TITLE_WORDS = ["concert", "gig:", "dj set", "live band"]
+KIDS_TITLE_WORDS = [
+    "family workshop", "design baby", "kids", "children",
+    "toddler", "baby", "under 5", "school of", "schools live",
+    "play after school", "sound explorers", "mini jam",
+    "teacher drop-in", "ks1", "ks2", "eyfs",
+]
+EXCLUDE_TITLE_WORDS = MUSIC_TITLE_WORDS + KIDS_TITLE_WORDS + ["(livestream)"]
+
+
+def use_city(city, siblings=()):
+    """Point this process's paths, sources and page at another city's profile."""
+    global CITY, SIBLINGS, OUTPUT, DATA, METRICS, LEDGER
+    CITY = city
+    SIBLINGS = [c for c in siblings if c is not city]
+    OUTPUT, DATA, METRICS = city.output, city.data, city.metrics
+    LEDGER = DATA / "runs.jsonl"
+    for directory in (OUTPUT, DATA, METRICS):
+        directory.mkdir(parents=True, exist_ok=True)
+
+
+def make_filter(today=None):
+    """The global keep rules as a predicate scrapers can apply while parsing."""
+    return EventFilter(
+        today=today or date.today(),
+        exclude_category=_excluded_category,
+        title_words=tuple(EXCLUDE_TITLE_WORDS),
+    )
+
+
+def default_scrapers(event_filter=None, parser_pool=None):
+    """The requests-based scrapers, one per source.
 
-def scrape_simple():
-    """Run the requests-based scrapers."""
+    event_filter lets them skip rejected cards while parsing; parser_pool
+    moves their HTML parsing into worker processes.
+    """
     scrapers = [
-        RichMixScraper(),
-        EventbriteScraper(),
-        BarbicanScraper(),
-        DesignMuseumScraper(),
-        WellcomeScraper(),
-        PhotographersGalleryScraper(),
-        SomersetHouseScraper(),
-        LRBBookshopScraper(),
-        VAMScraper(),
+        EventbriteScraper(
+            QueryPlanner(DATA / "eventbrite_queries.json", REQUEST_BUDGET),
+            CITY.eventbrite_place, list(CITY.searches), CITY.gazetteer,
+        ) if cls is EventbriteScraper else cls()
+        for cls in CITY.sources
     ]
-    all_events = []
     for s in scrapers:
-        events = s.scrape()
-        logging.info(f"{s.name}: {len(events)} events")
-        all_events.extend(events)
-    return all_events
-
-
-def scrape_browser():
-    """Run Playwright-based scrapers."""
-    browser_scrapers = [ICAScraper()]
-    all_events = []
+        if event_filter:
+            s.event_filter = event_filter
+        s.parser_pool = parser_pool
+        s.limiter = shared_limiter
+    return scrapers
+
+
+def browser_events(event_filter=None, budget=None):
+    """Yield events from the Playwright-based scrapers as they are parsed.
+
+    With a budget, the scrapers share that many seconds from now.
+    """
+    browser_scrapers = [cls() for cls in CITY.browser_sources]
+    deadline = time.monotonic() + budget if budget else None
+    for s in browser_scrapers:
+        if event_filter:
+            s.event_filter = event_filter
+        s.deadline = deadline
     try:
         from playwright.sync_api import sync_playwright
         with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
+            with metrics.timer(metrics.browser, "launch"):
+                browser = p.chromium.launch(headless=True)
+                page = browser.new_page()
             for s in browser_scrapers:
-                events = s.scrape(page=page)
-                logging.info(f"{s.name}: {len(events)} events")
-                all_events.extend(events)
+                started = time.perf_counter()
+                count = 0
+                for e in s.iter_events(page=page):
+                    count += 1
+                    yield e
+                duration = time.perf_counter() - started
+                metrics.browser[f"page:{s.name}"] = duration
+                metrics.record_source(s, count, duration)
+                logging.info(f"{s.name}: {count} events")
             browser.close()
     except ImportError:
         logging.warning("Playwright not installed — skipping ICA")
     except Exception as e:
         logging.error(f"Browser scraping failed: {e}")
-    return all_events
+
+
+class WarmBrowser:
+    """A Playwright browser kept open across scrapes, for daemon mode.
+
+    Playwright's sync API only works from the thread that started it, so
+    the browser lives in a thread of its own; scrapes are queued to it and
+    their events handed back as they are parsed.
+    """
+
+    _END = object()
+
+    def __init__(self):
+        self.jobs: Queue = Queue()
+        self.thread = threading.Thread(target=self._run, name="browser", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        try:
+            from playwright.sync_api import sync_playwright
+            with sync_playwright() as p:
+                browser = p.chromium.launch(headless=True)
+                page = browser.new_page()
+                self._serve(lambda s: s.iter_events(page=page))
+                browser.close()
+        except ImportError:
+            logging.warning("Playwright not installed — skipping ICA")
+            self._serve(lambda s: iter(()))
+        except Exception as e:
+            logging.error(f"Browser failed: {e}")
+            self._serve(lambda s: iter(()))
+
+    def _serve(self, scrape):
+        while (job := self.jobs.get()) is not None:
+            scraper, out = job
+            try:
+                for e in scrape(scraper):
+                    out.put(e)
+            finally:
+                out.put(self._END)
+
+    def events(self, scraper):
+        out: Queue = Queue()
+        self.jobs.put((scraper, out))
+        while (e := out.get()) is not self._END:
+            yield e
+
+    def close(self):
+        self.jobs.put(None)
+
+
+def sources(event_filter=None, parser_pool=None):
+    """Pipeline sources: one per requests-based scraper, plus the browser."""
+    scrapers = default_scrapers(event_filter, parser_pool)
+    browser_budget = SOURCE_BUDGETS.get("browser", SOURCE_BUDGET)
+    srcs = [
+        pipeline.Source(s.name, s.iter_events, s, SOURCE_BUDGETS.get(s.name, SOURCE_BUDGET))
+        for s in scrapers
+    ]
+    if CITY.browser_sources:
+        srcs.append(
+            pipeline.Source("browser", lambda: browser_events(event_filter, browser_budget), budget=browser_budget)
+        )
+    return srcs
+
+
+def _source_done(source, count, duration, timed_out):
+    # The browser source records its own scrapers' metrics
+    if source.scraper is not None:
+        metrics.record_source(source.scraper, count, duration, timed_out)
+        logging.info(f"{source.name}: {count} events" + (" (timed out)" if timed_out else ""))
 
 
 def filter_events(events):
-    """Remove music/cinema/performance, deduplicate, sort by date."""
-    today = date.today()
+    """Remove music/cinema/performance, deduplicate, sort by date.
 
-    # Filter out excluded categories
-    filtered = []
-    for e in events:
-        # Skip past events
-        if e.start_date and e.start_date < today:
-            continue
+    The whole-list version of what pipeline.merge() does for a run, kept
+    for the benchmarks and as the reference the merge is tested against.
+    """
+    today = date.today()
+    batch = EventBatch(events)
 
-        cat = e.category.lower().strip()
-        # Check each comma-separated sub-category
-        if any(part.strip() in EXCLUDE_CATEGORIES for part in cat.split(",")):
-            continue
-        # Also check title for music/cinema keywords
-        title_lower = e.title.lower()
-        if any(w in title_lower for w in ["concert", "gig:", "dj set", "live band"]):
-            continue
-        # Skip kids/family/schools events
-        if any(w in title_lower for w in [
-            "family workshop", "design baby", "kids", "children",
-            "toddler", "baby", "under 5", "school of", "schools live",
-            "play after school", "sound explorers", "mini jam",
-            "teacher drop-in", "ks1", "ks2", "eyfs",
-        ]):
-            continue
-        # Skip livestream duplicates
-        if "(livestream)" in title_lower:
-            continue
-        filtered.append(e)
+    # Filter out past events, excluded categories and unwanted titles
+    with metrics.stage("filter"):
+        dropped = (
+            batch.before(today)
+            | batch.category_in(_excluded_category)
+            | batch.title_contains(EXCLUDE_TITLE_WORDS)
+        )
+        idx = np.flatnonzero(~dropped)
 
     # Deduplicate by title+date
-    seen = set()
-    unique = []
-    for e in filtered:
-        key = (e.title.lower().strip(), e.start_date)
-        if key not in seen:
-            seen.add(key)
-            unique.append(e)
+    with metrics.stage("dedup"):
+        idx = batch.first_unique(idx)
 
     # Sort by date
-    return sorted(unique, key=lambda e: (e.start_date or date.max, e.time or ""))
+    with metrics.stage("sort"):
+        return batch.take(batch.sorted(idx))
+
+
+def _excluded_category(category):
+    """True if any comma-separated part of a category is excluded."""
+    return any(part.strip() in EXCLUDE_CATEGORIES for part in category.lower().strip().split(","))
 
 
 def normalize_category(cat: str) -> str:
@@ -139,115 +309,604 @@ def normalize_category(cat: str) -> str:
     return "Other"
 
 
-CORE_VENUES = {
-    "Barbican", "Design Museum", "Rich Mix", "ICA",
-    "Wellcome Collection", "Photographers' Gallery", "Somerset House",
-    "London Review Bookshop", "V&A",
-}
+REGION_ORDER = ["Central", "East", "North", "South", "West", "Outer"]
 
 
-def build_html(events):
+def build_html(events, warnings=()):
     """Generate static HTML page with JS filtering."""
     OUTPUT.mkdir(exist_ok=True)
 
-    # Add normalized category and source to each event for filtering
+    # Fill in normalized category, source and region for filtering
     for e in events:
-        e._filter_cat = normalize_category(e.category)
-        e._source = e.venue if e.venue in CORE_VENUES else "Eventbrite"
+        e.filter_cat = normalize_category(e.category)
+        e.source = e.venue if e.venue in CITY.core_venues else "Eventbrite"
+        e.region = CITY.gazetteer.region_of(e.area)
 
     # Source filter: only core venues + Eventbrite
-    venue_order = [
-        "Barbican", "Design Museum", "ICA", "Rich Mix",
-        "Wellcome Collection", "Photographers' Gallery", "Somerset House",
-        "London Review Bookshop", "V&A", "Eventbrite",
-    ]
-    sources = [v for v in venue_order if any(e._source == v for e in events)]
+    sources = [v for v in CITY.venue_order if any(e.source == v for e in events)]
+    regions = [r for r in REGION_ORDER if any(e.region == r for e in events)]
 
     categories = ["All", "Talks", "Workshops", "Openings", "Social", "Art & Design", "Other"]
 
+    # Positions in the index are positions on the page, so build it from the same list
+    index = search.build_index(events)
+    version = search.write_index(index, OUTPUT / "search")
+    shards = sorted(index)
+    del index  # the page only needs the shard names; don't hold the postings while rendering
+    calendars = FeedWriter(OUTPUT / "calendar", DATA / "feeds.json").write_all(events)
+
     env = Environment(loader=FileSystemLoader(str(TEMPLATES)))
     template = env.get_template("page.html")
     html = template.render(
         events=events,
         sources=sources,
+        regions=regions,
         categories=categories,
+        warnings=warnings,
+        search={"shards": shards, "version": version, "stopwords": sorted(search.STOPWORDS)},
+        calendars=calendars,
+        title=f"{CITY.name} Culture",
+        cities=[(c.name, _page_url(c) or os.path.relpath(c.output, OUTPUT) + "/") for c in SIBLINGS],
         updated_at=datetime.now().strftime("%-d %B %Y"),
     )
     (OUTPUT / "index.html").write_text(html)
     logging.info(f"Built {OUTPUT / 'index.html'}")
 
 
-def build_email(events):
-    """Generate email HTML."""
+def build_emails(events, selections):
+    """Render a personalised digest for each selection. Returns {email: html}."""
     env = Environment(loader=FileSystemLoader(str(TEMPLATES)))
-    template = env.get_template("email.html")
-    html = template.render(
-        events=events[:40],  # Cap email at 40 events
+    return render_digests(
+        env,
+        events,
+        selections,
         week_of=date.today().strftime("%-d %B %Y"),
-        page_url=os.environ.get("PAGE_URL", ""),
+        page_url=_page_url(),
+        title=f"{CITY.name} Culture",
     )
-    return html
 
 
-def send_email(html):
-    """Send the digest email via Resend."""
-    api_key = os.environ.get("RESEND_API_KEY")
-    to_email = os.environ.get("DIGEST_EMAIL")
-    if not api_key or not to_email:
-        logging.warning("RESEND_API_KEY or DIGEST_EMAIL not set — skipping email")
+def _page_url(city=None):
+    """PAGE_URL, pointed at a city's page (this run's by default) when it isn't London's."""
+    city = city or CITY
+    base = os.environ.get("PAGE_URL", "")
+    return f"{base.rstrip('/')}/{city.path}/" if base and city.path else base
+
+
+def send_email(events, delta=False):
+    """Queue the digest for every subscriber and deliver it through the outbox.
+
+    In delta mode each recipient only gets events that are new, changed or
+    about to start since their last digest.
+    """
+    # Only one city may fall back to DIGEST_EMAIL, or that inbox would get every city's digest
+    subscribers = load_subscribers(DATA / "subscribers.json", env_fallback=CITY.digest_email_fallback)
+    transport = make_transport(DATA / "mail")
+    if not subscribers or transport is None:
+        logging.warning("No subscribers or RESEND_API_KEY not set — skipping email")
         return
 
-    import resend
-    resend.api_key = api_key
-    resend.Emails.send({
-        "from": os.environ.get("FROM_EMAIL", "London Culture <onboarding@resend.dev>"),
-        "to": [to_email],
-        "subject": f"London Culture — Week of {date.today().strftime('%-d %b %Y')}",
-        "html": html,
-    })
-    logging.info(f"Email sent to {to_email}")
+    index = EventIndex(
+        events,
+        category_of=lambda e: normalize_category(e.category),
+        source_of=lambda e: e.venue if e.venue in CITY.core_venues else "Eventbrite",
+        region_of=CITY.gazetteer.region_of,
+    )
+    sent_log = SentLog(DATA / "sent.json") if delta else None
+    fps = sent_log.fingerprint(events) if delta else None
+    selections = select_events(index, subscribers, sent_log, fps)
+    emails = build_emails(events, selections)
+
+    # Re-running in the same week resumes the send rather than repeating it
+    outbox = Outbox(DATA / "outbox")
+    year, week, _ = date.today().isocalendar()
+    digest_id = f"{year}-W{week:02d}"
+    subject = f"{CITY.name} Culture — Week of {date.today().strftime('%-d %b %Y')}"
+    queued = outbox.enqueue(digest_id, [(to, subject, html) for to, html in emails.items()])
+    outbox.retry_failed()
+    sent, failed = deliver(outbox, transport)
+    logging.info(f"Email: {queued} queued, {sent} sent, {failed} failed")
+
+    if sent_log:
+        for to, picks in selections.items():
+            msg = outbox.messages.get(idempotency_key(digest_id, to))
+            if msg and msg.status == "sent":
+                sent_log.record(to, picks, fps)
+        sent_log.save()
+
+
+def event_record(e):
+    """JSON-ready dict for one event, as stored in data/events.json."""
+    return {
+        "title": e.title,
+        "venue": e.venue,
+        "url": e.url,
+        "start_date": e.start_date.isoformat() if e.start_date else None,
+        "end_date": e.end_date.isoformat() if e.end_date else None,
+        "time": e.time,
+        "description": e.description,
+        "category": e.category,
+        "is_free": e.is_free,
+        "area": e.area,
+        "stale": e.stale,
+    }
 
 
 def save_events(events):
     """Persist events to JSON."""
     DATA.mkdir(exist_ok=True)
-    data = [
-        {
-            "title": e.title,
-            "venue": e.venue,
-            "url": e.url,
-            "start_date": e.start_date.isoformat() if e.start_date else None,
-            "end_date": e.end_date.isoformat() if e.end_date else None,
-            "time": e.time,
-            "description": e.description,
-            "category": e.category,
-            "is_free": e.is_free,
-            "area": e.area,
-        }
-        for e in events
-    ]
+    data = [event_record(e) for e in events]
     (DATA / "events.json").write_text(json.dumps(data, indent=2))
 
 
-def main():
+def run_pipeline(srcs=None, enrich=False, deadline=RUN_DEADLINE, snapshots=None, parse_pool=False):
+    """Scrape every source and stream the kept events into data/events.json.
+
+    Scrapers skip rejected cards as they parse them, the same filter runs
+    again as a safety net on whatever they yield. Each source buffers its
+    events as they arrive; once every source has finished (or been
+    abandoned), the buffers are merged by date and deduplicated, and only
+    then is the store written, so the whole run's events are in memory at once. By default each scraper thread parses its
+    own pages, card by card as they download. With parse_pool and several
+    cores, parsing moves to a small process pool instead. With enrich, events missing a description or time
+    have their detail pages fetched in the background as they arrive.
+    Sources still running at their budget or the run's deadline are
+    abandoned with whatever they had yielded by then. A source that fails
+    is topped up from its last good snapshot in data/snapshots/; one that
+    succeeds replaces it.
+
+    Returns the merged events, for the page and emails.
+    """
+    event_filter = make_filter()
+    snapshots = snapshots or SnapshotStore(DATA / "snapshots", event_filter.keep)
+    collected = pipeline.ListSink()
+    taps = [_enricher(EnrichCache(ENRICH_CACHE, lock=shared_cache_lock))] if enrich else []
+    # Callers passing their own sources set up their own parsing, and one
+    # core is better spent parsing in the scraper threads
+    workers = min(PARSE_WORKERS, os.cpu_count() or 1)
+    use_pool = parse_pool and srcs is None and workers > 1
+    pool_context = parser_pool(workers) if use_pool else nullcontext()
+    with metrics.stage("pipeline"), pool_context as pool:
+        pipeline.run(
+            srcs if srcs is not None else sources(event_filter, pool),
+            keep=event_filter.keep,
+            sinks=[pipeline.JsonArraySink(DATA / "events.json", event_record), collected],
+            taps=taps,
+            on_done=_source_done,
+            deadline=deadline,
+            settle=snapshots.settle,
+        )
+    return collected.events
+
+
+def shard_units(srcs, plan):
+    """The units of work a run splits into: each source, except that
+    Eventbrite is split into its (term, page) fetches."""
+    units = [("source", s.name) for s in srcs if not isinstance(s.scraper, EventbriteScraper)]
+    return units + [("eventbrite", term, page) for term, page in plan]
+
+
+def run_shard(index, count, enrich=False):
+    """Scrape shard index (1-based) of count and write its events to data/shards/ for merge.
+
+    Every shard builds the same unit list from the same planner state and
+    takes every count-th unit, so shards never overlap and together
+    cover the run. Shards don't touch snapshots: whether a source failed,
+    and Eventbrite in particular, is judged at merge on the whole of it.
+    """
+    event_filter = make_filter()
+    all_sources = sources(event_filter)
+    eventbrite = next((s.scraper for s in all_sources if isinstance(s.scraper, EventbriteScraper)), None)
+    plan = eventbrite.planner.plan(eventbrite.searches) if eventbrite and eventbrite.planner else []
+    mine = shard_units(all_sources, plan)[index - 1::count]
+    names = {u[1] for u in mine if u[0] == "source"}
+    if eventbrite:
+        # merge records these fetches with the planner, alongside the other shards'
+        eventbrite.plan = [(term, page) for kind, term, page in (u for u in mine if u[0] == "eventbrite")]
+        eventbrite.planner = None
+    srcs = [
+        s for s in all_sources
+        if s.name in names or (eventbrite is not None and s.scraper is eventbrite and eventbrite.plan)
+    ]
+    logging.info(f"Shard {index}/{count}: {len(mine)} units — {', '.join(s.name for s in srcs) or 'nothing'}")
+
+    parts = {}
+    timed_out_sources = set()
+    arm_of = {}  # id(event) -> index of its Eventbrite fetch in the full plan, for merge to order by
+    if eventbrite:
+        index_of = {arm: k for k, arm in enumerate(plan)}
+        source = next(s for s in srcs if s.scraper is eventbrite) if eventbrite.plan else None
+
+        def tagged():
+            for e in eventbrite.iter_events():
+                arm_of[id(e)] = index_of[eventbrite.fetching]
+                yield e
+
+        if source:
+            source.events = tagged
+
+    def settle(source, events, timed_out):
+        parts[source.name] = events
+        if timed_out:
+            timed_out_sources.add(source.name)
+        return events
+
+    taps = [_enricher(EnrichCache(ENRICH_CACHE))] if enrich else []
+    with metrics.stage("pipeline"):
+        pipeline.run(srcs, keep=event_filter.keep, taps=taps, on_done=_source_done, deadline=RUN_DEADLINE,
+                     settle=settle)
+
+    partial = {
+        "run": _run_id(),
+        "city": CITY.slug,
+        "shard": index,
+        "of": count,
+        "sources": [
+            {"name": s.name, "timed_out": s.name in timed_out_sources,
+             "errors": s.scraper.stats.errors if s.scraper is not None else {},
+             "events": [event_record(e) for e in parts.get(s.name, [])],
+             "arms": [arm_of[id(e)] for e in parts.get(s.name, [])]
+             if eventbrite is not None and s.scraper is eventbrite else None}
+            for s in srcs
+        ],
+        # (term, page, events it added, its place in the plan)
+        "eventbrite": [[term, page, added, index_of[(term, page)]] for (term, page), added in eventbrite.yields.items()]
+        if eventbrite else [],
+        "metrics": metrics.to_dict(),
+    }
+    path = DATA / "shards" / f"{index}-of-{count}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(partial, separators=(",", ":")))
+    tmp.replace(path)
+    logging.info(f"Wrote {path} ({sum(len(p) for p in parts.values())} events)")
+
+
+def _run_id():
+    """What ties one run's shards together: the CI run, or else the day."""
+    return os.environ.get("GITHUB_RUN_ID") or date.today().isoformat()
+
+
+def merge_shards(email=False, delta=False):
+    """Combine the latest run's shard partials into the store, page and emails.
+
+    Events from every shard are filtered again (the day may have turned),
+    merged in source order, deduplicated and sorted exactly as a single
+    run would. Each source is settled against its snapshot here, once,
+    on everything the shards found for it, and Eventbrite query stats are
+    saved. A source whose shard is missing is served from its snapshot.
+    Returns source regressions.
+    """
+    directory = DATA / "shards"
+    files = sorted(directory.glob("*.json"), key=lambda p: p.stat().st_mtime) if directory.exists() else []
+    if not files:
+        sys.exit(f"No shard partials in {directory}; run scrape.py --shard i/N first")
+    partials = [json.loads(p.read_text()) for p in files]
+    latest = partials[-1]
+    partials = sorted(
+        (p for p in partials if (p["run"], p["city"], p["of"]) == (latest["run"], latest["city"], latest["of"])),
+        key=lambda p: p["shard"],
+    )
+    missing = sorted(set(range(1, latest["of"] + 1)) - {p["shard"] for p in partials})
+    warnings = [f"Shard {i}/{latest['of']} missing" for i in missing]
+    for w in warnings:
+        logging.warning(w)
+
+    event_filter = make_filter()
+    snapshots = SnapshotStore(DATA / "snapshots", event_filter.keep)
+    planner = QueryPlanner(DATA / "eventbrite_queries.json", REQUEST_BUDGET)
+    combined: dict[str, list] = {}
+    arms: dict[str, list] = {}
+    errors: dict[str, dict] = {}
+    timed_out = set()
+    for p in partials:
+        for part in p["sources"]:
+            name = part["name"]
+            combined.setdefault(name, []).extend(api.from_record(r) for r in part["events"])
+            if part["arms"] is not None:
+                arms.setdefault(name, []).extend(part["arms"])
+            for cls, n in part["errors"].items():
+                errors.setdefault(name, {})[cls] = errors.get(name, {}).get(cls, 0) + n
+            if part["timed_out"]:
+                timed_out.add(name)
+        metrics.absorb(p["metrics"])
+
+    # A split source's events back in the order one run would have fetched them, so ties
+    # on the date sort and duplicates between its searches resolve the same way
+    repeats: dict[int, int] = {}
+    for name, positions in arms.items():
+        ranked = sorted(zip(positions, range(len(positions))))
+        combined[name] = [combined[name][k] for _, k in ranked]
+        # Each shard only knew its own searches' events, so one found by searches in
+        # two shards was counted as new by both; only the earlier search really added it
+        first = {}
+        for e, (arm, _) in zip(combined[name], ranked):
+            if first.setdefault(e.url, arm) != arm:
+                repeats[arm] = repeats.get(arm, 0) + 1
+    for p in partials:
+        for term, page, added, arm in p["eventbrite"]:
+            planner.record(term, page, added - repeats.get(arm, 0))
+    if any(p["eventbrite"] for p in partials):
+        planner.save()
+
+    order = [cls.name for cls in CITY.sources] + (["browser"] if CITY.browser_sources else [])
+    for name in order:
+        if name not in combined:
+            snapshots.mark_stale(name)
+            combined[name] = [e for e in snapshots.events(name) if event_filter.keep(e)]
+            continue
+        # Only some of a split source's searches ran if a shard is missing
+        incomplete = bool(missing) and name in arms
+        stand_in = SimpleNamespace(stats=SourceStats(errors=errors.get(name, {})))
+        combined[name] = snapshots.settle(
+            pipeline.Source(name, None, stand_in), combined[name], name in timed_out or incomplete,
+        )
+
+    with metrics.stage("merge"):
+        buffers = [[e for e in combined[name] if event_filter.keep(e)] for name in order if name in combined]
+        sink = pipeline.JsonArraySink(DATA / "events.json", event_record)
+        events = []
+        for e in pipeline.merge(buffers):
+            sink.add(e)
+            events.append(e)
+        sink.close()
+    logging.info(f"Merged {len(partials)} of {latest['of']} shards from run {latest['run']}")
+    return publish(events, snapshots, email=email, delta=delta, warnings=warnings)
+
+
+def _enricher(cache):
+    return Enricher(cache, limiter=shared_limiter)
+
+
+def refresh(name):
+    """Re-scrape one source and rebuild the store and page from it plus every other snapshot.
+
+    For retrying a venue that failed in the main run without scraping
+    everything again. Doesn't touch the run ledger, since it isn't a full run.
+    """
+    event_filter = make_filter()
+    snapshots = SnapshotStore(DATA / "snapshots", event_filter.keep)
+    all_sources = sources(event_filter)
+    live = [s for s in all_sources if s.name.lower() == name.lower()]
+    if not live:
+        sys.exit(f"No source called {name!r}; choose from: {', '.join(s.name for s in all_sources)}")
+    replayed = [snapshots.replay(n) for n in snapshots.names() if n != live[0].name]
+    events = run_pipeline(live + replayed, snapshots=snapshots)
+    logging.info(f"Total: {len(events)} events")
+    build_html(events, warnings=stale_warnings(snapshots))
+
+
+def daemon(enrich=False):
+    """Stay resident, refreshing each source on its interval and republishing on change.
+
+    Scrapers, their sessions, the browser and the caches live as long as
+    the process. Stop with SIGTERM or Ctrl-C.
+    """
+    browser = WarmBrowser()
+    browser_budget = SOURCE_BUDGETS.get("browser", SOURCE_BUDGET)
+    srcs = [
+        pipeline.Source(s.name, s.iter_events, s, SOURCE_BUDGETS.get(s.name, SOURCE_BUDGET))
+        for s in default_scrapers()
+    ]
+    browser_scrapers = [cls() for cls in CITY.browser_sources]
+    if browser_scrapers:
+        # One "browser" source, as in a batch run; the warm browser takes its scrapers in turn
+        only = browser_scrapers[0] if len(browser_scrapers) == 1 else None
+        srcs.append(pipeline.Source(
+            "browser", lambda: (e for s in browser_scrapers for e in browser.events(s)), only, browser_budget,
+        ))
+    snapshots = SnapshotStore(DATA / "snapshots")
+    enrich_cache = EnrichCache(ENRICH_CACHE) if enrich else None
+
+    def make_keep(today):
+        event_filter = make_filter(today)
+        for s in srcs:
+            if s.scraper is not None:
+                s.scraper.event_filter = event_filter
+        snapshots.keep = event_filter.keep
+        return event_filter.keep
+
+    def publish(events):
+        sink = pipeline.JsonArraySink(DATA / "events.json", event_record)
+        for e in events:
+            sink.add(e)
+        sink.close()
+        build_html(events, warnings=stale_warnings(snapshots))
+        metrics.write(METRICS)
+        logging.info(f"Published {len(events)} events")
+
+    service = Daemon(
+        srcs, REFRESH_INTERVALS, REFRESH_INTERVAL, make_keep, publish,
+        settle=snapshots.settle,
+        taps=lambda: [_enricher(enrich_cache)] if enrich_cache else [],
+        on_done=_source_done,
+        deadline=RUN_DEADLINE,
+        policy=RevisitPolicy(
+            DATA / "revisit.json", prior=REFRESH_INTERVALS, default_prior=REFRESH_INTERVAL, bounds=REFRESH_BOUNDS,
+        ),
+        on_tick=metrics.reset,
+    )
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    try:
+        service.run_forever(stop)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        browser.close()
+
+
+def serve(port=8000):
+    """Answer event queries over HTTP from data/events.json, and serve the calendar feeds, until interrupted."""
+    server = api.serve(
+        api.EventStore(DATA / "events.json", lambda e: normalize_category(e.category), CITY.gazetteer.region_of),
+        port=port,
+        feeds=FeedWriter(OUTPUT / "calendar", DATA / "feeds.json"),
+    )
+    logging.info(f"Serving events on http://127.0.0.1:{server.server_port}/events")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def stale_warnings(snapshots):
+    return [f"{name} not rechecked, showing its {taken[:10]} listing" for name, taken in sorted(snapshots.stale.items())]
+
+
+def parser_pool(workers):
+    """Process pool the scrapers parse pages in.
+
+    Workers are spawned rather than forked, since the pipeline's source
+    threads are already running by the time the first page is submitted.
+    """
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def run_once(enrich=False, email=False, delta=False, parse_pool=False):
+    """One batch run of the current city: scrape, check the ledger, render, email.
+
+    Returns the events and any source regressions.
+    """
+    snapshots = SnapshotStore(DATA / "snapshots", make_filter().keep)
+    all_events = run_pipeline(enrich=enrich, snapshots=snapshots, parse_pool=parse_pool)
+    regressions = publish(all_events, snapshots, email=email, delta=delta)
+    return all_events, regressions
+
+
+def publish(all_events, snapshots, email=False, delta=False, warnings=()):
+    """Record the run in the ledger, then render and email its events. Returns source regressions."""
+    logging.info(f"Total: {len(all_events)} events")
+
+    # Check this run's sources against recent history before recording it
+    run = ledger_entry(metrics.to_dict())
+    regressions = check_regressions(read_ledger(LEDGER), run)
+    append_run(LEDGER, run)
+    for r in regressions:
+        logging.warning(f"Source degraded — {r}")
+
+    with metrics.stage("render"):
+        build_html(all_events, warnings=[*warnings, *(str(r) for r in regressions), *stale_warnings(snapshots)])
+
+    if email:
+        with metrics.stage("email"):
+            send_email(all_events, delta=delta)
+
+    metrics.write(METRICS)
+    return regressions
+
+
+def _city_worker(slug, siblings, options, limiter, cache_lock):
+    """Process pool entry point: one city's batch run. Returns its line in the combined index."""
+    global shared_limiter, shared_cache_lock
+    _configure_logging(f"[{slug}] ")
+    city = cities.CITIES[slug]
+    use_city(city, [cities.CITIES[s] for s in siblings])
+    shared_limiter, shared_cache_lock = limiter, cache_lock
+    started = time.perf_counter()
+    # The cities are the parallelism here; a parse pool per city would only oversubscribe the cores
+    events, regressions = run_once(**options, parse_pool=False)
+    return {
+        "name": city.name,
+        "slug": slug,
+        "page": os.path.relpath(OUTPUT / "index.html", CITY_INDEX.parent),
+        "calendar": os.path.relpath(OUTPUT / "calendar" / "all.ics", CITY_INDEX.parent),
+        "events": len(events),
+        "regressions": [str(r) for r in regressions],
+        "seconds": round(time.perf_counter() - started, 1),
+    }
+
+
+def run_cities(slugs, **options):
+    """Run several cities at once, one spawned process each, then write the combined index.
+
+    The processes share one per-host rate limiter, so cities searching the
+    same site (every city's Eventbrite) still pace it as one client, and
+    one enrichment cache. Returns the index entries; a city that crashed
+    has an "error" instead of counts.
+    """
+    unknown = [s for s in slugs if s not in cities.CITIES]
+    if unknown:
+        sys.exit(f"No city called {', '.join(unknown)}; choose from: {', '.join(cities.CITIES)}")
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    with context.Manager() as manager, ProcessPoolExecutor(
+        max_workers=min(len(slugs), CITY_WORKERS), mp_context=context,
+    ) as pool:
+        limiter, cache_lock = HostLimiter.shared(manager), manager.Lock()
+        futures = {pool.submit(_city_worker, slug, slugs, options, limiter, cache_lock): slug for slug in slugs}
+        for f in as_completed(futures):
+            slug = futures[f]
+            try:
+                results[slug] = f.result()
+                logging.info(f"{slug}: {results[slug]['events']} events in {results[slug]['seconds']}s")
+            except Exception as e:
+                logging.error(f"{slug} failed: {e}")
+                results[slug] = {"name": cities.CITIES[slug].name, "slug": slug, "error": str(e)}
+
+    entries = [results[s] for s in slugs]
+    CITY_INDEX.parent.mkdir(parents=True, exist_ok=True)
+    CITY_INDEX.write_text(json.dumps({"updated": datetime.now().isoformat(timespec="seconds"), "cities": entries}, indent=2))
+    logging.info(f"Wrote {CITY_INDEX}")
+    return entries
+
+
+def _configure_logging(prefix=""):
     logging.basicConfig(
         level=logging.INFO,
-        format="%(asctime)s %(levelname)s %(message)s",
+        format=f"%(asctime)s %(levelname)s {prefix}%(message)s",
         datefmt="%H:%M:%S",
     )
 
-    all_events = scrape_simple()
-    all_events.extend(scrape_browser())
-    all_events = filter_events(all_events)
 
-    logging.info(f"Total: {len(all_events)} events")
+def _arg(flag):
+    return sys.argv[sys.argv.index(flag) + 1] if flag in sys.argv[:-1] else None
 
-    save_events(all_events)
-    build_html(all_events)
 
-    if "--email" in sys.argv:
-        html = build_email(all_events)
-        send_email(html)
+def main():
+    _configure_logging()
+
+    options = {"enrich": "--enrich" in sys.argv, "email": "--email" in sys.argv, "delta": "--delta" in sys.argv}
+    if _arg("--cities"):
+        slugs = list(cities.CITIES) if _arg("--cities") == "all" else _arg("--cities").split(",")
+        entries = run_cities(slugs, **options)
+        failed = any("error" in e or e["regressions"] for e in entries)
+        if failed and "--strict" in sys.argv:
+            sys.exit(1)
+        return
+    if _arg("--city"):
+        if _arg("--city") not in cities.CITIES:
+            sys.exit(f"No city called {_arg('--city')!r}; choose from: {', '.join(cities.CITIES)}")
+        use_city(cities.CITIES[_arg("--city")])
+
+    if sys.argv[1:2] == ["merge"]:
+        regressions = merge_shards(email=options["email"], delta=options["delta"])
+        if regressions and "--strict" in sys.argv:
+            sys.exit(1)
+        return
+    if _arg("--shard"):
+        index, _, count = _arg("--shard").partition("/")
+        if not (index.isdigit() and count.isdigit() and 1 <= int(index) <= int(count)):
+            sys.exit("usage: scrape.py --shard i/N, with 1 <= i <= N")
+        run_shard(int(index), int(count), enrich=options["enrich"])  # its metrics go to merge
+        return
+    if sys.argv[1:2] == ["refresh"]:
+        if len(sys.argv) < 3:
+            sys.exit("usage: scrape.py refresh <source>")
+        refresh(sys.argv[2])
+        return
+    if sys.argv[1:2] == ["serve"]:
+        serve(int(_arg("--port") or 8000))
+        return
+    if sys.argv[1:2] == ["daemon"]:
+        daemon(enrich=options["enrich"])
+        return
+
+    _, regressions = run_once(**options, parse_pool="--parse-pool" in sys.argv)
+    if regressions and "--strict" in sys.argv:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -1,4 +1,5 @@
-from .base import Event, BaseScraper
+from .base import Event, EventFilter, BaseScraper
+from .batch import EventBatch
 from .rich_mix import RichMixScraper
 from .eventbrite import EventbriteScraper
 from .barbican import BarbicanScraper
@@ -1,15 +1,58 @@
-from dataclasses import dataclass
+from concurrent.futures import FIRST_COMPLETED, Executor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from datetime import date
-from typing import Optional
+from typing import Any, Callable, Iterator, Optional
+import codecs
 import logging
+import re
+import sys
 import time
+from urllib.parse import urlsplit
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 
+from .limiter import HostLimiter
+from .stream import CardStream
 
-@dataclass
+# Statuses where the site is asking us to come back later
+RETRY_STATUSES = {429, 503}
+MAX_RETRIES = 3
+
+# Longest a single request may take, in seconds
+REQUEST_TIMEOUT = 15
+
+# A request with no response after this long gets a second, identical one; first answer wins
+HEDGE_AFTER = 5.0
+
+# Request threads each scraper keeps. A request runs on one, and its hedge on
+# another; a losing attempt holds its thread until it answers or times out
+HTTP_WORKERS = 4
+
+# Bytes read at a time when streaming a page
+STREAM_CHUNK = 64 * 1024
+
+
+# Shared date objects, so events on the same day point at one instance
+_DATES: dict[date, date] = {}
+
+
+def _intern_date(d: Optional[date]) -> Optional[date]:
+    return d if d is None else _DATES.setdefault(d, d)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The source has used up its time budget for this run."""
+
+
+@dataclass(slots=True)
 class Event:
+    """One listing.
+
+    Slotted, and the fields that repeat across thousands of events (venue,
+    area, category, time and dates) are interned on construction, so each
+    event only really pays for its title, URL and description.
+    """
     title: str
     venue: str
     url: str
@@ -21,6 +64,22 @@ class Event:
     is_free: bool = False
     area: str = ""  # e.g. "Dalston", "Shoreditch", "South Kensington"
 
+    # Derived at render time by build_html
+    filter_cat: str = field(default="", compare=False, repr=False)
+    source: str = field(default="", compare=False, repr=False)
+    region: str = field(default="", compare=False, repr=False)
+
+    # Served from the source's last good snapshot because this run's scrape failed
+    stale: bool = field(default=False, compare=False, repr=False)
+
+    def __post_init__(self):
+        self.venue = sys.intern(self.venue)
+        self.area = sys.intern(self.area)
+        self.category = sys.intern(self.category)
+        self.time = sys.intern(self.time)
+        self.start_date = _intern_date(self.start_date)
+        self.end_date = _intern_date(self.end_date)
+
     @property
     def date_display(self) -> str:
         parts = []
@@ -35,22 +94,279 @@ class Event:
         return ", ".join(parts)
 
 
+def to_record(e: Event) -> tuple:
+    """An event as a plain tuple, cheap to send between processes; Event(*record) rebuilds it."""
+    return (e.title, e.venue, e.url, e.start_date, e.end_date, e.time,
+            e.description, e.category, e.is_free, e.area)
+
+
+@dataclass
+class EventFilter:
+    """The global keep rules, split by field so scrapers can check the cheap ones first.
+
+    Scrapers call category_ok, then date_ok, then title_ok as soon as each
+    field is known, and only go on to URLs and descriptions for cards that
+    pass. The default keeps everything that hasn't already happened.
+    """
+    today: Optional[date] = None  # None means date.today() at check time
+    exclude_category: Optional[Callable[[str], bool]] = None
+    title_words: tuple[str, ...] = ()
+
+    def __post_init__(self):
+        # Blank words would match every title; title_contains skips them too
+        words = [w for w in self.title_words if w]
+        self._title_re = re.compile("|".join(re.escape(w) for w in words)) if words else None
+
+    def category_ok(self, category: str) -> bool:
+        return not (self.exclude_category and self.exclude_category(category))
+
+    def date_ok(self, d: Optional[date]) -> bool:
+        return d is None or d >= (self.today or date.today())
+
+    def title_ok(self, title: str) -> bool:
+        return not (self._title_re and self._title_re.search(title.lower()))
+
+    def keep(self, e: "Event") -> bool:
+        return self.category_ok(e.category) and self.date_ok(e.start_date) and self.title_ok(e.title)
+
+
+@dataclass
+class SourceStats:
+    """Per-source counters filled in while a scraper runs."""
+    requests: int = 0
+    bytes: int = 0
+    http_seconds: float = 0.0
+    wait_seconds: float = 0.0  # politeness sleeps between requests
+    latencies: list[float] = field(default_factory=list)
+    hedged: int = 0  # requests re-sent because the first attempt was slow
+    errors: dict[str, int] = field(default_factory=dict)  # exception class -> count
+
+    def record_error(self, exc: Exception):
+        name = type(exc).__name__
+        self.errors[name] = self.errors.get(name, 0) + 1
+
+
 class BaseScraper:
     name: str = ""
     base_url: str = ""
+    delay: float = 1  # politeness pause before each request, in seconds
+    event_filter: EventFilter = EventFilter()  # scrape.py hands in the global rules
+    parser_pool: Optional[Executor] = None  # process pool for parse(), if scrape.py provides one
+    card_selector: str = ""  # "tag.class" of one listing card, for scrapers that parse card by card
+    streaming: bool = True  # parse card scrapers' pages while they download
+    deadline: Optional[float] = None  # time.monotonic() by which the source must finish
+    hedge_after: Optional[float] = HEDGE_AFTER
+    limiter: Optional[HostLimiter] = None  # shared per-host pacing, when several cities run at once
 
     def __init__(self):
         self.logger = logging.getLogger(self.__class__.__name__)
+        self.stats = SourceStats()
         self.session = requests.Session()
         self.session.headers.update({
             "User-Agent": "LondonCulture/1.0 (personal event aggregator)"
         })
+        # Threads start on first use, and only as many as are needed at once
+        self._http = ThreadPoolExecutor(max_workers=HTTP_WORKERS, thread_name_prefix=f"{self.name}-http")
+
+    def _record_response(self, resp: requests.Response, seconds: float, stream: bool):
+        # A streamed body's bytes, and the time spent reading it, are counted as it's read
+        size = 0 if stream else len(resp.content)
+        self._record_page(seconds, size)
+
+    def _timed_get(self, url: str, timeout: float, stream: bool) -> tuple[requests.Response, float]:
+        """GET and how long it took, body included unless streaming.
+
+        Not resp.elapsed, which stops at the headers and would leave the
+        download to be counted as parsing.
+        """
+        started = time.perf_counter()
+        resp = self.session.get(url, timeout=timeout, stream=stream)
+        return resp, time.perf_counter() - started
+
+    def _record_page(self, seconds: float, size: int):
+        """Count one fetched page, whether an HTTP response or a browser load."""
+        self.stats.requests += 1
+        self.stats.bytes += size
+        self.stats.http_seconds += seconds
+        self.stats.latencies.append(seconds)
+
+    def _wait(self, seconds: float | None = None):
+        """Pause between requests so we don't hammer venue sites."""
+        seconds = self.delay if seconds is None else seconds
+        if self.deadline is not None:
+            seconds = min(seconds, max(0.0, self.deadline - time.monotonic()))
+        self.stats.wait_seconds += seconds
+        time.sleep(seconds)
+
+    def _pause(self, url: str) -> float:
+        """Seconds to wait before requesting url: delay, or the host's next slot from the limiter."""
+        if self.limiter is None:
+            return self.delay
+        return self.limiter.reserve(urlsplit(url).netloc, self.delay)
+
+    def _remaining(self, limit: float = REQUEST_TIMEOUT) -> float:
+        """Seconds the next step may take: limit, or less if the deadline is nearer."""
+        if self.deadline is None:
+            return limit
+        left = self.deadline - time.monotonic()
+        if left <= 0:
+            raise DeadlineExceeded(f"{self.name} is out of time")
+        return min(limit, left)
+
+    def scrape(self, **kwargs) -> list[Event]:
+        return list(self.iter_events(**kwargs))
+
+    def pages(self) -> Iterator[tuple[str, Any]]:
+        """(url, meta) for each page to fetch; meta is passed on to parse()."""
+        raise NotImplementedError
 
-    def scrape(self) -> list[Event]:
+    def parse(self, body: str, meta: Any = None) -> Iterator[Event]:
+        """Events from one fetched page.
+
+        With a parser_pool this runs in another process on a bare instance,
+        so it may only use base_url, event_filter and logger. The default
+        runs parse_card over every card_selector match.
+        """
+        soup = BeautifulSoup(body, "html.parser")
+        for card in soup.select(self.card_selector):
+            event = self.parse_card(card, meta)
+            if event:
+                yield event
+
+    def parse_card(self, card: Tag, meta: Any = None) -> Optional[Event]:
+        """The event in one listing card, or None to skip it."""
         raise NotImplementedError
 
+    def iter_events(self) -> Iterator[Event]:
+        """Yield events as they are parsed: fetch each of pages(), parse it.
+
+        Scrapers that need more than that (a browser, per-page bookkeeping)
+        override this and catch and log their own errors.
+        """
+        try:
+            if self.parser_pool is None:
+                for url, meta in self.pages():
+                    if self.card_selector and self.streaming:
+                        yield from self._stream_cards(url, meta)
+                    else:
+                        yield from self.parse(self._fetch(url).text, meta)
+                return
+
+            # Download here while the pool parses earlier pages
+            state = {"base_url": self.base_url, "event_filter": self.event_filter}
+            futures = []
+            for url, meta in self.pages():
+                body = self._fetch(url).text
+                futures.append(self.parser_pool.submit(parse_records, type(self), state, body, meta))
+                while futures and futures[0].done():
+                    yield from (Event(*r) for r in futures.pop(0).result())
+            for f in futures:
+                yield from (Event(*r) for r in f.result())
+        except DeadlineExceeded as e:
+            self.logger.warning(f"{self.name} stopped early: {e}")
+            self.stats.record_error(e)
+        except Exception as e:
+            self.logger.error(f"{self.name} scrape failed: {e}")
+            self.stats.record_error(e)
+
+    def _fetch(self, url: str, stream: bool = False) -> requests.Response:
+        """GET a URL politely, backing off when the site says it's busy."""
+        for attempt in range(MAX_RETRIES + 1):
+            self._wait(self._pause(url))
+            resp = self._send(url, stream)
+            if resp.status_code in RETRY_STATUSES and attempt < MAX_RETRIES:
+                resp.close()
+                retry_after = resp.headers.get("Retry-After", "")
+                backoff = float(retry_after) if retry_after.isdigit() else 2 ** attempt
+                self.logger.warning(f"{resp.status_code} from {url}, retrying in {backoff:g}s")
+                self._wait(min(backoff, 30))
+                continue
+            resp.raise_for_status()
+            return resp
+
+    def _send(self, url: str, stream: bool) -> requests.Response:
+        """One GET, hedged: if it hasn't answered after hedge_after seconds an
+        identical request goes out too, and whichever responds first is used.
+
+        Requests run on the scraper's request threads so this thread can give
+        up at the deadline even while a request is stuck. Only the response
+        used is counted in the stats.
+        """
+        timeout = self._remaining()
+        attempts = [self._http.submit(self._timed_get, url, timeout, stream)]
+        hedge_at = time.monotonic() + self.hedge_after if self.hedge_after else None
+        try:
+            while True:
+                for f in attempts:
+                    if f.done() and f.exception() is None:
+                        for other in attempts:
+                            if other is not f:
+                                other.add_done_callback(_close_response)
+                        resp, seconds = f.result()
+                        self._record_response(resp, seconds, stream)
+                        return resp
+                pending = [f for f in attempts if not f.done()]
+                if not pending:
+                    # Every attempt failed; raise the first one's error
+                    attempts[0].result()
+                wait_for = self._remaining(timeout)
+                if hedge_at is not None:
+                    if time.monotonic() >= hedge_at:
+                        self.logger.debug(f"No answer from {url} after {self.hedge_after:g}s, hedging")
+                        self.stats.hedged += 1
+                        attempts.append(self._http.submit(self._timed_get, url, timeout, stream))
+                        hedge_at = None
+                        continue
+                    wait_for = min(wait_for, hedge_at - time.monotonic())
+                wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+        except DeadlineExceeded:
+            for f in attempts:
+                f.add_done_callback(_close_response)
+            raise
+
+    def _stream_cards(self, url: str, meta: Any = None) -> Iterator[Event]:
+        """Fetch a page and parse it card by card while it downloads.
+
+        Each card is extracted as soon as its closing tag arrives and then
+        dropped, so memory stays at about one card plus one chunk however
+        big the page is.
+        """
+        with self._fetch(url, stream=True) as resp:
+            decoder = codecs.getincrementaldecoder(resp.encoding or "utf-8")(errors="replace")
+            parser = CardStream(self.card_selector)
+            chunks = resp.iter_content(STREAM_CHUNK)
+            while True:
+                # Reading the body is network time, not parsing
+                started = time.perf_counter()
+                chunk = next(chunks, None)
+                self.stats.http_seconds += time.perf_counter() - started
+                if chunk is None:
+                    break
+                self.stats.bytes += len(chunk)
+                parser.feed(decoder.decode(chunk))
+                for card in parser.cards():
+                    event = self.parse_card(card, meta)
+                    if event:
+                        yield event
+            parser.feed(decoder.decode(b"", final=True))
+            parser.close()
+            for card in parser.cards():
+                event = self.parse_card(card, meta)
+                if event:
+                    yield event
+
     def _get(self, url: str) -> BeautifulSoup:
-        time.sleep(1)
-        resp = self.session.get(url, timeout=15)
-        resp.raise_for_status()
-        return BeautifulSoup(resp.text, "html.parser")
+        return BeautifulSoup(self._fetch(url).text, "html.parser")
+
+
+def _close_response(future):
+    if future.exception() is None:
+        future.result()[0].close()
+
+
+def parse_records(cls: type, state: dict, body: str, meta: Any) -> list[tuple]:
+    """Process pool entry point: run cls.parse on a body and return plain records."""
+    scraper = cls.__new__(cls)
+    scraper.__dict__.update(state)
+    scraper.logger = logging.getLogger(cls.__name__)
+    return [to_record(e) for e in scraper.parse(body, meta)]
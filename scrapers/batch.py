@@ -0,0 +1,86 @@
+import re
+from datetime import date
+
+import numpy as np
+
+from .base import Event
+
+# Ordinal used for undated events, so they sort last like date.max
+NO_DATE = date.max.toordinal()
+
+
+def _factorize(values: list[str], ordered: bool = False) -> tuple[np.ndarray, list[str]]:
+    """Integer code per value, plus the distinct values. ordered=True makes codes sort like the strings."""
+    uniques = sorted(set(values)) if ordered else list(dict.fromkeys(values))
+    lookup = {v: i for i, v in enumerate(uniques)}
+    return np.fromiter((lookup[v] for v in values), dtype=np.int64, count=len(values)), uniques
+
+
+class EventBatch:
+    """Columnar view over a list of events for whole-batch filtering, dedup and sort.
+
+    Dates are int32 ordinals, categories and times are integer codes, and
+    lowered titles are kept both as codes (for dedup keys) and joined into
+    one string so keyword checks are a single regex scan. Operations work
+    on index arrays; take() turns the survivors back into Event objects.
+
+    Runs don't go through it: pipeline.merge() filters, dedups and orders
+    them as a stream. It backs filter_events(), which the benchmarks time
+    and the pipeline's merge is checked against.
+    """
+
+    def __init__(self, events: list[Event]):
+        self.events = events
+        n = len(events)
+        self.start = np.fromiter(
+            (e.start_date.toordinal() if e.start_date else NO_DATE for e in events),
+            dtype=np.int32, count=n,
+        )
+        self.category, self.categories = _factorize([e.category for e in events])
+        self.time, _ = _factorize([e.time or "" for e in events], ordered=True)
+
+        titles = [e.title.lower() for e in events]
+        self.title, _ = _factorize([t.strip() for t in titles])
+        # One newline-separated string, with each row's starting offset
+        self._titles = "\n".join(titles)
+        lengths = np.fromiter((len(t) + 1 for t in titles), dtype=np.int64, count=n)
+        self._offsets = np.concatenate(([0], np.cumsum(lengths)[:-1])) if n else np.zeros(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.events)
+
+    def before(self, day: date) -> np.ndarray:
+        """Mask of dated events strictly before day."""
+        return self.start < day.toordinal()
+
+    def category_in(self, predicate) -> np.ndarray:
+        """Mask of events whose category matches; predicate runs once per distinct category."""
+        lut = np.fromiter((bool(predicate(c)) for c in self.categories), dtype=bool, count=len(self.categories))
+        return lut[self.category] if len(self.categories) else np.zeros(0, dtype=bool)
+
+    def title_contains(self, words) -> np.ndarray:
+        """Mask of events whose lowered title contains any of the words. Blank words match nothing."""
+        mask = np.zeros(len(self), dtype=bool)
+        words = [w for w in words if w]
+        if not len(self) or not words:
+            return mask
+        pattern = re.compile("|".join(re.escape(w) for w in words))
+        hits = np.fromiter((m.start() for m in pattern.finditer(self._titles)), dtype=np.int64)
+        if len(hits):
+            mask[np.searchsorted(self._offsets, hits, side="right") - 1] = True
+        return mask
+
+    def first_unique(self, idx: np.ndarray) -> np.ndarray:
+        """Keep the first of each (stripped lowered title, date) among idx, in idx order."""
+        keys = self.title[idx] * (NO_DATE + 1) + self.start[idx]
+        _, first = np.unique(keys, return_index=True)
+        return idx[np.sort(first)]
+
+    def sorted(self, idx: np.ndarray) -> np.ndarray:
+        """idx ordered by (date, time), undated last, ties kept in idx order."""
+        order = np.lexsort((self.time[idx], self.start[idx]))
+        return idx[order]
+
+    def take(self, idx: np.ndarray) -> list[Event]:
+        events = self.events
+        return [events[i] for i in idx.tolist()]
@@ -1,67 +1,73 @@
 import re
 from datetime import date, datetime
+from typing import Iterator
 
 from .base import BaseScraper, Event
 
+# Everything on the talks, courses & workshops listing
+CATEGORY = "Talk / Workshop"
+
 
 class DesignMuseumScraper(BaseScraper):
     name = "Design Museum"
     base_url = "https://designmuseum.org"
+    card_selector = "div.page-item"
+
+    def pages(self) -> Iterator[tuple[str, None]]:
+        if not self.event_filter.category_ok(CATEGORY):
+            return
+
+        # Talks, courses & workshops — not exhibitions
+        yield f"{self.base_url}/whats-on/talks-courses-and-workshops", None
+
+    def parse_card(self, item, meta=None) -> Event | None:
+        time_el = item.select_one("time.icon-date")
+        title_el = item.select_one("h2")
+        link_el = item.select_one("a[href]")
+
+        if not title_el or not link_el:
+            return None
+
+        title = title_el.get_text(strip=True)
+
+        # Skip kids events and non-events
+        title_lower = title.lower()
+        skip_words = [
+            "year old", "children", "kids", "family", "toddler", "baby",
+            "schools", "sign up", "newsletter", "plan your visit",
+            "members enjoy", "membership", "ma curating",
+        ]
+        if any(w in title_lower for w in skip_words):
+            return None
+
+        date_text = time_el.get_text(strip=True) if time_el else ""
+        event_date, time_str = self._parse_datetime(date_text)
+        if not self.event_filter.date_ok(event_date) or not self.event_filter.title_ok(title):
+            return None
+
+        href = link_el["href"]
+        if not href.startswith("http"):
+            href = f"{self.base_url}{href}"
+
+        desc_el = item.select_one("div.rich-text p")
+        desc = ""
+        if desc_el:
+            desc = desc_el.get_text(strip=True)[:200]
+            desc = re.sub(r"\s*Sold out\..*$", "", desc)
+
+        is_free = "free" in date_text.lower() if date_text else False
 
-    def scrape(self) -> list[Event]:
-        events = []
-        try:
-            # Talks, courses & workshops — not exhibitions
-            soup = self._get(f"{self.base_url}/whats-on/talks-courses-and-workshops")
-            for item in soup.select("div.page-item"):
-                time_el = item.select_one("time.icon-date")
-                title_el = item.select_one("h2")
-                link_el = item.select_one("a[href]")
-
-                if not title_el or not link_el:
-                    continue
-
-                title = title_el.get_text(strip=True)
-
-                # Skip kids events and non-events
-                title_lower = title.lower()
-                skip_words = [
-                    "year old", "children", "kids", "family", "toddler", "baby",
-                    "schools", "sign up", "newsletter", "plan your visit",
-                    "members enjoy", "membership", "ma curating",
-                ]
-                if any(w in title_lower for w in skip_words):
-                    continue
-
-                href = link_el["href"]
-                if not href.startswith("http"):
-                    href = f"{self.base_url}{href}"
-
-                date_text = time_el.get_text(strip=True) if time_el else ""
-                event_date, time_str = self._parse_datetime(date_text)
-
-                desc_el = item.select_one("div.rich-text p")
-                desc = ""
-                if desc_el:
-                    desc = desc_el.get_text(strip=True)[:200]
-                    desc = re.sub(r"\s*Sold out\..*$", "", desc)
-
-                is_free = "free" in date_text.lower() if date_text else False
-
-                events.append(Event(
-                    title=title,
-                    venue=self.name,
-                    url=href,
-                    start_date=event_date,
-                    time=time_str,
-                    description=desc,
-                    category="Talk / Workshop",
-                    is_free=is_free,
-                    area="Kensington",
-                ))
-        except Exception as e:
-            self.logger.error(f"Design Museum scrape failed: {e}")
-        return events
+        return Event(
+            title=title,
+            venue=self.name,
+            url=href,
+            start_date=event_date,
+            time=time_str,
+            description=desc,
+            category=CATEGORY,
+            is_free=is_free,
+            area="Kensington",
+        )
 
     def _parse_datetime(self, text: str) -> tuple[date | None, str]:
         """Parse dates like 'Tuesday 17 February, 10:00 – 16:00' or 'Thursday 6 March 2026, 19:00 – 20:30'."""
@@ -1,11 +1,15 @@
 import json
 import re
 from datetime import date, datetime
+from typing import Iterator
 
-from .base import BaseScraper, Event
+from .base import BaseScraper, DeadlineExceeded, Event
+from .geo import LONDON, Gazetteer
+from .planner import QueryPlanner
 
 
-# Focused search queries — social events where you actually meet people
+# Focused search queries — social events where you actually meet people.
+# The planner picks which of these (and which pages) to fetch each run.
 SEARCHES = [
     "life-drawing",
     "gallery-opening",
@@ -15,20 +19,26 @@ SEARCHES = [
     "ceramics-workshop",
     "design-talk",
     "art-opening",
+    "private-view",
+    "artist-talk",
+    "book-launch",
+    "poetry-reading",
+    "zine-fair",
+    "craft-workshop",
+    "screen-printing",
+    "photography-walk",
+    "architecture-tour",
+    "sketch-club",
+    "illustration-workshop",
+    "textile-workshop",
+    "letterpress",
+    "creative-social",
+    "panel-discussion",
+    "exhibition-late",
 ]
 
-# Skip events outside London proper
-LONDON_AREAS = {
-    "london", "shoreditch", "dalston", "hackney", "bethnal green",
-    "peckham", "brixton", "camden", "islington", "soho", "fitzrovia",
-    "clerkenwell", "whitechapel", "bermondsey", "deptford", "lewisham",
-    "stratford", "bow", "mile end", "walthamstow", "tottenham",
-    "stoke newington", "finsbury park", "king's cross", "angel",
-    "south kensington", "chelsea", "fulham", "battersea", "vauxhall",
-    "elephant and castle", "waterloo", "southwark", "borough",
-    "hoxton", "haggerston", "hackney wick", "homerton",
-    "somers town", "marylebone", "mayfair", "covent garden",
-}
+# Pages fetched per run, however many terms there are
+REQUEST_BUDGET = 8
 
 # Skip events with these words in the title
 SKIP_WORDS = [
@@ -41,59 +51,118 @@ class EventbriteScraper(BaseScraper):
     name = "Eventbrite"
     base_url = "https://www.eventbrite.co.uk"
 
-    def scrape(self) -> list[Event]:
-        events = []
+    def __init__(self, planner: QueryPlanner | None = None, place: str = "united-kingdom--london",
+                 searches: list[str] | None = None, gazetteer: Gazetteer = LONDON):
+        super().__init__()
+        self.planner = planner
+        self.place = place  # the /d/<place>/ part of search URLs
+        self.searches = searches or SEARCHES
+        self.gazetteer = gazetteer
+        self.plan: list[tuple[str, int]] | None = None  # fixed (term, page) fetches, e.g. one shard's share
+        self.yields: dict[tuple[str, int], int] = {}  # events each fetch added this run
+        self.fetching: tuple[str, int] | None = None  # the (term, page) being yielded from
+
+    def iter_events(self) -> Iterator[Event]:
         seen_ids = set()
-
-        for search in SEARCHES:
-            try:
-                page_events = self._scrape_search(search, seen_ids)
-                events.extend(page_events)
-            except Exception as e:
-                self.logger.error(f"Eventbrite search '{search}' failed: {e}")
-        return events
-
-    def _scrape_search(self, search_term: str, seen_ids: set) -> list[Event]:
-        import time
-        time.sleep(1)
-
-        url = f"{self.base_url}/d/united-kingdom--london/{search_term}/?page=1"
-        resp = self.session.get(url, timeout=15)
-        resp.raise_for_status()
+        if self.plan is not None:
+            plan = self.plan
+        elif self.planner:
+            plan = self.planner.plan(self.searches)
+        else:
+            plan = [(search, 1) for search in self.searches[:REQUEST_BUDGET]]
+
+        try:
+            for search, page in plan:
+                added = 0
+                self.fetching = (search, page)
+                try:
+                    for event in self._scrape_search(search, page, seen_ids):
+                        added += 1
+                        yield event
+                except DeadlineExceeded as e:
+                    # Out of time: stop here, without counting unfetched pages as unproductive
+                    self.logger.warning(f"Eventbrite stopped early: {e}")
+                    self.stats.record_error(e)
+                    break
+                except Exception as e:
+                    # Still recorded below, so a search that keeps failing sinks down the plan
+                    self.logger.error(f"Eventbrite search '{search}' page {page} failed: {e}")
+                    self.stats.record_error(e)
+                self.yields[(search, page)] = added
+                if self.planner:
+                    self.planner.record(search, page, added)
+        finally:
+            if self.planner:
+                self.planner.save()
+
+    def _scrape_search(self, search_term: str, page: int, seen_ids: set) -> Iterator[Event]:
+        url = f"{self.base_url}/d/{self.place}/{search_term}/?page={page}"
+        resp = self._fetch(url)
 
         # Extract __SERVER_DATA__ JSON
         m = re.search(r"window\.__SERVER_DATA__\s*=\s*({.*?});\s*\n", resp.text, re.DOTALL)
         if not m:
-            return []
+            return
 
         data = json.loads(m.group(1))
         results = data.get("search_data", {}).get("events", {}).get("results", [])
 
-        events = []
         for item in results:
             eid = item.get("id", "")
             if eid in seen_ids:
                 continue
             seen_ids.add(eid)
 
-            name = item.get("name", "").strip()
-            event_url = item.get("url", "")
-            summary = item.get("summary", "").strip()
-            start_str = item.get("start_date", "")
-            start_time = item.get("start_time", "")
+            # Skip online-only events
+            if item.get("is_online_event"):
+                continue
 
-            if not name or not event_url:
+            # Category from tags
+            category = ""
+            for tag in item.get("tags", []):
+                if tag.get("prefix") == "EventbriteCategory":
+                    category = tag.get("display_name", "")
+                    break
+            if not self.event_filter.category_ok(category):
                 continue
 
             # Parse date
+            start_str = item.get("start_date", "")
             start_date = None
             if start_str:
                 try:
                     start_date = datetime.strptime(start_str, "%Y-%m-%d").date()
                 except ValueError:
                     pass
+            if not self.event_filter.date_ok(start_date):
+                continue
+
+            name = item.get("name", "").strip()
+            event_url = item.get("url", "")
+            if not name or not event_url:
+                continue
+
+            # Skip kids/family events
+            name_lower = name.lower()
+            if any(w in name_lower for w in SKIP_WORDS):
+                continue
+            if not self.event_filter.title_ok(name):
+                continue
+
+            # Venue and area — the search is city-wide but results leak
+            # in from elsewhere, so check where the venue actually is
+            venue_info = item.get("primary_venue") or {}
+            venue_name = venue_info.get("name", "")
+            address = venue_info.get("address") or {}
+            location = self.gazetteer.locate(
+                address.get("postal_code") or "", _float(address.get("latitude")), _float(address.get("longitude")),
+            )
+            if location.inside is False:
+                continue
+            area = location.area or address.get("localized_area_display", "")
 
             # Format time
+            start_time = item.get("start_time", "")
             time_str = ""
             if start_time:
                 try:
@@ -102,38 +171,10 @@ class EventbriteScraper(BaseScraper):
                 except ValueError:
                     time_str = start_time
 
-            # Venue and area
-            venue_info = item.get("primary_venue") or {}
-            venue_name = venue_info.get("name", "")
-            address = venue_info.get("address", {})
-            area = address.get("localized_area_display", "")
-
-            # Category from tags
-            category = ""
-            for tag in item.get("tags", []):
-                if tag.get("prefix") == "EventbriteCategory":
-                    category = tag.get("display_name", "")
-                    break
-
-            # Skip online-only events
-            if item.get("is_online_event"):
-                continue
-
-            # Skip events outside London
-            area_lower = area.lower()
-            city = address.get("city", "").lower()
-            if area_lower and city:
-                if not any(loc in area_lower or loc in city for loc in LONDON_AREAS):
-                    continue
-
-            # Skip kids/family events
-            name_lower = name.lower()
-            if any(w in name_lower for w in SKIP_WORDS):
-                continue
-
+            summary = item.get("summary", "").strip()
             display_venue = venue_name if venue_name else "Eventbrite"
 
-            events.append(Event(
+            yield Event(
                 title=name,
                 venue=display_venue,
                 url=event_url,
@@ -142,6 +183,11 @@ class EventbriteScraper(BaseScraper):
                 description=summary[:200] if summary else "",
                 category=category,
                 area=area,
-            ))
+            )
+
 
-        return events
+def _float(value) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
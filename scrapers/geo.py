@@ -0,0 +1,260 @@
+"""Where an event is: postcode districts and a rough city boundary.
+
+Each city has a Gazetteer. Postcodes resolve through its table of
+districts (with a few sector overrides for neighbourhoods that matter
+more than their district name, like Shoreditch or Soho). Coordinates are checked against a simplified
+boundary polygon through a coarse grid, so almost every lookup is one
+dict hit and only points in cells the border crosses need the exact
+point-in-polygon test.
+"""
+
+import math
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+# Neighbourhood for each inner London postcode district
+DISTRICTS = {
+    "E1": "Whitechapel", "E1W": "Wapping", "E2": "Bethnal Green", "E3": "Bow",
+    "E4": "Chingford", "E5": "Clapton", "E6": "East Ham", "E7": "Forest Gate",
+    "E8": "Hackney", "E9": "Homerton", "E10": "Leyton", "E11": "Leytonstone",
+    "E12": "Manor Park", "E13": "Plaistow", "E14": "Poplar", "E15": "Stratford",
+    "E16": "Canning Town", "E17": "Walthamstow", "E18": "South Woodford", "E20": "Stratford",
+    "EC1": "Clerkenwell", "EC2": "City of London", "EC3": "City of London", "EC4": "City of London",
+    "N1": "Islington", "N2": "East Finchley", "N3": "Finchley", "N4": "Finsbury Park",
+    "N5": "Highbury", "N6": "Highgate", "N7": "Holloway", "N8": "Hornsey",
+    "N9": "Edmonton", "N10": "Muswell Hill", "N11": "New Southgate", "N12": "North Finchley",
+    "N13": "Palmers Green", "N14": "Southgate", "N15": "Seven Sisters", "N16": "Stoke Newington",
+    "N17": "Tottenham", "N18": "Edmonton", "N19": "Archway", "N20": "Whetstone",
+    "N21": "Winchmore Hill", "N22": "Wood Green",
+    "NW1": "Camden", "NW2": "Cricklewood", "NW3": "Hampstead", "NW4": "Hendon",
+    "NW5": "Kentish Town", "NW6": "Kilburn", "NW7": "Mill Hill", "NW8": "St John's Wood",
+    "NW9": "Kingsbury", "NW10": "Willesden", "NW11": "Golders Green",
+    "SE1": "Southwark", "SE2": "Abbey Wood", "SE3": "Blackheath", "SE4": "Brockley",
+    "SE5": "Camberwell", "SE6": "Catford", "SE7": "Charlton", "SE8": "Deptford",
+    "SE9": "Eltham", "SE10": "Greenwich", "SE11": "Kennington", "SE12": "Lee",
+    "SE13": "Lewisham", "SE14": "New Cross", "SE15": "Peckham", "SE16": "Bermondsey",
+    "SE17": "Walworth", "SE18": "Woolwich", "SE19": "Crystal Palace", "SE20": "Penge",
+    "SE21": "Dulwich", "SE22": "East Dulwich", "SE23": "Forest Hill", "SE24": "Herne Hill",
+    "SE25": "South Norwood", "SE26": "Sydenham", "SE27": "West Norwood", "SE28": "Thamesmead",
+    "SW1": "Westminster", "SW2": "Brixton", "SW3": "Chelsea", "SW4": "Clapham",
+    "SW5": "Earls Court", "SW6": "Fulham", "SW7": "South Kensington", "SW8": "Vauxhall",
+    "SW9": "Stockwell", "SW10": "Chelsea", "SW11": "Battersea", "SW12": "Balham",
+    "SW13": "Barnes", "SW14": "Mortlake", "SW15": "Putney", "SW16": "Streatham",
+    "SW17": "Tooting", "SW18": "Wandsworth", "SW19": "Wimbledon", "SW20": "Raynes Park",
+    "W1": "West End", "W2": "Paddington", "W3": "Acton", "W4": "Chiswick",
+    "W5": "Ealing", "W6": "Hammersmith", "W7": "Hanwell", "W8": "Kensington",
+    "W9": "Maida Vale", "W10": "North Kensington", "W11": "Notting Hill", "W12": "Shepherd's Bush",
+    "W13": "West Ealing", "W14": "West Kensington",
+    "WC1": "Bloomsbury", "WC2": "Covent Garden",
+}
+
+# Finer names for outward codes or sectors ("E2 7") that straddle districts
+SECTORS = {
+    "E1 6": "Shoreditch", "E2 7": "Shoreditch", "EC2A": "Shoreditch",
+    "E2 8": "Haggerston", "N1 6": "Hoxton", "E8 2": "Dalston", "E8 3": "Dalston",
+    "E9 5": "Hackney Wick", "N1C": "King's Cross", "N1 9": "King's Cross",
+    "EC2Y": "Barbican", "EC1V": "Angel", "NW1 2": "Euston",
+    "SE1 1": "Borough", "SE1 6": "Elephant and Castle", "SE1 7": "Waterloo", "SE1 8": "Waterloo",
+    "W1D": "Soho", "W1F": "Soho", "W1T": "Fitzrovia", "W1W": "Fitzrovia",
+    "W1G": "Marylebone", "W1H": "Marylebone", "W1U": "Marylebone",
+    "W1J": "Mayfair", "W1K": "Mayfair", "W1S": "Mayfair",
+    "WC2E": "Covent Garden", "WC2H": "Covent Garden", "WC2R": "Strand", "WC2N": "Strand",
+    "SW1Y": "St James's", "SW1A": "Westminster",
+}
+
+# Postal areas that are wholly London, and ones that straddle the boundary
+INNER_AREAS = {"E", "EC", "N", "NW", "SE", "SW", "W", "WC"}
+OUTER_AREAS = {"BR", "CR", "DA", "EN", "HA", "IG", "KT", "RM", "SM", "TW", "UB"}
+
+# Every UK (and Crown Dependency) postal area; anything else isn't a postcode we can place
+POSTAL_AREAS = {
+    "AB", "AL", "B", "BA", "BB", "BD", "BH", "BL", "BN", "BR", "BS", "BT", "CA", "CB", "CF", "CH",
+    "CM", "CO", "CR", "CT", "CV", "CW", "DA", "DD", "DE", "DG", "DH", "DL", "DN", "DT", "DY", "E",
+    "EC", "EH", "EN", "EX", "FK", "FY", "G", "GL", "GU", "GY", "HA", "HD", "HG", "HP", "HR", "HS",
+    "HU", "HX", "IG", "IM", "IP", "IV", "JE", "KA", "KT", "KW", "KY", "L", "LA", "LD", "LE", "LL",
+    "LN", "LS", "LU", "M", "ME", "MK", "ML", "N", "NE", "NG", "NN", "NP", "NR", "NW", "OL", "OX",
+    "PA", "PE", "PH", "PL", "PO", "PR", "RG", "RH", "RM", "S", "SA", "SE", "SG", "SK", "SL", "SM",
+    "SN", "SO", "SP", "SR", "SS", "ST", "SW", "SY", "TA", "TD", "TF", "TN", "TQ", "TR", "TS", "TW",
+    "UB", "W", "WA", "WC", "WD", "WF", "WN", "WR", "WS", "WV", "YO", "ZE",
+}
+
+# Broad part of town for each inner postal area, for the page's area filter
+REGIONS = {
+    "E": "East", "EC": "Central", "N": "North", "NW": "North",
+    "SE": "South", "SW": "South", "W": "West", "WC": "Central",
+}
+# Districts that belong to a different part of town than their letters say
+DISTRICT_REGIONS = {
+    "W1": "Central", "SW1": "Central", "SE1": "Central",
+    "SW3": "West", "SW5": "West", "SW7": "West", "SW10": "West",
+}
+
+# Greater London, simplified to a couple of dozen (lat, lon) points
+LONDON_BOUNDARY = [
+    (51.692, -0.106), (51.686, -0.011), (51.640, 0.020), (51.630, 0.150),
+    (51.620, 0.270), (51.560, 0.330), (51.510, 0.320), (51.460, 0.200),
+    (51.420, 0.160), (51.380, 0.150), (51.320, 0.110), (51.290, 0.030),
+    (51.290, -0.080), (51.290, -0.170), (51.330, -0.220), (51.330, -0.300),
+    (51.380, -0.340), (51.410, -0.390), (51.420, -0.460), (51.460, -0.510),
+    (51.530, -0.510), (51.600, -0.500), (51.630, -0.440), (51.640, -0.310),
+    (51.670, -0.200), (51.690, -0.150),
+]
+
+# Greater Manchester, very roughly; the postcode areas decide most venues
+MANCHESTER_BOUNDARY = [
+    (53.690, -2.550), (53.690, -2.050), (53.600, -1.910), (53.450, -1.960),
+    (53.340, -2.100), (53.340, -2.400), (53.420, -2.650), (53.580, -2.730),
+]
+
+CELL = 0.01  # grid cell size in degrees
+_OUT, _IN, _EDGE = 0, 1, 2
+
+
+@dataclass(frozen=True)
+class Location:
+    inside: Optional[bool]  # in the city; None when there's nothing to go on
+    area: str = ""
+    region: str = ""
+
+
+def _contains(boundary: list[tuple[float, float]], lat: float, lon: float) -> bool:
+    """Ray-casting point-in-polygon test."""
+    inside = False
+    for (lat1, lon1), (lat2, lon2) in zip(boundary, boundary[1:] + boundary[:1]):
+        if (lon1 > lon) != (lon2 > lon):
+            if lat < lat1 + (lon - lon1) * (lat2 - lat1) / (lon2 - lon1):
+                inside = not inside
+    return inside
+
+
+class _Grid:
+    """Each cell of the boundary's bounding box is inside, outside, or on the edge."""
+
+    def __init__(self, boundary: list[tuple[float, float]]):
+        self.boundary = boundary
+        lats = [p[0] for p in boundary]
+        lons = [p[1] for p in boundary]
+        self.lat0, self.lon0 = min(lats), min(lons)
+        self.rows = int((max(lats) - self.lat0) / CELL) + 1
+        self.cols = int((max(lons) - self.lon0) / CELL) + 1
+        self.cells = bytearray(self.rows * self.cols)
+
+        # Any cell an edge's bounding box touches might be split by it
+        pts = boundary
+        for (lat1, lon1), (lat2, lon2) in zip(pts, pts[1:] + pts[:1]):
+            r1, c1 = self._cell(min(lat1, lat2), min(lon1, lon2))
+            r2, c2 = self._cell(max(lat1, lat2), max(lon1, lon2))
+            for r in range(r1, r2 + 1):
+                for c in range(c1, c2 + 1):
+                    self.cells[r * self.cols + c] = _EDGE
+
+        # The rest are wholly one side, so their centre decides
+        for r in range(self.rows):
+            for c in range(self.cols):
+                i = r * self.cols + c
+                if self.cells[i] != _EDGE:
+                    centre = (self.lat0 + (r + 0.5) * CELL, self.lon0 + (c + 0.5) * CELL)
+                    self.cells[i] = _IN if _contains(boundary, *centre) else _OUT
+
+    def _cell(self, lat: float, lon: float) -> tuple[int, int]:
+        # floor, not int(): just outside the box must land outside it, not in the first row or column
+        return math.floor((lat - self.lat0) / CELL), math.floor((lon - self.lon0) / CELL)
+
+    def contains(self, lat: float, lon: float) -> bool:
+        r, c = self._cell(lat, lon)
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            return False
+        state = self.cells[r * self.cols + c]
+        return state == _IN or (state == _EDGE and _contains(self.boundary, lat, lon))
+
+
+_POSTCODE = re.compile(r"([A-Z]{1,2}\d[A-Z\d]?)(?:(\d)(?:[A-Z]{2})?)?")
+
+
+def _split(postcode: str) -> tuple[str, str]:
+    """Outward code and sector ("E2 7") from a full or partial postcode; ("", "") if it isn't one."""
+    pc = postcode.upper().replace(" ", "")
+    m = _POSTCODE.fullmatch(pc)
+    if not m or _postal_area(m[1]) not in POSTAL_AREAS:
+        return "", ""
+    outward, sector = m[1], m[2]
+    return outward, f"{outward} {sector}" if sector else ""
+
+
+def _postal_area(outward: str) -> str:
+    return outward[:2] if outward[:2].isalpha() else outward[:1]
+
+
+class Gazetteer:
+    """One city's postcode tables and boundary.
+
+    inner_areas are postal areas wholly in the city, outer_areas ones that
+    straddle its boundary (coordinates decide those). districts and
+    sectors name neighbourhoods; regions and district_regions give the
+    broad part of town for the page's area filter.
+    """
+
+    def __init__(self, boundary: list[tuple[float, float]], inner_areas: set[str], outer_areas: set[str],
+                 districts: dict[str, str] | None = None, sectors: dict[str, str] | None = None,
+                 regions: dict[str, str] | None = None, district_regions: dict[str, str] | None = None,
+                 area_regions: dict[str, str] | None = None):
+        self.inner_areas = inner_areas
+        self.outer_areas = outer_areas
+        self.districts = districts or {}
+        self.sectors = sectors or {}
+        self.regions = regions or {}
+        self.district_regions = district_regions or {}
+        self._grid = _Grid(boundary)
+        # Region for each neighbourhood name, so venues' fixed areas can be filtered too
+        self._area_regions = dict(area_regions or {})
+        for code, name in [*self.sectors.items(), *self.districts.items()]:
+            self._area_regions.setdefault(name.lower(), self._region(code.split()[0]))
+
+    def contains(self, lat: float, lon: float) -> bool:
+        return self._grid.contains(lat, lon)
+
+    def _district(self, outward: str) -> str:
+        # W1F -> W1, EC2A -> EC2; E1W is a district of its own
+        return outward if outward in self.districts or not outward[-1:].isalpha() else outward[:-1]
+
+    def _region(self, outward: str) -> str:
+        return self.district_regions.get(self._district(outward)) or self.regions.get(_postal_area(outward), "")
+
+    def locate(self, postcode: str = "", lat: Optional[float] = None, lon: Optional[float] = None) -> Location:
+        """Decide whether a venue is in the city and name its neighbourhood.
+
+        The postcode wins when it settles the question; coordinates decide for
+        outer postal areas that straddle the boundary, or when there's no
+        postcode we recognise.
+        """
+        outward, sector = _split(postcode) if postcode else ("", "")
+        if outward:
+            postal_area = _postal_area(outward)
+            area = (self.sectors.get(sector) or self.sectors.get(outward)
+                    or self.districts.get(self._district(outward), ""))
+            if postal_area in self.inner_areas:
+                return Location(True, area, self._region(outward))
+            if postal_area not in self.outer_areas:
+                return Location(False)
+        if lat is not None and lon is not None:
+            inside = self.contains(lat, lon)
+            return Location(inside, "", "Outer" if inside and outward else "")
+        return Location(None)
+
+    def region_of(self, area: str) -> str:
+        """Broad part of town for a neighbourhood name, or "" if it isn't one we know."""
+        return self._area_regions.get(area.lower().strip(), "")
+
+
+LONDON = Gazetteer(
+    LONDON_BOUNDARY, INNER_AREAS, OUTER_AREAS,
+    districts=DISTRICTS, sectors=SECTORS, regions=REGIONS, district_regions=DISTRICT_REGIONS,
+    area_regions={"the mall": "Central"},
+)
+
+# Venues come with Eventbrite's own area names; there's no neighbourhood table yet
+MANCHESTER = Gazetteer(MANCHESTER_BOUNDARY, {"M"}, {"BL", "OL", "SK", "WA", "WN"})
+
+# London, for callers that predate other cities
+region_of = LONDON.region_of
@@ -1,5 +1,7 @@
 import re
+import time
 from datetime import date, datetime
+from typing import Iterator
 
 from .base import BaseScraper, Event
 
@@ -7,24 +9,35 @@ from .base import BaseScraper, Event
 # Words in title that indicate film screenings (not social events)
 FILM_WORDS = ["film programme", "screening", "on 35mm", "on 16mm"]
 
+# Everything on the talks listing
+CATEGORY = "Talks & events"
+
+# Seconds to let the page render after it loads
+RENDER_WAIT = 5
+
 
 class ICAScraper(BaseScraper):
     name = "ICA"
     base_url = "https://www.ica.art"
     requires_browser = True
 
-    def scrape(self, page=None) -> list[Event]:
+    def iter_events(self, page=None) -> Iterator[Event]:
         if page is None:
             self.logger.warning("No browser available, skipping ICA")
-            return []
+            return
+        if not self.event_filter.category_ok(CATEGORY):
+            return
 
-        events = []
         try:
             from bs4 import BeautifulSoup
 
-            page.goto(f"{self.base_url}/talks", wait_until="domcontentloaded", timeout=15000)
-            page.wait_for_timeout(5000)
-            soup = BeautifulSoup(page.content(), "html.parser")
+            started = time.perf_counter()
+            page.goto(f"{self.base_url}/talks", wait_until="domcontentloaded", timeout=self._remaining() * 1000)
+            # Give the listing's scripts time to render, if the budget allows
+            page.wait_for_timeout(self._remaining(RENDER_WAIT) * 1000)
+            html = page.content()
+            self._record_page(time.perf_counter() - started, len(html.encode()))
+            soup = BeautifulSoup(html, "html.parser")
 
             for item in soup.select("div.item.talks"):
                 link = item.find("a", href=True)
@@ -35,6 +48,19 @@ class ICAScraper(BaseScraper):
                 if not href.startswith("/talks/") or href in ("/talks/tomorrow", "/talks/next-7-days", "/talks/today", "/talks/2026", "/talks/2025"):
                     continue
 
+                # Date from .date
+                date_el = item.select_one(".date")
+                date_text = date_el.get_text(strip=True) if date_el else ""
+                start_date, is_range = self._parse_date(date_text)
+
+                # Skip ongoing programmes (multi-month ranges) — we want single events
+                if is_range:
+                    continue
+
+                # Skip past events
+                if not self.event_filter.date_ok(start_date):
+                    continue
+
                 # Title from .title div — may have <br> between prefix and title
                 title_el = item.select_one(".title")
                 if title_el:
@@ -57,18 +83,7 @@ class ICAScraper(BaseScraper):
                 title_lower = title.lower()
                 if any(w in title_lower for w in FILM_WORDS):
                     continue
-
-                # Date from .date
-                date_el = item.select_one(".date")
-                date_text = date_el.get_text(strip=True) if date_el else ""
-                start_date, is_range = self._parse_date(date_text)
-
-                # Skip ongoing programmes (multi-month ranges) — we want single events
-                if is_range:
-                    continue
-
-                # Skip past events
-                if start_date and start_date < date.today():
+                if not self.event_filter.title_ok(title):
                     continue
 
                 # Description from .description
@@ -77,19 +92,19 @@ class ICAScraper(BaseScraper):
 
                 url = f"{self.base_url}{href}" if not href.startswith("http") else href
 
-                events.append(Event(
+                yield Event(
                     title=title,
                     venue=self.name,
                     url=url,
                     start_date=start_date,
                     description=description,
-                    category="Talks & events",
+                    category=CATEGORY,
                     area="The Mall",
-                ))
+                )
 
         except Exception as e:
             self.logger.error(f"ICA scrape failed: {e}")
-        return events
+            self.stats.record_error(e)
 
     def _parse_date(self, text: str) -> tuple[date | None, bool]:
         """Parse ICA date strings. Returns (date, is_range)."""
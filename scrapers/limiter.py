@@ -0,0 +1,32 @@
+"""Per-host request spacing that holds across processes.
+
+Scrapers normally pause `delay` seconds before each request on their own.
+When several cities scrape at once, their Eventbrite scrapers (and any
+venue two cities share) would each keep their own pace and together hit
+the host several times as often. A HostLimiter hands out request slots
+per host instead: each caller is told how long to wait so that requests
+to one host are at least `spacing` apart however many processes make
+them. Built on a Manager's dict and lock, it can be passed to pool workers.
+"""
+
+import threading
+import time
+
+
+class HostLimiter:
+    def __init__(self, slots=None, lock=None):
+        self.slots = slots if slots is not None else {}  # host -> time.time() of its next free slot
+        self.lock = lock if lock is not None else threading.Lock()
+
+    @classmethod
+    def shared(cls, manager) -> "HostLimiter":
+        """A limiter whose state lives in a multiprocessing Manager, so pool workers share it."""
+        return cls(manager.dict(), manager.Lock())
+
+    def reserve(self, host: str, spacing: float) -> float:
+        """Take the host's next slot; returns the seconds to wait for it."""
+        with self.lock:
+            now = time.time()
+            slot = max(now, self.slots.get(host, 0.0))
+            self.slots[host] = slot + spacing
+        return slot - now
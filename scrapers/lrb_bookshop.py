@@ -1,65 +1,73 @@
 import re
 from datetime import date, datetime
+from typing import Iterator
+
+from bs4 import BeautifulSoup
 
 from .base import BaseScraper, Event
 
+# Everything on the events listing
+CATEGORY = "Literary event"
+
 
 class LRBBookshopScraper(BaseScraper):
     name = "London Review Bookshop"
     base_url = "https://www.londonreviewbookshop.co.uk"
 
-    def scrape(self) -> list[Event]:
-        events = []
-        try:
-            soup = self._get(f"{self.base_url}/events")
-            seen_urls = set()
-
-            for link in soup.select("a[href*='eventbrite']"):
-                href = link.get("href", "")
-                if href in seen_urls:
-                    continue
-
-                # Only parse the "rich" link that has child elements
-                title_el = link.select_one("h2.event-preview--title")
-                if not title_el:
-                    continue
-                seen_urls.add(href)
-
-                title = title_el.get_text(strip=True)
-
-                # Date
-                date_el = link.select_one("span.event-preview--date")
-                date_text = date_el.get_text(strip=True) if date_el else ""
-                start_date, time_str = self._parse_date(date_text)
-
-                # Skip past events
-                if start_date and start_date < date.today():
-                    continue
-
-                # Price / sold out
-                price_el = link.select_one("span.event-preview--price")
-                price_text = price_el.get_text(strip=True) if price_el else ""
-                is_free = "free" in price_text.lower()
-
-                # Description
-                desc_el = link.select_one("p.event-preview--description, div.event-preview--description")
-                description = desc_el.get_text(strip=True) if desc_el else ""
-
-                events.append(Event(
-                    title=title,
-                    venue=self.name,
-                    url=href,
-                    start_date=start_date,
-                    time=time_str,
-                    category="Literary event",
-                    is_free=is_free,
-                    area="Bloomsbury",
-                    description=description,
-                ))
-
-        except Exception as e:
-            self.logger.error(f"LRB Bookshop scrape failed: {e}")
-        return events
+    def pages(self) -> Iterator[tuple[str, None]]:
+        if not self.event_filter.category_ok(CATEGORY):
+            return
+
+        yield f"{self.base_url}/events", None
+
+    def parse(self, body: str, meta=None) -> Iterator[Event]:
+        soup = BeautifulSoup(body, "html.parser")
+        seen_urls = set()
+
+        for link in soup.select("a[href*='eventbrite']"):
+            href = link.get("href", "")
+            if href in seen_urls:
+                continue
+
+            # Only parse the "rich" link that has child elements
+            title_el = link.select_one("h2.event-preview--title")
+            if not title_el:
+                continue
+            seen_urls.add(href)
+
+            # Date
+            date_el = link.select_one("span.event-preview--date")
+            date_text = date_el.get_text(strip=True) if date_el else ""
+            start_date, time_str = self._parse_date(date_text)
+
+            # Skip past events
+            if not self.event_filter.date_ok(start_date):
+                continue
+
+            title = title_el.get_text(strip=True)
+            if not self.event_filter.title_ok(title):
+                continue
+
+            # Price / sold out
+            price_el = link.select_one("span.event-preview--price")
+            price_text = price_el.get_text(strip=True) if price_el else ""
+            is_free = "free" in price_text.lower()
+
+            # Description
+            desc_el = link.select_one("p.event-preview--description, div.event-preview--description")
+            description = desc_el.get_text(strip=True) if desc_el else ""
+
+            yield Event(
+                title=title,
+                venue=self.name,
+                url=href,
+                start_date=start_date,
+                time=time_str,
+                category=CATEGORY,
+                is_free=is_free,
+                area="Bloomsbury",
+                description=description,
+            )
 
     def _parse_date(self, text: str) -> tuple[date | None, str]:
         """Parse dates like 'Wednesday 18 February, 7 p.m.'"""
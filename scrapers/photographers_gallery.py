@@ -1,5 +1,6 @@
 import re
 from datetime import date, datetime
+from typing import Iterator
 
 from .base import BaseScraper, Event
 
@@ -11,60 +12,54 @@ INCLUDE_TYPES = {"Talks & Events", "Workshops & Courses", "Bookshop Event", "Tou
 class PhotographersGalleryScraper(BaseScraper):
     name = "Photographers' Gallery"
     base_url = "https://thephotographersgallery.org.uk"
+    card_selector = "article.o-event"
 
-    def scrape(self) -> list[Event]:
-        events = []
-        try:
-            soup = self._get(f"{self.base_url}/whats-on")
-            events.extend(self._parse_page(soup))
-        except Exception as e:
-            self.logger.error(f"Photographers' Gallery scrape failed: {e}")
-        return events
-
-    def _parse_page(self, soup) -> list[Event]:
-        events = []
-        for card in soup.select("article.o-event"):
-            # Category
-            type_el = card.select_one("span.o-teaser__post-type")
-            category = type_el.get_text(strip=True) if type_el else ""
-            if category and category not in INCLUDE_TYPES:
-                continue
-
-            # Title
-            title_el = card.select_one("a.o-teaser__link")
-            if not title_el:
-                continue
-            title = title_el.get_text(strip=True)
-            href = title_el.get("href", "")
-            if not title or not href:
-                continue
-
-            # Date
-            date_el = card.select_one("p.o-teaser__date")
-            date_text = date_el.get_text(strip=True) if date_el else ""
-            start_date, time_str = self._parse_date(date_text)
-
-            # Skip past events
-            if start_date and start_date < date.today():
-                continue
-
-            # Description
-            desc_el = card.select_one("p.o-teaser__body-text")
-            description = desc_el.get_text(strip=True)[:200] if desc_el else ""
-
-            url = f"{self.base_url}{href}" if not href.startswith("http") else href
-
-            events.append(Event(
-                title=title,
-                venue=self.name,
-                url=url,
-                start_date=start_date,
-                time=time_str,
-                description=description,
-                category=category,
-                area="Soho",
-            ))
-        return events
+    def pages(self) -> Iterator[tuple[str, None]]:
+        yield f"{self.base_url}/whats-on", None
+
+    def parse_card(self, card, meta=None) -> Event | None:
+        # Category
+        type_el = card.select_one("span.o-teaser__post-type")
+        category = type_el.get_text(strip=True) if type_el else ""
+        if category and category not in INCLUDE_TYPES:
+            return None
+        if not self.event_filter.category_ok(category):
+            return None
+
+        # Date
+        date_el = card.select_one("p.o-teaser__date")
+        date_text = date_el.get_text(strip=True) if date_el else ""
+        start_date, time_str = self._parse_date(date_text)
+
+        # Skip past events
+        if not self.event_filter.date_ok(start_date):
+            return None
+
+        # Title
+        title_el = card.select_one("a.o-teaser__link")
+        if not title_el:
+            return None
+        title = title_el.get_text(strip=True)
+        href = title_el.get("href", "")
+        if not title or not href or not self.event_filter.title_ok(title):
+            return None
+
+        # Description
+        desc_el = card.select_one("p.o-teaser__body-text")
+        description = desc_el.get_text(strip=True)[:200] if desc_el else ""
+
+        url = f"{self.base_url}{href}" if not href.startswith("http") else href
+
+        return Event(
+            title=title,
+            venue=self.name,
+            url=url,
+            start_date=start_date,
+            time=time_str,
+            description=description,
+            category=category,
+            area="Soho",
+        )
 
     def _parse_date(self, text: str) -> tuple[date | None, str]:
         """Parse dates like '6:30pm, Thu 19 Feb 2026' or '06 Feb 2026 - 19 Apr 2026'."""
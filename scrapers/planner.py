@@ -0,0 +1,79 @@
+"""Query planner — spend a fixed request budget on the searches that pay off.
+
+Every (search term, page) pair is an arm. After each fetch we record how
+many events it added that no earlier fetch in the run had already
+produced and that survived the filter, and keep a decayed average of
+that per arm across runs. Each run picks the best arms by an upper
+confidence bound (average plus a bonus that shrinks the more an arm has
+been tried), so untried terms get a go, dead ones are demoted but
+re-checked now and then, and a term's next page is only considered once
+its current last page keeps coming back productive.
+"""
+
+import json
+import logging
+import math
+from pathlib import Path
+
+logger = logging.getLogger("planner")
+
+# Weight of the latest run in an arm's average yield
+DECAY = 0.3
+
+# Exploration bonus scale, in events per request
+EXPLORE = 4.0
+
+# A page has to add at least this many events on average before the next page is tried
+NEXT_PAGE_YIELD = 5.0
+MAX_PAGES = 5
+
+
+class QueryPlanner:
+    def __init__(self, path: Path, budget: int):
+        self.path = path
+        self.budget = budget
+        self.arms: dict[str, dict] = {}  # "term|page" -> {"tries": n, "yield": avg}
+        self.runs = 0
+        if path.exists():
+            try:
+                data = json.loads(path.read_text())
+                self.arms = data.get("arms", {})
+                self.runs = data.get("runs", 0)
+            except (json.JSONDecodeError, OSError) as e:
+                logger.warning(f"Ignoring unreadable query stats {path}: {e}")
+
+    def _arm(self, term: str, page: int) -> dict:
+        return self.arms.get(f"{term}|{page}", {})
+
+    def _score(self, term: str, page: int) -> float:
+        arm = self._arm(term, page)
+        tries = arm.get("tries", 0)
+        if not tries:
+            return math.inf
+        return arm["yield"] + EXPLORE * math.sqrt(math.log(self.runs + 1) / tries)
+
+    def plan(self, terms: list[str]) -> list[tuple[str, int]]:
+        """The (term, page) fetches for this run, best first."""
+        candidates = []
+        for i, term in enumerate(terms):
+            page = 1
+            while True:
+                # Untried arms go in list order, so new terms are explored a few at a time
+                candidates.append((self._score(term, page), -i, -page, term, page))
+                arm = self._arm(term, page)
+                if page >= MAX_PAGES or arm.get("yield", 0) < NEXT_PAGE_YIELD:
+                    break
+                page += 1
+        candidates.sort(reverse=True)
+        return [(term, page) for *_, term, page in candidates[:self.budget]]
+
+    def record(self, term: str, page: int, added: int):
+        arm = self.arms.setdefault(f"{term}|{page}", {"tries": 0, "yield": 0.0})
+        arm["yield"] = added if not arm["tries"] else (1 - DECAY) * arm["yield"] + DECAY * added
+        arm["tries"] += 1
+
+    def save(self):
+        self.runs += 1
+        self.path.parent.mkdir(exist_ok=True)
+        data = {"runs": self.runs, "arms": self.arms}
+        self.path.write_text(json.dumps(data, indent=2, sort_keys=True))
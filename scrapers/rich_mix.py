@@ -1,5 +1,6 @@
 import re
 from datetime import date, datetime
+from typing import Iterator
 
 from .base import BaseScraper, Event
 
@@ -7,62 +8,59 @@ from .base import BaseScraper, Event
 class RichMixScraper(BaseScraper):
     name = "Rich Mix"
     base_url = "https://richmix.org.uk"
+    card_selector = "div.tease"
 
-    def scrape(self) -> list[Event]:
-        events = []
-        try:
-            soup = self._get(f"{self.base_url}/whats-on/this-week")
-            events.extend(self._parse_page(soup))
-
-            # Also get next week
-            soup2 = self._get(f"{self.base_url}/whats-on/next-week")
-            events.extend(self._parse_page(soup2))
-        except Exception as e:
-            self.logger.error(f"Rich Mix scrape failed: {e}")
-        return events
-
-    def _parse_page(self, soup) -> list[Event]:
-        events = []
-        for tease in soup.select("div.tease"):
-            title_el = tease.select_one("h3 a")
-            if not title_el:
-                continue
-
-            title = title_el.get_text(strip=True)
-            href = title_el.get("href", "")
-
-            # Category
-            cat_el = tease.select_one("span.category")
-            category = cat_el.get_text(strip=True) if cat_el else ""
-
-            # Skip music, cinema, performance, and family events
-            cat_lower = category.lower()
-            if cat_lower in ("families", "kids", "children", "music", "cinema", "live events", "gigs"):
-                continue
-
-            # Date
-            date_el = tease.select_one("span.date")
-            date_text = date_el.get_text(strip=True) if date_el else ""
-            event_date = self._parse_date(date_text) if date_text else None
-
-            # Free?
-            is_free = bool(tease.select_one("span.flag"))
-
-            # Description
-            desc_el = tease.select_one("p.description, div.description, p.excerpt, div.excerpt")
-            description = desc_el.get_text(strip=True) if desc_el else ""
-
-            events.append(Event(
-                title=title,
-                venue=self.name,
-                url=href,
-                start_date=event_date,
-                category=category,
-                is_free=is_free,
-                area="Shoreditch",
-                description=description,
-            ))
-        return events
+    def pages(self) -> Iterator[tuple[str, None]]:
+        yield f"{self.base_url}/whats-on/this-week", None
+
+        # Also get next week
+        yield f"{self.base_url}/whats-on/next-week", None
+
+    def parse_card(self, tease, meta=None) -> Event | None:
+        title_el = tease.select_one("h3 a")
+        if not title_el:
+            return None
+
+        # Category
+        cat_el = tease.select_one("span.category")
+        category = cat_el.get_text(strip=True) if cat_el else ""
+
+        # Skip music, cinema, performance, and family events
+        cat_lower = category.lower()
+        if cat_lower in ("families", "kids", "children", "music", "cinema", "live events", "gigs"):
+            return None
+        if not self.event_filter.category_ok(category):
+            return None
+
+        # Date
+        date_el = tease.select_one("span.date")
+        date_text = date_el.get_text(strip=True) if date_el else ""
+        event_date = self._parse_date(date_text) if date_text else None
+        if not self.event_filter.date_ok(event_date):
+            return None
+
+        title = title_el.get_text(strip=True)
+        if not self.event_filter.title_ok(title):
+            return None
+        href = title_el.get("href", "")
+
+        # Free?
+        is_free = bool(tease.select_one("span.flag"))
+
+        # Description
+        desc_el = tease.select_one("p.description, div.description, p.excerpt, div.excerpt")
+        description = desc_el.get_text(strip=True) if desc_el else ""
+
+        return Event(
+            title=title,
+            venue=self.name,
+            url=href,
+            start_date=event_date,
+            category=category,
+            is_free=is_free,
+            area="Shoreditch",
+            description=description,
+        )
 
     def _parse_date(self, text: str) -> date | None:
         """Parse dates like 'SUN 25 JAN', 'FRI 14 FEB', or ranges 'WED 10 DEC - SAT 28 FEB'."""
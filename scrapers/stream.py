@@ -0,0 +1,78 @@
+"""Incremental card extraction — listing cards out of an HTML stream as they close.
+
+CardStream is fed decoded chunks of a page. It looks for the card's
+opening tag, follows nested tags of the same name to find where the card
+closes, and only then parses that slice of markup on its own. Text
+before a card is dropped as soon as it has been scanned, so only the
+current card and one chunk are held however long the page is.
+
+Finding boundaries is plain string searching rather than a full HTML
+tokenizer, which keeps the page from being tokenised twice; it assumes
+card tags don't appear inside comments or scripts, as on every listing
+we scrape.
+"""
+
+import re
+
+from bs4 import BeautifulSoup
+
+# Longest opening tag we expect; this much unscanned text is kept between chunks
+MAX_TAG = 4096
+
+
+class CardStream:
+    """Feed it text; cards() returns the cards (as bs4 Tags) completed so far.
+
+    selector is "tag.class", the same shape as the card selectors the
+    scrapers pass to soup.select().
+    """
+
+    def __init__(self, selector: str):
+        self.tag, _, cls = selector.partition(".")
+        class_re = rf"""\bclass\s*=\s*["']?[^"'>]*(?<![\w-]){re.escape(cls)}(?![\w-])""" if cls else ""
+        self._start = re.compile(rf"<{self.tag}\b[^>]*{class_re}[^>]*>", re.I)
+        # Any opening or closing tag with the card's name, to track nesting
+        self._same = re.compile(rf"<(/?){self.tag}\b[^>]*>", re.I)
+        self._buf = ""
+        self._card_start = -1  # offset of the open card in _buf, if any
+        self._depth = 0
+        self._scan = 0  # where to resume scanning _buf
+        self._done = []
+
+    def feed(self, text: str):
+        self._buf += text
+        while True:
+            if self._card_start < 0:
+                m = self._start.search(self._buf, self._scan)
+                if not m:
+                    # Keep enough of the tail for an opening tag split across chunks
+                    keep = max(self._scan, len(self._buf) - MAX_TAG)
+                    self._buf, self._scan = self._buf[keep:], 0
+                    return
+                self._buf = self._buf[m.start():]
+                self._card_start, self._depth, self._scan = 0, 1, m.end() - m.start()
+
+            m = self._same.search(self._buf, self._scan)
+            while m:
+                self._depth += -1 if m.group(1) else 1
+                self._scan = m.end()
+                if not self._depth:
+                    break
+                m = self._same.search(self._buf, self._scan)
+            if self._depth:
+                # The card hasn't closed yet; rescan only the tail next time
+                self._scan = max(self._scan, len(self._buf) - MAX_TAG)
+                return
+
+            markup = self._buf[:self._scan]
+            self._buf, self._scan, self._card_start = self._buf[self._scan:], 0, -1
+            card = BeautifulSoup(markup, "html.parser").find(self.tag)
+            if card is not None:
+                self._done.append(card)
+
+    def close(self):
+        self._buf = ""
+
+    def cards(self) -> list:
+        done, self._done = self._done, []
+        return done
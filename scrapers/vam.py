@@ -1,5 +1,8 @@
 import re
 from datetime import date, datetime
+from typing import Iterator
+
+from bs4 import BeautifulSoup
 
 from .base import BaseScraper, Event
 
@@ -12,27 +15,24 @@ class VAMScraper(BaseScraper):
     name = "V&A"
     base_url = "https://www.vam.ac.uk"
 
-    def scrape(self) -> list[Event]:
-        events = []
-        try:
-            soup = self._get(f"{self.base_url}/whatson")
-            seen_hrefs = set()
+    def pages(self) -> Iterator[tuple[str, None]]:
+        yield f"{self.base_url}/whatson", None
 
-            # Featured events
-            for card in soup.select("[class*='b-events-featured']"):
-                event = self._parse_featured(card, seen_hrefs)
-                if event:
-                    events.append(event)
+    def parse(self, body: str, meta=None) -> Iterator[Event]:
+        soup = BeautifulSoup(body, "html.parser")
+        seen_hrefs = set()
 
-            # Regular teasers
-            for card in soup.select("a[href*='/event/']"):
-                event = self._parse_teaser(card, seen_hrefs)
-                if event:
-                    events.append(event)
+        # Featured events
+        for card in soup.select("[class*='b-events-featured']"):
+            event = self._parse_featured(card, seen_hrefs)
+            if event:
+                yield event
 
-        except Exception as e:
-            self.logger.error(f"V&A scrape failed: {e}")
-        return events
+        # Regular teasers
+        for card in soup.select("a[href*='/event/']"):
+            event = self._parse_teaser(card, seen_hrefs)
+            if event:
+                yield event
 
     def _parse_featured(self, card, seen_hrefs) -> Event | None:
         link = card.select_one("a[href*='/event/']")
@@ -43,21 +43,23 @@ class VAMScraper(BaseScraper):
             return None
         seen_hrefs.add(href)
 
-        title_el = card.select_one("h3.b-events-featured__title")
-        title = title_el.get_text(strip=True) if title_el else ""
-        if not title:
-            return None
-
         type_el = card.select_one("p.b-events-featured__type")
         event_type = type_el.get_text(strip=True).lower() if type_el else ""
         if event_type and event_type not in INCLUDE_TYPES:
             return None
+        category = event_type.title() if event_type else ""
+        if not self.event_filter.category_ok(category):
+            return None
 
         date_el = card.select_one("p.b-events-featured__date")
         date_text = date_el.get_text(strip=True) if date_el else ""
         start_date = self._parse_date(date_text)
+        if not self.event_filter.date_ok(start_date):
+            return None
 
-        if start_date and start_date < date.today():
+        title_el = card.select_one("h3.b-events-featured__title")
+        title = title_el.get_text(strip=True) if title_el else ""
+        if not title or not self.event_filter.title_ok(title):
             return None
 
         venue_el = card.select_one("p.b-events-featured__venue")
@@ -73,7 +75,7 @@ class VAMScraper(BaseScraper):
             venue=self.name,
             url=url,
             start_date=start_date,
-            category=event_type.title() if event_type else "",
+            category=category,
             area=area,
             description=description,
         )
@@ -86,25 +88,28 @@ class VAMScraper(BaseScraper):
             return None
         seen_hrefs.add(href)
 
-        title_el = card.select_one("h2.b-event-teaser__title")
-        title = title_el.get_text(strip=True) if title_el else ""
-        if not title:
-            return None
-
         type_el = card.select_one("div.b-event-teaser__type")
         event_type = type_el.get_text(strip=True).lower() if type_el else ""
         if event_type and event_type not in INCLUDE_TYPES:
             return None
+        category = event_type.title() if event_type else ""
+        if not self.event_filter.category_ok(category):
+            return None
 
         # Date and venue from icon list items
         icon_items = card.select("p.b-icon-list__item-text")
         date_text = icon_items[0].get_text(strip=True) if len(icon_items) > 0 else ""
-        area = icon_items[1].get_text(strip=True) if len(icon_items) > 1 else "South Kensington"
-
         start_date = self._parse_date(date_text)
-        if start_date and start_date < date.today():
+        if not self.event_filter.date_ok(start_date):
             return None
 
+        title_el = card.select_one("h2.b-event-teaser__title")
+        title = title_el.get_text(strip=True) if title_el else ""
+        if not title or not self.event_filter.title_ok(title):
+            return None
+
+        area = icon_items[1].get_text(strip=True) if len(icon_items) > 1 else "South Kensington"
+
         # Description
         desc_el = card.select_one("p.b-event-teaser__description, p.b-event-teaser__intro, div.b-event-teaser__summary")
         description = desc_el.get_text(strip=True) if desc_el else ""
@@ -116,7 +121,7 @@ class VAMScraper(BaseScraper):
             venue=self.name,
             url=url,
             start_date=start_date,
-            category=event_type.title() if event_type else "",
+            category=category,
             area=area,
             description=description,
         )
@@ -1,5 +1,6 @@
 import json
-from datetime import date, datetime
+from datetime import datetime
+from typing import Iterator
 
 from .base import BaseScraper, Event
 
@@ -8,66 +9,61 @@ class WellcomeScraper(BaseScraper):
     name = "Wellcome Collection"
     base_url = "https://api.wellcomecollection.org/content/v0"
 
-    def scrape(self) -> list[Event]:
-        events = []
-        try:
-            import time
-            time.sleep(1)
-            url = (
-                f"{self.base_url}/events"
-                "?format=%21exhibitions"
-                "&timespan=future"
-                "&sort=times.startDateTime"
-                "&sortOrder=asc"
-                "&pageSize=25"
-            )
-            resp = self.session.get(url, timeout=15)
-            resp.raise_for_status()
-            data = resp.json()
+    def pages(self) -> Iterator[tuple[str, None]]:
+        url = (
+            f"{self.base_url}/events"
+            "?format=%21exhibitions"
+            "&timespan=future"
+            "&sort=times.startDateTime"
+            "&sortOrder=asc"
+            "&pageSize=25"
+        )
+        yield url, None
 
-            for item in data.get("results", []):
-                title = item.get("title", "")
-                uid = item.get("uid", "")
-                if not title or not uid:
-                    continue
+    def parse(self, body: str, meta=None) -> Iterator[Event]:
+        data = json.loads(body)
 
-                # Format/category
-                fmt = item.get("format", {})
-                fmt_label = fmt.get("label", "") if fmt else ""
+        for item in data.get("results", []):
+            # Format/category
+            fmt = item.get("format", {})
+            fmt_label = fmt.get("label", "") if fmt else ""
+            if not self.event_filter.category_ok(fmt_label):
+                continue
 
-                # First future time
-                start_date = None
-                time_str = ""
-                for t in item.get("times", []):
-                    start_str = t.get("startDateTime", "")
-                    if start_str:
-                        dt = datetime.fromisoformat(start_str.replace("Z", "+00:00"))
-                        if dt.date() >= date.today():
-                            start_date = dt.date()
-                            time_str = dt.strftime("%-I:%M%p").lower()
-                            break
+            # First future time
+            start_date = None
+            time_str = ""
+            for t in item.get("times", []):
+                start_str = t.get("startDateTime", "")
+                if start_str:
+                    dt = datetime.fromisoformat(start_str.replace("Z", "+00:00"))
+                    if self.event_filter.date_ok(dt.date()):
+                        start_date = dt.date()
+                        time_str = dt.strftime("%-I:%M%p").lower()
+                        break
 
-                if not start_date:
-                    continue
+            if not start_date:
+                continue
 
-                event_url = f"https://wellcomecollection.org/events/{uid}"
+            title = item.get("title", "")
+            uid = item.get("uid", "")
+            if not title or not uid or not self.event_filter.title_ok(title):
+                continue
 
-                # Description from promo text
-                promo = item.get("promo", {})
-                description = promo.get("caption", "") if promo else ""
+            event_url = f"https://wellcomecollection.org/events/{uid}"
 
-                events.append(Event(
-                    title=title,
-                    venue=self.name,
-                    url=event_url,
-                    start_date=start_date,
-                    time=time_str,
-                    category=fmt_label,
-                    is_free=True,  # Wellcome events are almost all free
-                    area="Euston",
-                    description=description,
-                ))
+            # Description from promo text
+            promo = item.get("promo", {})
+            description = promo.get("caption", "") if promo else ""
 
-        except Exception as e:
-            self.logger.error(f"Wellcome scrape failed: {e}")
-        return events
+            yield Event(
+                title=title,
+                venue=self.name,
+                url=event_url,
+                start_date=start_date,
+                time=time_str,
+                category=fmt_label,
+                is_free=True,  # Wellcome events are almost all free
+                area="Euston",
+                description=description,
+            )
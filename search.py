@@ -0,0 +1,87 @@
+"""Search index for the static page — a sharded inverted index the page fetches on demand.
+
+Titles, descriptions, venues and areas are split into words, folded to
+plain lower-case ASCII and lightly stemmed (plurals, -ing, -ed), and
+each term maps to the positions on the page of the events that contain
+it. Postings are delta-encoded. Terms are sharded by first character
+into output/search/<c>.json and sorted within a shard, so a query only
+downloads the shards for the letters it uses, and the page finds every
+term starting with a prefix by binary search.
+
+The page's script repeats tokenize() and stem() in JavaScript, so
+changes here need making there too.
+"""
+
+import hashlib
+import json
+import re
+import unicodedata
+from pathlib import Path
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "into", "is",
+    "it", "its", "of", "on", "or", "the", "this", "to", "with", "you", "your",
+}
+
+
+def tokenize(text: str) -> list[str]:
+    folded = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode().lower()
+    return [w for w in re.findall(r"[a-z0-9]+", folded) if len(w) > 1 and w not in STOPWORDS]
+
+
+def stem(word: str) -> str:
+    """Strip one common English suffix, leaving at least three letters."""
+    if len(word) <= 3 or word.isdigit():
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith("sses"):
+        return word[:-2]
+    if word.endswith(("ss", "us", "is")):
+        return word
+    if word.endswith("s"):
+        return word[:-1]
+    if word.endswith("ing") and len(word) >= 6:
+        return word[:-3]
+    if word.endswith("ed") and len(word) >= 5:
+        return word[:-2]
+    return word
+
+
+def _text(e) -> str:
+    return " ".join((e.title, e.description, e.venue, e.area))
+
+
+def build_index(events) -> dict[str, dict[str, list[int]]]:
+    """shard -> term -> ascending event positions."""
+    postings: dict[str, list[int]] = {}
+    stems: dict[str, str] = {}  # the same few thousand words recur across events
+    for i, e in enumerate(events):
+        for term in {stems.get(w) or stems.setdefault(w, stem(w)) for w in tokenize(_text(e))}:
+            postings.setdefault(term, []).append(i)
+    shards: dict[str, dict[str, list[int]]] = {}
+    for term, positions in postings.items():
+        shards.setdefault(term[0], {})[term] = positions
+    return shards
+
+
+def _encode(postings: list[int]) -> list[int]:
+    return [p - q for p, q in zip(postings, [0] + postings)]
+
+
+def write_index(shards: dict[str, dict[str, list[int]]], directory: Path) -> str:
+    """Write one file per shard (and remove stale ones). Returns a version for cache-busting."""
+    directory.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.blake2b(digest_size=6)
+    for old in directory.glob("*.json"):
+        if old.stem not in shards:
+            old.unlink()
+    for key, terms in sorted(shards.items()):
+        ordered = sorted(terms)
+        body = json.dumps(
+            {"terms": ordered, "postings": [_encode(terms[t]) for t in ordered]},
+            separators=(",", ":"),
+        )
+        digest.update(body.encode())
+        (directory / f"{key}.json").write_text(body)
+    return digest.hexdigest()
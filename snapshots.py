@@ -0,0 +1,146 @@
+"""Last-known-good snapshots — a failed source falls back to its previous good result.
+
+Every source that finishes cleanly has its kept events written to
+data/snapshots/<source>.json. A source that times out, yields nothing,
+hits any error along the way (a page that wouldn't load or parse) or
+comes back with under half of its snapshot's upcoming events keeps
+whatever it did produce, topped up with the still-upcoming events from
+its snapshot, marked stale. The snapshot itself is left alone, so
+repeated failures keep serving the same last good result until the
+events in it are over.
+"""
+
+import json
+import logging
+import re
+from datetime import date, datetime
+from pathlib import Path
+
+import pipeline
+from scrapers.base import Event, to_record
+
+logger = logging.getLogger("snapshots")
+
+# A result with fewer than this share of the snapshot's upcoming events is taken as a partial failure
+MIN_SHARE = 0.5
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+
+def _dump(e) -> list:
+    return [v.isoformat() if isinstance(v, date) else v for v in to_record(e)]
+
+
+def _load(row: list) -> Event:
+    start, end = (date.fromisoformat(d) if d else None for d in row[3:5])
+    return Event(*row[:3], start, end, *row[5:])
+
+
+def _key(e) -> tuple:
+    return (e.title.lower().strip(), e.start_date)
+
+
+class SnapshotStore:
+    """Snapshots in one directory; keep decides which snapshot events are still worth serving."""
+
+    def __init__(self, directory: Path, keep=None):
+        self.directory = directory
+        self.keep = keep or (lambda e: True)
+        self.stale: dict[str, str] = {}  # source -> when its snapshot was taken, for this run
+        self._replayed: set[str] = set()
+
+    def _path(self, name: str) -> Path:
+        return self.directory / f"{_slug(name)}.json"
+
+    def _read(self, name: str) -> dict:
+        path = self._path(name)
+        if not path.exists():
+            return {}
+        try:
+            return json.loads(path.read_text())
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Ignoring unreadable snapshot {path}: {e}")
+            return {}
+
+    def _write(self, name: str, snapshot: dict):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(name)
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(snapshot, separators=(",", ":")))
+        tmp.replace(path)
+
+    def save(self, name: str, events: list):
+        self._write(name, {
+            "source": name,
+            "taken": datetime.now().isoformat(timespec="seconds"),
+            "stale": False,
+            "events": [_dump(e) for e in events],
+        })
+
+    def events(self, name: str) -> list:
+        """The snapshot's events, marked stale if the source has failed since it was taken."""
+        snapshot = self._read(name)
+        events = [_load(row) for row in snapshot.get("events", [])]
+        for e in events:
+            e.stale = snapshot.get("stale", False)
+        return events
+
+    def names(self) -> list[str]:
+        if not self.directory.exists():
+            return []
+        return sorted(self._read(p.stem).get("source", p.stem) for p in self.directory.glob("*.json"))
+
+    def replay(self, name: str) -> pipeline.Source:
+        """A pipeline source that yields a snapshot instead of scraping."""
+        self._replayed.add(name)
+        snapshot = self._read(name)
+        if snapshot.get("stale"):
+            self.stale[name] = snapshot.get("taken", "")
+        return pipeline.Source(name, lambda: iter(self.events(name)))
+
+    def mark_stale(self, name: str) -> dict:
+        """Record that a source failed and its snapshot is standing in. Returns the snapshot, if any."""
+        snapshot = self._read(name)
+        if not snapshot:
+            return snapshot
+        if not snapshot.get("stale"):
+            snapshot["stale"] = True
+            self._write(name, snapshot)
+        self.stale[name] = snapshot.get("taken", "")
+        return snapshot
+
+    def _failure(self, source: pipeline.Source, events: list, timed_out: bool) -> str:
+        """Why a finished source's result can't be trusted as complete, or "" if it can."""
+        if timed_out:
+            return "timed out"
+        if not events:
+            return "came back empty"
+        stats = getattr(source.scraper, "stats", None)
+        if stats and stats.errors:
+            return f"hit errors ({', '.join(sorted(stats.errors))})"
+        upcoming = sum(1 for e in self.events(source.name) if self.keep(e))
+        if len(events) < upcoming * MIN_SHARE:
+            return f"found {len(events)} of its snapshot's {upcoming} upcoming events"
+        return ""
+
+    def settle(self, source: pipeline.Source, events: list, timed_out: bool) -> list:
+        """A finished source's events: saved as its snapshot if it succeeded, topped up from it if not."""
+        if source.name in self._replayed:
+            return events
+        failure = self._failure(source, events, timed_out)
+        if not failure:
+            self.save(source.name, events)
+            self.stale.pop(source.name, None)
+            return events
+
+        snapshot = self.mark_stale(source.name)
+        if not snapshot:
+            return events
+
+        # Only what the source didn't manage to produce itself, and hasn't happened yet
+        fresh = {_key(e) for e in events}
+        fallback = [e for e in self.events(source.name) if self.keep(e) and _key(e) not in fresh]
+        logger.warning(f"{source.name} {failure}; serving {len(fallback)} events from its {snapshot['taken']} snapshot")
+        return events + fallback
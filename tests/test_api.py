@@ -0,0 +1,80 @@
+import http.client
+import json
+import threading
+from datetime import date, datetime, timezone
+from email.utils import format_datetime
+
+import pytest
+
+import api
+from feeds import FeedWriter
+from scrapers.base import Event
+
+
+def _record(i):
+    return {"title": f"Talk {i}", "venue": "Barbican", "url": f"https://example.com/{i}",
+            "start_date": date(2099, 1, 1 + i).isoformat(), "end_date": None, "time": "19:00",
+            "description": "", "category": "Talk", "is_free": False, "area": "Barbican"}
+
+
+@pytest.fixture
+def server(tmp_path):
+    path = tmp_path / "events.json"
+    path.write_text(json.dumps([_record(i) for i in range(7)]))
+    feeds = FeedWriter(tmp_path / "calendar", tmp_path / "feeds.json")
+    srv = api.serve(api.EventStore(path, category_of=lambda e: e.category), port=0, feeds=feeds)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv, path, feeds
+    srv.shutdown()
+
+
+def _get(srv, url, headers=None):
+    conn = http.client.HTTPConnection("127.0.0.1", srv.server_port)
+    conn.request("GET", url, headers=headers or {})
+    resp = conn.getresponse()
+    body = resp.read()
+    conn.close()
+    return resp, json.loads(body) if body and resp.getheader("Content-Type") == "application/json" else body
+
+
+def test_cursor_pages_through_every_event_once(server):
+    srv, _, _ = server
+    urls, cursor = [], ""
+    while True:
+        resp, body = _get(srv, "/events?limit=3" + (f"&cursor={cursor}" if cursor else ""))
+        assert resp.status == 200 and body["total"] == 7 - len(urls)
+        urls += [e["url"] for e in body["events"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert urls == [f"https://example.com/{i}" for i in range(7)]
+
+
+def test_cursor_from_older_data_is_rejected(server):
+    srv, path, _ = server
+    _, body = _get(srv, "/events?limit=3")
+    path.write_text(json.dumps([_record(i) for i in range(8)]))
+    resp, error = _get(srv, f"/events?limit=3&cursor={body['next_cursor']}")
+    assert resp.status == 400
+    assert "older version" in error["error"]
+
+
+def test_unchanged_query_gets_304(server):
+    srv, _, _ = server
+    resp, _ = _get(srv, "/events?venue=Barbican")
+    etag = resp.getheader("ETag")
+    assert _get(srv, "/events?venue=Barbican", {"If-None-Match": etag})[0].status == 304
+    # A different query is a different resource
+    assert _get(srv, "/events?venue=ICA", {"If-None-Match": etag})[0].status == 200
+
+
+def test_calendar_feed_honours_if_modified_since(server):
+    srv, _, feeds = server
+    feeds.write_all([Event("Talk", "Barbican", "https://example.com/t", date(2099, 1, 1), category="Talk")])
+    resp, _ = _get(srv, "/calendar/all.ics")
+    assert resp.status == 200 and resp.getheader("Content-Type").startswith("text/calendar")
+    modified = resp.getheader("Last-Modified")
+    assert _get(srv, "/calendar/all.ics", {"If-Modified-Since": modified})[0].status == 304
+    assert _get(srv, "/calendar/all.ics", {"If-None-Match": resp.getheader("ETag")})[0].status == 304
+    earlier = format_datetime(datetime(2000, 1, 1, tzinfo=timezone.utc), usegmt=True)
+    assert _get(srv, "/calendar/all.ics", {"If-Modified-Since": earlier})[0].status == 200
@@ -0,0 +1,75 @@
+import threading
+import time
+from datetime import timedelta
+
+from scrapers.base import BaseScraper
+
+
+class FakeResponse:
+    status_code = 200
+    content = b"<html></html>"
+    elapsed = timedelta(seconds=0.1)
+
+    def close(self):
+        pass
+
+
+class SlowFirstSession:
+    """The first request answers late, every later one at once."""
+
+    def __init__(self, first_delay):
+        self.first_delay = first_delay
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def get(self, url, timeout, stream):
+        with self.lock:
+            self.calls += 1
+            first = self.calls == 1
+        if first:
+            time.sleep(self.first_delay)
+        return FakeResponse()
+
+
+def _scraper(session, hedge_after):
+    scraper = BaseScraper()
+    scraper.name = "Test"
+    scraper.session = session
+    scraper.hedge_after = hedge_after
+    return scraper
+
+
+def test_hedged_request_counts_once():
+    scraper = _scraper(SlowFirstSession(0.3), hedge_after=0.05)
+    scraper._send("https://example.com/", stream=False)
+    time.sleep(0.4)  # let the slow first attempt finish too
+    assert scraper.session.calls == 2
+    assert scraper.stats.hedged == 1
+    assert scraper.stats.requests == 1
+    assert scraper.stats.bytes == len(FakeResponse.content)
+
+
+def test_prompt_answer_is_not_hedged():
+    scraper = _scraper(SlowFirstSession(0), hedge_after=0.05)
+    for _ in range(5):
+        scraper._send("https://example.com/", stream=False)
+    time.sleep(0.1)
+    assert scraper.session.calls == 5
+    assert scraper.stats.hedged == 0
+
+
+def test_request_threads_do_not_pile_up():
+    scraper = _scraper(SlowFirstSession(0), hedge_after=None)
+    before = threading.active_count()
+    for _ in range(20):
+        scraper._send("https://example.com/", stream=False)
+    time.sleep(0.1)
+    assert threading.active_count() <= before + 1
+    assert scraper.stats.requests == 20
+
+
+def test_body_download_counts_as_http_time():
+    # FakeResponse.elapsed says the headers took 0.1s; the whole GET takes 0.3s
+    scraper = _scraper(SlowFirstSession(0.3), hedge_after=None)
+    scraper._send("https://example.com/", stream=False)
+    assert scraper.stats.http_seconds >= 0.3
@@ -0,0 +1,25 @@
+from datetime import date
+
+import numpy as np
+
+from scrapers import EventBatch, EventFilter
+from scrapers.base import Event
+
+EVENTS = [
+    Event("Artist Talk", "Barbican", "https://a", date(2099, 3, 1)),
+    Event("Jazz Concert", "Barbican", "https://b", date(2099, 3, 2)),
+]
+
+
+def test_no_words_match_nothing():
+    batch = EventBatch(EVENTS)
+    assert not batch.title_contains([]).any()
+    assert not batch.title_contains([""]).any()
+
+
+def test_title_contains_agrees_with_title_ok():
+    batch = EventBatch(EVENTS)
+    for words in ([], [""], ["concert"], ["", "talk"]):
+        keep = EventFilter(title_words=tuple(words))
+        expected = np.array([not keep.title_ok(e.title) for e in EVENTS])
+        assert (batch.title_contains(words) == expected).all(), words
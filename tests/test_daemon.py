@@ -0,0 +1,37 @@
+from datetime import date
+
+import pipeline
+from daemon import Daemon
+from metrics import Metrics
+from scrapers.base import Event, SourceStats
+
+
+class FakeScraper:
+    name = "Barbican"
+
+    def __init__(self):
+        self.stats = SourceStats()
+
+
+def test_metrics_cover_one_tick_only():
+    metrics = Metrics()
+    clock = [0.0]
+    scraper = FakeScraper()
+
+    def events():
+        scraper.stats.requests += 1
+        yield Event("Artist Talk", "Barbican", "https://a", date(2099, 3, 1))
+
+    def on_done(source, count, seconds, timed_out):
+        metrics.record_source(source.scraper, count, seconds, timed_out)
+        metrics.stages["ticks"] = metrics.stages.get("ticks", 0) + 1
+
+    service = Daemon(
+        [pipeline.Source("Barbican", events, scraper)], {}, 10, lambda today: lambda e: True, lambda events: None,
+        on_done=on_done, on_tick=metrics.reset, clock=lambda: clock[0],
+    )
+    for _ in range(3):
+        service.tick()
+        clock[0] += 11
+    assert metrics.sources["Barbican"]["requests"] == 1
+    assert metrics.stages == {"ticks": 1}
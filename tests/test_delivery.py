@@ -0,0 +1,74 @@
+from delivery import LocalTransport, Outbox, deliver, load_subscribers
+
+
+def _mailed(root):
+    return sorted(p.read_text().split(" |")[0].removeprefix("<!-- To: ") for p in root.glob("*.html"))
+
+
+def test_subscriber_added_after_send_is_mailed(tmp_path):
+    outbox = Outbox(tmp_path / "outbox")
+    transport = LocalTransport(tmp_path / "sent")
+    outbox.enqueue("2026-W42", [("a@example.com", "Digest", "<p>a</p>"), ("b@example.com", "Digest", "<p>b</p>")])
+    assert deliver(outbox, transport, backoff=0) == (2, 0)
+
+    # A rerun the same week with one more subscriber only mails the newcomer
+    outbox = Outbox(tmp_path / "outbox")
+    queued = outbox.enqueue("2026-W42", [
+        ("a@example.com", "Digest", "<p>a</p>"),
+        ("b@example.com", "Digest", "<p>b</p>"),
+        ("c@example.com", "Digest", "<p>c</p>"),
+    ])
+    assert queued == 1
+    assert deliver(outbox, transport, backoff=0) == (1, 0)
+    assert _mailed(tmp_path / "sent") == ["a@example.com", "b@example.com", "c@example.com"]
+
+
+def test_resumed_batch_reuses_its_key(tmp_path):
+    outbox = Outbox(tmp_path / "outbox")
+    outbox.enqueue("2026-W42", [("a@example.com", "Digest", "<p>a</p>")])
+    transport = LocalTransport(tmp_path / "sent")
+
+    def crash(*args):
+        raise OSError("disk full")
+
+    # The batch goes out but recording it fails, so it ends up dead-lettered
+    outbox.mark_sent = crash
+    assert deliver(outbox, transport, max_attempts=1, backoff=0) == (0, 1)
+
+    outbox = Outbox(tmp_path / "outbox")
+    outbox.retry_failed()
+    assert deliver(outbox, transport, backoff=0) == (1, 0)
+    assert len(transport._seen) == 1
+
+
+class FlakyTransport(LocalTransport):
+    """Fails the next `failures` sends, then behaves."""
+
+    def __init__(self, root, failures):
+        super().__init__(root)
+        self.failures = failures
+
+    def send_batch(self, payloads, idempotency_key):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("injected")
+        return super().send_batch(payloads, idempotency_key)
+
+
+def test_retried_batch_gets_its_attempts_back(tmp_path):
+    outbox = Outbox(tmp_path / "outbox")
+    outbox.enqueue("2026-W42", [("a@example.com", "Digest", "<p>a</p>")])
+    transport = FlakyTransport(tmp_path / "sent", failures=3)
+    assert deliver(outbox, transport, max_attempts=2, backoff=0) == (0, 1)
+
+    # Fails once more next run, which a fresh set of attempts rides out
+    outbox = Outbox(tmp_path / "outbox")
+    outbox.retry_failed()
+    assert deliver(outbox, transport, max_attempts=2, backoff=0) == (1, 0)
+
+
+def test_digest_email_fallback_only_when_allowed(tmp_path, monkeypatch):
+    monkeypatch.setenv("DIGEST_EMAIL", "me@example.com")
+    missing = tmp_path / "subscribers.json"
+    assert [s.email for s in load_subscribers(missing)] == ["me@example.com"]
+    assert load_subscribers(missing, env_fallback=False) == []
@@ -0,0 +1,41 @@
+import json
+from datetime import date
+
+from delta import CHANGED, SentLog
+from scrapers.base import Event
+
+TODAY = date(2099, 3, 1)
+
+
+def _event(**changes):
+    fields = dict(title="Artist Talk", venue="Barbican", url="https://a", start_date=date(2099, 3, 20),
+                  time="7pm", description="An evening with the artist.")
+    return Event(**{**fields, **changes})
+
+
+def _sent(tmp_path, event):
+    log = SentLog(tmp_path / "sent.json", TODAY)
+    fps = log.fingerprint([event])
+    log.record("a@example.com", [(0, "")], fps)
+    log.save()
+    return SentLog(tmp_path / "sent.json", TODAY)
+
+
+def test_description_change_is_not_an_update(tmp_path):
+    log = _sent(tmp_path, _event())
+    edited = [_event(description="An evening with the artist, now with a reading.")]
+    assert log.pick("a@example.com", [0], log.fingerprint(edited), 10) == []
+
+
+def test_time_change_is_an_update(tmp_path):
+    log = _sent(tmp_path, _event())
+    moved = [_event(time="8pm")]
+    assert log.pick("a@example.com", [0], log.fingerprint(moved), 10) == [(0, CHANGED)]
+
+
+def test_hashes_from_an_older_format_are_not_updates(tmp_path):
+    log = _sent(tmp_path, _event())
+    path = tmp_path / "sent.json"
+    path.write_text(json.dumps(json.loads(path.read_text())["recipients"]))
+    log = SentLog(path, TODAY)
+    assert log.pick("a@example.com", [0], log.fingerprint([_event(time="8pm")]), 10) == []
@@ -0,0 +1,24 @@
+from datetime import date
+
+from digest import EventIndex, Preferences
+from scrapers.base import Event
+
+
+def _index():
+    events = [
+        Event("Artist Talk", "Barbican", "https://a", date(2099, 3, 2), category="Talk", area="Barbican"),
+        Event("Print Workshop", "Studio", "https://b", date(2099, 3, 3), category="Workshop", area="Hackney"),
+    ]
+    return EventIndex(events, category_of=lambda e: e.category + "s", source_of=lambda e: e.venue)
+
+
+def test_venue_and_category_match_any_case():
+    index = _index()
+    assert index.select(Preferences(venues=["barbican"])) == 0b01
+    assert index.select(Preferences(categories=["WORKSHOPS "])) == 0b10
+    assert index.select(Preferences(venues=["Studio"], categories=["workshops"])) == 0b10
+
+
+def test_labels_keep_event_spelling():
+    index = _index()
+    assert [index.labels[k] for k in sorted(index.venues)] == ["Barbican", "Studio"]
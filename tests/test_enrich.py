@@ -0,0 +1,33 @@
+import time
+
+import pipeline
+from enrich import EnrichCache, Enricher
+from scrapers.base import Event
+
+
+class SlowSession:
+    """Answers every request after a pause."""
+
+    headers = {}
+
+    def get(self, url, timeout):
+        time.sleep(min(0.2, timeout))
+        return self
+
+    def raise_for_status(self):
+        pass
+
+    text = '<meta name="description" content="Filled in">'
+
+
+def test_enrichment_stops_at_the_run_deadline(tmp_path):
+    events = [Event(f"Talk {i}", "Barbican", f"https://example.com/{i}") for i in range(30)]
+    enricher = Enricher(EnrichCache(tmp_path / "cache.json"), workers=2, host_delay=0.2,
+                        session_factory=SlowSession)
+    started = time.monotonic()
+    pipeline.run([pipeline.Source("Barbican", lambda: iter(events))], keep=lambda e: True,
+                 taps=[enricher], deadline=1.0)
+    assert time.monotonic() - started < 2.0
+    assert 0 < enricher.fetched < len(events)
+    filled = sum(1 for e in events if e.description)
+    assert filled == enricher.fetched
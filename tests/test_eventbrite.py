@@ -0,0 +1,19 @@
+from scrapers import EventbriteScraper
+from scrapers.planner import QueryPlanner
+
+
+def test_failing_search_is_recorded_so_it_stops_going_first(tmp_path):
+    scraper = EventbriteScraper(QueryPlanner(tmp_path / "queries.json", budget=1), searches=["gone"])
+
+    def scrape_search(term, page, seen_ids):
+        raise ConnectionError("404")
+        yield
+
+    scraper._scrape_search = scrape_search
+    assert list(scraper.iter_events()) == []
+    assert scraper.stats.errors == {"ConnectionError": 1}
+    assert scraper.yields == {("gone", 1): 0}
+
+    # Untried, it would outrank every other search on every run
+    planner = QueryPlanner(tmp_path / "queries.json", budget=1)
+    assert planner.plan(["gone", "new"]) == [("new", 1)]
@@ -0,0 +1,75 @@
+from datetime import date, datetime, time, timezone
+
+import feeds
+from feeds import FeedWriter
+from scrapers.base import Event
+
+
+def _events():
+    long = "Ceramics and glass — a late-night workshop with tea, cake and an introduction to kilns. " * 4
+    events = [
+        Event("Talk: glaze; colour, fire", "Barbican", "https://example.com/a", date(2099, 1, 1), time="6.30–9pm",
+              description=long + "Café ☕ after.", category="Talk", area="Barbican"),
+        Event("Open studio", "ICA", "https://example.com/b", date(2099, 1, 2), date(2099, 1, 4), category="Social"),
+        Event("Undated", "ICA", "https://example.com/c"),
+    ]
+    # As build_html fills them in
+    for e in events:
+        e.source, e.filter_cat = e.venue, e.category
+    return events
+
+
+class Later(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return datetime(2100, 1, 1, tzinfo=timezone.utc)
+
+
+def test_rewritten_feed_is_byte_identical(tmp_path, monkeypatch):
+    writer = FeedWriter(tmp_path / "calendar", tmp_path / "feeds.json")
+    names = dict(writer.write_all(_events()))
+    assert set(names) == {"All events", "Barbican", "ICA", "Talk", "Social"}
+    first = {p.name: p.read_bytes() for p in (tmp_path / "calendar").glob("*.ics")}
+
+    # A fresh checkout has the manifest but not the files: they come back the same, stamp included
+    for p in (tmp_path / "calendar").glob("*.ics"):
+        p.unlink()
+    monkeypatch.setattr(feeds, "datetime", Later)
+    writer = FeedWriter(tmp_path / "calendar", tmp_path / "feeds.json")
+    writer.write_all(_events())
+    assert {p.name: p.read_bytes() for p in (tmp_path / "calendar").glob("*.ics")} == first
+
+    # Unchanged events aren't written again; changed ones are
+    later = Later.now()
+    assert not writer.write("all.ics", "All events", _events(), later)
+    changed = _events()
+    changed[0].title = "Talk: glaze"
+    assert writer.write("all.ics", "All events", changed, later)
+
+
+def test_long_lines_fold_at_75_octets_without_splitting_characters():
+    body = b"".join(feeds.serialize("All events", _events(), "20990101T000000Z"))
+    lines = body.split(b"\r\n")
+    assert lines[-1] == b""
+    assert all(len(line) <= feeds.LINE_OCTETS for line in lines)
+    for line in lines:
+        line.decode()  # each physical line is valid UTF-8 on its own
+    assert any(line.startswith(b" ") for line in lines)
+
+    unfolded = body.replace(b"\r\n ", b"").decode().split("\r\n")
+    description = next(line for line in unfolded if line.startswith("DESCRIPTION:") and "Café" in line)
+    assert description.endswith("Café ☕ after.\\nhttps://example.com/a")
+    assert "SUMMARY:Talk: glaze\\; colour\\, fire" in unfolded
+    assert "DTSTART;TZID=Europe/London:20990101T183000" in unfolded
+    assert "DTEND;TZID=Europe/London:20990101T210000" in unfolded
+    # Several days and no time: all day, end exclusive; the undated event is left out
+    assert "DTSTART;VALUE=DATE:20990102" in unfolded and "DTEND;VALUE=DATE:20990105" in unfolded
+    assert "CATEGORIES:Talk" in unfolded
+    assert unfolded.count("BEGIN:VEVENT") == 2
+
+
+def test_parse_times():
+    assert feeds.parse_times("7pm") == (time(19), None)
+    assert feeds.parse_times("19:00 – 22:00") == (time(19), time(22))
+    assert feeds.parse_times("11–2pm") == (time(11), time(14))
+    assert feeds.parse_times("Tickets £12") == (None, None)
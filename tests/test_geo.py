@@ -0,0 +1,31 @@
+from scrapers.geo import LONDON, Gazetteer, _Grid
+
+SQUARE = [(51.0, -0.5), (51.0, 0.5), (52.0, 0.5), (52.0, -0.5)]
+
+
+def test_points_just_outside_the_grid_are_outside():
+    grid = _Grid(SQUARE)
+    assert not grid.contains(51.5, -0.505)
+    assert not grid.contains(50.995, 0.0)
+    assert grid.contains(51.5, -0.495)
+
+
+def test_cells_round_down_below_the_origin():
+    grid = _Grid(SQUARE)
+    assert grid._cell(50.995, -0.505) == (-1, -1)
+
+
+def test_unrecognised_postcode_falls_back_to_coordinates():
+    assert LONDON.locate("N/A", 51.52, -0.08).inside is True
+    assert LONDON.locate("ZZ9 9ZZ", 53.48, -2.24).inside is False
+    assert LONDON.locate("London").inside is None
+
+
+def test_real_postcode_outside_the_city_is_outside():
+    assert LONDON.locate("BS1 4DJ", 51.52, -0.08).inside is False
+
+
+def test_negative_longitudes():
+    gazetteer = Gazetteer(SQUARE, set(), set())
+    assert gazetteer.contains(51.5, -0.25)
+    assert not gazetteer.contains(51.5, -0.75)
@@ -0,0 +1,33 @@
+import random
+from datetime import date
+
+import numpy as np
+
+import pipeline
+from scrapers import EventBatch
+from scrapers.base import Event
+
+
+def test_earlier_source_wins_whatever_the_time():
+    barbican = [Event("Artist Talk", "Barbican", "https://barbican/1", date(2099, 3, 1), time="7pm")]
+    eventbrite = [
+        Event("artist talk ", "Barbican Centre", "https://eventbrite/1", date(2099, 3, 1), time="6:00pm"),
+        Event("Drawing Class", "Studio", "https://eventbrite/2", date(2099, 3, 1), time="6:30pm"),
+    ]
+    merged = list(pipeline.merge([barbican, eventbrite]))
+    assert [e.url for e in merged] == ["https://eventbrite/2", "https://barbican/1"]
+
+
+def test_matches_batch_dedup_and_sort():
+    rng = random.Random(7)
+    titles, times = ["Talk", "Tour", "Talk ", "Late"], ["", "6pm", "7pm", "10:00am"]
+    buffers = [
+        [Event(rng.choice(titles), f"Venue {s}", f"https://{s}/{i}",
+               rng.choice([None, date(2099, 1, 1), date(2099, 1, 2)]), time=rng.choice(times))
+         for i in range(40)]
+        for s in range(4)
+    ]
+    events = [e for buffer in buffers for e in buffer]
+    batch = EventBatch(events)
+    expected = batch.take(batch.sorted(batch.first_unique(np.arange(len(events)))))
+    assert [e.url for e in pipeline.merge(buffers)] == [e.url for e in expected]
@@ -0,0 +1,51 @@
+import json
+from datetime import date
+from itertools import accumulate
+
+import search
+from scrapers.base import Event
+
+
+def test_tokenize_folds_accents_and_drops_stopwords():
+    assert search.tokenize("Café Müller: the Art of Résumé-writing") == ["cafe", "muller", "art", "resume", "writing"]
+
+
+def test_stem_maps_word_forms_together():
+    for forms in (["gallery", "galleries"], ["exhibition", "exhibitions"], ["paint", "painting", "painted"]):
+        assert len({search.stem(w) for w in forms}) == 1, forms
+    # Too short to strip, or not a plural
+    assert [search.stem(w) for w in ("bus", "class", "virus", "2024s")] == ["bus", "class", "virus", "2024"]
+
+
+def test_index_is_sharded_by_first_character_and_round_trips(tmp_path):
+    events = [
+        Event("Printmaking Workshops", "Barbican", "https://example.com/0", date(2099, 1, 1), area="Barbican"),
+        Event("Late opening", "ICA", "https://example.com/1", date(2099, 1, 2), description="A workshop late"),
+        Event("Poetry reading", "LRB", "https://example.com/2", date(2099, 1, 3), area="Bloomsbury"),
+    ]
+    shards = search.build_index(events)
+    version = search.write_index(shards, tmp_path)
+    assert sorted(p.stem for p in tmp_path.glob("*.json")) == sorted(shards)
+
+    decoded = {}
+    for path in tmp_path.glob("*.json"):
+        data = json.loads(path.read_text())
+        assert data["terms"] == sorted(data["terms"])
+        assert all(t[0] == path.stem for t in data["terms"])
+        for term, deltas in zip(data["terms"], data["postings"]):
+            decoded[term] = list(accumulate(deltas))
+
+    # A query is tokenized and stemmed the same way as the events were
+    def hits(query):
+        sets = [set(decoded.get(search.stem(w), ())) for w in search.tokenize(query)]
+        return sorted(set.intersection(*sets))
+
+    assert hits("workshop") == [0, 1]
+    assert hits("late workshops") == [1]
+    assert hits("bloomsbury poetry") == [2]
+    assert hits("barbican") == [0]
+
+    # Same events, same files and version; a shard that no longer exists is removed
+    assert search.write_index(shards, tmp_path) == version
+    search.write_index(search.build_index(events[:1]), tmp_path)
+    assert not (tmp_path / "l.json").exists()
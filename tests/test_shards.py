@@ -0,0 +1,115 @@
+import json
+import threading
+from datetime import date
+
+import pytest
+
+import cities
+import scrape
+import scrapers
+from bench import standin
+from bench.load import PREFIXES
+from metrics import Metrics
+from scrapers import BarbicanScraper, EventbriteScraper, ICAScraper, RichMixScraper
+from scrapers.base import Event
+from scrapers.geo import LONDON
+
+
+def _city(**kwargs):
+    return cities.City(name="Testville", slug="testville", gazetteer=LONDON, eventbrite_place="testville",
+                       path="testville", **kwargs)
+
+
+def _use_site(monkeypatch, root, city):
+    """Point scrape at city, with its tree under root and fresh run metrics."""
+    monkeypatch.setattr(cities, "ROOT", root)
+    for name in ("CITY", "SIBLINGS", "OUTPUT", "DATA", "METRICS", "LEDGER"):
+        monkeypatch.setattr(scrape, name, getattr(scrape, name))
+    monkeypatch.setattr(scrape, "metrics", Metrics())
+    scrape.use_city(city)
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    """scrape pointed at a throwaway Eventbrite-only city under tmp_path."""
+    _use_site(monkeypatch, tmp_path, _city(sources=(EventbriteScraper,)))
+
+
+@pytest.fixture
+def venues(monkeypatch):
+    """Every scraper pointed at a local stand-in server, without politeness pauses."""
+    server = standin.serve(standin.StandinConfig(events_per_page=20))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    for name, prefix in PREFIXES.items():
+        monkeypatch.setattr(getattr(scrapers, name), "base_url", f"http://127.0.0.1:{server.server_port}/{prefix}")
+        monkeypatch.setattr(getattr(scrapers, name), "delay", 0)
+    yield
+    server.shutdown()
+
+
+def _event(url, day):
+    return Event(f"Talk {url}", "Some Loft", f"https://example.com/{url}", date(2099, 1, day), category="Talk")
+
+
+def _partial(shard, events, arms, fetches):
+    return {
+        "run": "test", "city": "testville", "shard": shard, "of": 2,
+        "sources": [{"name": "Eventbrite", "timed_out": False, "errors": {},
+                     "events": [scrape.event_record(e) for e in events], "arms": arms}],
+        "eventbrite": fetches,
+        "metrics": Metrics().to_dict(),
+    }
+
+
+def test_search_repeated_across_shards_is_credited_to_the_earlier_one(site):
+    shards = scrape.DATA / "shards"
+    shards.mkdir(parents=True)
+    # Plan order: art, design, talks, film. Shard 1 ran arms 0 and 2, shard 2 arms 1 and 3;
+    # x turned up in both art (arm 0) and design (arm 1), so design really added nothing
+    (shards / "1-of-2.json").write_text(json.dumps(_partial(
+        1, [_event("x", 1), _event("a", 2)], [0, 2], [["art", 1, 1, 0], ["talks", 1, 1, 2]])))
+    (shards / "2-of-2.json").write_text(json.dumps(_partial(
+        2, [_event("x", 1), _event("b", 3)], [1, 3], [["design", 1, 1, 1], ["film", 1, 1, 3]])))
+
+    scrape.merge_shards()
+
+    arms = json.loads((scrape.DATA / "eventbrite_queries.json").read_text())["arms"]
+    assert {k: v["yield"] for k, v in arms.items()} == {"art|1": 1, "design|1": 0, "talks|1": 1, "film|1": 1}
+    events = json.loads((scrape.DATA / "events.json").read_text())
+    assert [e["url"] for e in events] == ["https://example.com/x", "https://example.com/a", "https://example.com/b"]
+
+
+def _store():
+    return json.loads((scrape.DATA / "events.json").read_text())
+
+
+def test_shards_then_merge_match_a_single_run(tmp_path, monkeypatch, venues):
+    city = _city(sources=(RichMixScraper, EventbriteScraper, BarbicanScraper),
+                 venue_order=("Barbican", "Rich Mix", "Eventbrite"))
+    _use_site(monkeypatch, tmp_path / "single", city)
+    scrape.run_once()
+    single = _store()
+    queries = json.loads((scrape.DATA / "eventbrite_queries.json").read_text())
+
+    _use_site(monkeypatch, tmp_path / "sharded", city)
+    for i in (1, 2, 3):
+        scrape.run_shard(i, 3)
+    # Shards leave judging and snapshotting sources to the merge
+    assert not (scrape.DATA / "snapshots").exists()
+    scrape.merge_shards()
+
+    assert len(single) > 100
+    assert _store() == single
+    assert json.loads((scrape.DATA / "eventbrite_queries.json").read_text()) == queries
+    assert sorted(p.name for p in (scrape.DATA / "snapshots").iterdir()) == \
+        sorted(p.name for p in (tmp_path / "single" / "sites" / "testville" / "data" / "snapshots").iterdir())
+
+
+def test_shards_of_a_city_without_eventbrite(tmp_path, monkeypatch, venues):
+    monkeypatch.setattr(scrape, "browser_events", lambda *args, **kwargs: iter(()))
+    _use_site(monkeypatch, tmp_path, _city(sources=(BarbicanScraper,), browser_sources=(ICAScraper,),
+                                            venue_order=("Barbican", "ICA")))
+    scrape.run_shard(1, 2)
+    scrape.run_shard(2, 2)
+    scrape.merge_shards()
+    assert {e["venue"] for e in _store()} == {"Barbican"}
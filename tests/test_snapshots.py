@@ -0,0 +1,45 @@
+from datetime import date
+
+import pipeline
+from scrapers.base import Event, SourceStats
+from snapshots import SnapshotStore
+
+
+class FakeScraper:
+    def __init__(self, errors=None):
+        self.stats = SourceStats(errors=errors or {})
+
+
+def _events(n):
+    return [Event(f"Talk {i}", "Barbican", f"https://example.com/{i}", date(2099, 1, 1 + i)) for i in range(n)]
+
+
+def _settle(store, events, errors=None):
+    return store.settle(pipeline.Source("Barbican", None, FakeScraper(errors)), events, False)
+
+
+def test_partial_result_with_errors_keeps_snapshot(tmp_path):
+    store = SnapshotStore(tmp_path)
+    _settle(store, _events(10))
+
+    # One page failed to load; the two events from the page that worked are topped up
+    settled = _settle(store, _events(2), {"HTTPError": 1})
+    assert len(settled) == 10
+    assert [e.stale for e in settled].count(True) == 8
+    assert len(store.events("Barbican")) == 10
+    assert "Barbican" in store.stale
+
+
+def test_sharp_drop_counts_as_failure(tmp_path):
+    store = SnapshotStore(tmp_path)
+    _settle(store, _events(10))
+    assert len(_settle(store, _events(3))) == 10
+    assert len(store.events("Barbican")) == 10
+
+
+def test_clean_result_replaces_snapshot(tmp_path):
+    store = SnapshotStore(tmp_path)
+    _settle(store, _events(10))
+    assert len(_settle(store, _events(6))) == 6
+    assert len(store.events("Barbican")) == 6
+    assert not store.stale
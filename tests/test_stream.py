@@ -0,0 +1,48 @@
+from bs4 import BeautifulSoup
+
+from scrapers.stream import MAX_TAG, CardStream
+
+PAGE = """<html><body>
+<div class="card-list"><div class="card-title">Not a card</div>
+<div class="big card" data-id="1"><div class="inner"><div>Nested <b>one</b></div></div><p>Talk</p></div>
+<DIV class='card'><div><div><div>Deep</div></div></div>Two</DIV>
+<div class="card"
+     data-id="3">Tag split<div class="x"></div> over lines</div>
+<span class="card">Wrong tag</span>
+<div class="card">Café — ünïcode</div>
+</div></body></html>"""
+
+
+def _cards(chunk_size):
+    stream, found = CardStream("div.card"), []
+    for i in range(0, len(PAGE), chunk_size):
+        stream.feed(PAGE[i:i + chunk_size])
+        found += stream.cards()
+    stream.close()
+    return [str(c) for c in found + stream.cards()]
+
+
+def test_cards_match_whole_page_parse_at_any_chunk_size():
+    expected = [str(c) for c in BeautifulSoup(PAGE, "html.parser").select("div.card")]
+    assert len(expected) == 4
+    for size in (1, 2, 3, 5, 8, 13, 64, len(PAGE)):
+        assert _cards(size) == expected, size
+
+
+def test_cards_are_returned_as_they_close():
+    stream = CardStream("div.card")
+    stream.feed('<div class="card"><div>One</div>')
+    assert stream.cards() == []
+    stream.feed('</div><div class="card">Tw')
+    assert [c.get_text() for c in stream.cards()] == ["One"]
+    stream.feed("o</div>")
+    assert [c.get_text() for c in stream.cards()] == ["Two"]
+
+
+def test_text_between_cards_is_not_kept():
+    stream = CardStream("div.card")
+    for _ in range(1000):
+        stream.feed("<p>filler</p>" * 100)
+    assert len(stream._buf) <= MAX_TAG
+    stream.feed('<div class="card">Last</div>')
+    assert [c.get_text() for c in stream.cards()] == ["Last"]